@@ -38,12 +38,49 @@ def internal_decision(path, variable_names, variable_values, output_variable_nam
     """
     import pyDMNrules
 
-    dmnRules = pyDMNrules.DMN()
+    if len(variable_names) != len(variable_values):
+        raise Exception('Same number of input variable names and values required')
+
+    # Loaded rulesBooks are shared by all decisions in this process (see pyDMNrules.rulesBookCache)
+    status, dmnRules = pyDMNrules.rulesBookCache.load(path)
+    if 'errors' in status:
+        raise Exception('{} has errors: {}'.format(path, str(status['errors'])))
+
+    data = {}
+    for i, name in enumerate(variable_names):
+        data[name] = variable_values[i]
+
+    return dmnRules.decide(data, outputs=[output_variable_name])[1]['Result'][output_variable_name]
+
+
+async def internal_decision_async(path, variable_names, variable_values, output_variable_name):
+    """Internal decision engine (asyncio)
+
+    Evaluate a decision table with pyDMNrules decision engine, without blocking the asyncio event loop.
+    The rulesBook is loaded, and the decision is made, by pyDMNrules' bounded pool of decision threads.
+    Use pyDMNrules.aio.gatherLimited() to await many decisions with a concurrency limit.
+
+    :parameter path: File path to the decision table (.xlsx Excel worksheet)
+    :type path: string
+
+    :parameter variable_names: Names of the input variables of the decision (comma separated list)
+    :type variable_names: list of strings
+
+    :parameter variable_values: Values of the corresponding variables of the decision (comma separated list)
+    :type variable_values: list of strings
+
+    :parameter output_variable_name: Output variable name of the decision table
+    :type output_variable_name: string
+
+    :return: Decision result
+    :rtype: any
+    """
+    import pyDMNrules.aio
 
     if len(variable_names) != len(variable_values):
         raise Exception('Same number of input variable names and values required')
 
-    status = dmnRules.load(path)
+    status, dmnRules = await pyDMNrules.aio.loadAsync(path)
     if 'errors' in status:
         raise Exception('{} has errors: {}'.format(path, str(status['errors'])))
 
@@ -51,7 +88,8 @@ def internal_decision(path, variable_names, variable_values, output_variable_nam
     for i, name in enumerate(variable_names):
         data[name] = variable_values[i]
 
-    return dmnRules.decide(data)[1]['Result'][output_variable_name]
+    status, newData = await dmnRules.decideAsync(data, outputs=[output_variable_name])
+    return newData['Result'][output_variable_name]
 
 
 @activity
@@ -102,6 +140,57 @@ def camunda_decision_engine(camunda_engine_URL, decision_key, variable_names, va
     return list(map(lambda x: x[output_variable_name]["value"], response.json()))
 
 
+async def camunda_decision_engine_async(camunda_engine_URL, decision_key, variable_names, variable_values, output_variable_name, session=None):
+    """Camunda decision service (asyncio)
+
+    Evaluate a decision table with camunda decision engine, without blocking the asyncio event loop.
+
+    :parameter camunda_engine_URL: URL to camunda engine (e.g. http://localhost:8080/engine-rest/)
+    :type camunda_engine_URL: string
+
+    :parameter decision_key: Key to identify decision "Decision_0tgwupa"
+    :type decision_key: strings
+
+    :parameter variable_names: Names of the input variables of the decision (comma separated list)
+    :type variable_names: list of strings
+
+    :parameter variable_values: Values of the corresponding variables of the decision (comma separated list)
+    :type variable_values: list of strings
+
+    :parameter output_variable_name: Output variable name of the decision table
+    :type output_variable_name: string
+
+    :parameter session: aiohttp session to send the request with - share one between concurrent decisions to reuse connections (default: a new session)
+    :type session: aiohttp.ClientSession
+
+    :return: Decision result
+    :rtype: any
+    """
+    import aiohttp
+
+    if len(variable_names) != len(variable_values):
+        raise Exception('Same number of input variable names and values required')
+
+    variables = {}
+    for i, name in enumerate(variable_names):
+        variables[name] = { "value": variable_values[i] }
+
+    task = {
+        "variables" : variables
+    }
+
+    url = '{}decision-definition/key/{}/evaluate'.format(camunda_engine_URL, decision_key)
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, json=task) as response:
+                results = await response.json()
+    else:
+        async with session.post(url, json=task) as response:
+            results = await response.json()
+
+    return list(map(lambda x: x[output_variable_name]["value"], results))
+
+
 @activity
 def human_decision(message, choices):
     """Human decision
@@ -27,12 +27,49 @@ def internal_decision(path, variable_names, variable_values, output_variable_nam
     """
     import pyDMNrules
 
-    dmnRules = pyDMNrules.DMN()
+    if len(variable_names) != len(variable_values):
+        raise Exception('Same number of input variable names and values required')
+
+    # Loaded rulesBooks are shared by all decisions in this process (see pyDMNrules.rulesBookCache)
+    status, dmnRules = pyDMNrules.rulesBookCache.load(path)
+    if 'errors' in status:
+        raise Exception('{} has errors: {}'.format(path, str(status['errors'])))
+
+    data = {}
+    for i, name in enumerate(variable_names):
+        data[name] = variable_values[i]
+
+    return dmnRules.decide(data, outputs=[output_variable_name])[1]['Result'][output_variable_name]
+
+
+async def internal_decision_async(path, variable_names, variable_values, output_variable_name):
+    """Internal decision engine (asyncio)
+
+    Evaluate a decision table with pyDMNrules decision engine, without blocking the asyncio event loop.
+    The rulesBook is loaded, and the decision is made, by pyDMNrules' bounded pool of decision threads.
+    Use pyDMNrules.aio.gatherLimited() to await many decisions with a concurrency limit.
+
+    :parameter path: File path to the decision table (.xlsx Excel worksheet)
+    :type path: string
+
+    :parameter variable_names: Names of the input variables of the decision (comma separated list)
+    :type variable_names: list of strings
+
+    :parameter variable_values: Values of the corresponding variables of the decision (comma separated list)
+    :type variable_values: list of strings
+
+    :parameter output_variable_name: Output variable name of the decision table
+    :type output_variable_name: string
+
+    :return: Decision result
+    :rtype: any
+    """
+    import pyDMNrules.aio
 
     if len(variable_names) != len(variable_values):
         raise Exception('Same number of input variable names and values required')
 
-    status = dmnRules.load(path)
+    status, dmnRules = await pyDMNrules.aio.loadAsync(path)
     if 'errors' in status:
         raise Exception('{} has errors: {}'.format(path, str(status['errors'])))
 
@@ -40,6 +77,7 @@ def internal_decision(path, variable_names, variable_values, output_variable_nam
     for i, name in enumerate(variable_names):
         data[name] = variable_values[i]
 
-    return dmnRules.decide(data)[1]['Result'][output_variable_name]
+    status, newData = await dmnRules.decideAsync(data, outputs=[output_variable_name])
+    return newData['Result'][output_variable_name]
 
  
@@ -5,24 +5,289 @@
 import sys
 import re
 import datetime
-import pySFeel
-from openpyxl import load_workbook
-from openpyxl import utils
+import copy
+import time
+import bisect
+import threading
+import collections
+import pickle
+import hashlib
+
+# S-FEEL tokens that can be evaluated once, when the rules are loaded
+literalTokens = ['NUMBER', 'STRING', 'BOOLEAN', 'NULL', 'DATE', 'TIME', 'DATETIME', 'DTDURATION', 'YMDURATION']
+# S-FEEL tokens that can appear in a constant output value
+constantTokens = literalTokens + ['MINUS', 'LBRACKET', 'RBRACKET', 'COMMA']
+comparisonTokens = ['EQUALS', 'NOTEQUALS', 'LTTHAN', 'LTTHANEQUAL', 'GTTHAN', 'GTTHANEQUAL']
+# The relative cost of evaluating each kind of compiled test, for orderTests()
+testCosts = {'compare': 1.0, 'range': 1.5, 'in': 1.0, 'sfeel': 50.0}
+# The most rule references a decision tree may hold - larger tables keep using the rule indexes
+treeLimit = 2000000
+# The compiled rulesBook file format - change compiledVersion whenever the saved model or the compiled specifications change
+compiledFormat = 'pyDMNrules compiled rulesBook'
+compiledVersion = 1
+# The S-FEEL lexer and parser shared by every DMN and every decision - see sfeelParse()
+sfeelLock = threading.RLock()
+sfeelLexer = None
+sfeelParser = None
+
+
+def sfeelParsers():
+    '''
+    The shared S-FEEL lexer and parser, built on first use
+    Importing pySFeel builds its grammar tables, so pyDMNrules doesn't import it until S-FEEL has to be parsed -
+    a compiled rulesBook can make decisions without ever importing it
+    '''
+    global sfeelLexer, sfeelParser
+    with sfeelLock:
+        if sfeelParser is None:
+            import pySFeel
+            sfeelLexer = pySFeel.SFeelLexer()
+            sfeelParser = pySFeel.SFeelParser()
+    return (sfeelLexer, sfeelParser)
+
+
+def sfeelParse(names, text):
+    '''
+    Parse S-FEEL text with the shared parser
+    The parser holds no state between calls - the values of the names in the text, and any assigned name, are in the passed names
+    '''
+    with sfeelLock:
+        (lexer, parser) = sfeelParsers()
+        parser.names = names
+        try:
+            return parser.sFeelParse(text)
+        finally:
+            parser.names = {}
+
+
+def sfeelTokenize(text):
+    '''
+    The tokens of S-FEEL text, from the shared lexer
+    '''
+    with sfeelLock:
+        (lexer, parser) = sfeelParsers()
+        return list(lexer.tokenize(text))
+
+
+def fileHash(fileName):
+    '''
+    The SHA-256 hash of the contents of a file
+    '''
+    sha256 = hashlib.sha256()
+    with open(fileName, 'rb') as fp:
+        for block in iter(lambda: fp.read(65536), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def sfeelUnwrap(value):
+    '''
+    S-FEEL treats a list of one value as that value
+    '''
+    if isinstance(value, list) and (len(value) == 1):
+        return value[0]
+    return value
+
+
+def sfeelCompare(op, value0, value1):
+    '''
+    Compare two values, the way pySFeel compares them
+    '''
+    value0 = sfeelUnwrap(value0)
+    value1 = sfeelUnwrap(value1)
+    try:
+        if op == '=':
+            return value0 == value1
+        elif op == '!=':
+            return value0 != value1
+        elif op == '<':
+            return value0 < value1
+        elif op == '<=':
+            return value0 <= value1
+        elif op == '>':
+            return value0 > value1
+        elif op == '>=':
+            return value0 >= value1
+    except:
+        return None
+    return None
+
+
+def sfeelInRange(value, openBracket, lowVal, highVal, closeBracket):
+    '''
+    Check if a value is in a range, the way pySFeel checks ranges
+    '''
+    if isinstance(value, str):
+        if not isinstance(lowVal, str) or not isinstance(highVal, str):
+            return False
+    elif isinstance(value, float):
+        if not isinstance(lowVal, float) or not isinstance(highVal, float):
+            return False
+    elif isinstance(value, datetime.date):
+        if not isinstance(lowVal, datetime.date) or not isinstance(highVal, datetime.date):
+            return False
+    else:
+        return False
+    if lowVal > value:
+        return False
+    if highVal < value:
+        return False
+    if (openBracket != '[') and (lowVal == value):
+        return False
+    if (closeBracket != ']') and (highVal == value):
+        return False
+    return True
+
+
+def sfeelIn(value, comparisons):
+    '''
+    Check a value against an in() list of (comparitor, value), the way pySFeel does
+    '''
+    for (op, toValue) in comparisons:
+        try:
+            if op == '=':
+                if value == toValue:
+                    return True
+            elif op == '!=':
+                if value != toValue:
+                    return True
+            elif op == '<':
+                if value < toValue:
+                    return True
+            elif op == '<=':
+                if value <= toValue:
+                    return True
+            elif op == '>':
+                if value > toValue:
+                    return True
+            elif op == '>=':
+                if value >= toValue:
+                    return True
+        except:
+            return False
+    return False
+
+
+def readback(value):
+    '''
+    The value decide() returns for a Glossary item
+    '''
+    value = sfeelUnwrap(value)
+    if isinstance(value, str) and (value[:1] == '"') and (value[-1:] == '"'):
+        value = value[1:-1]
+    return value
+
+
+def nativeValue(value, glossary):
+    '''
+    Convert a data value into the value the S-FEEL parser holds for it - numbers become floats.
+    Returns (True, nativeValue), or (False, None) if the value has to be bound by the S-FEEL parser
+    (strings that are Glossary Variables or contain '"', dictionaries, timezone aware times and invalid data)
+    '''
+    if (value is None) or isinstance(value, bool):
+        return (True, value)
+    elif isinstance(value, (float, int)):
+        return (True, float(value))
+    elif isinstance(value, str):
+        if (value in glossary) or ('"' in value):
+            return (False, None)
+        return (True, value)
+    elif isinstance(value, list):
+        newValue = []
+        for thisValue in value:
+            (isNative, thisValue) = nativeValue(thisValue, glossary)
+            if not isNative:
+                return (False, None)
+            newValue.append(thisValue)
+        return (True, newValue)
+    elif isinstance(value, (datetime.date, datetime.time)):
+        if getattr(value, 'tzinfo', None) is not None:
+            return (False, None)
+        return (True, value)
+    elif isinstance(value, datetime.timedelta):
+        return (True, value)
+    return (False, None)
+
+
+def dataRecords(records):
+    '''
+    The data dictionaries of an iterable of records, or of a pandas DataFrame (NaN values become None)
+    '''
+    if hasattr(records, 'columns') and hasattr(records, 'to_dict'):
+        return ({variable: (None if (value != value) else value) for (variable, value) in record.items()}
+                for record in records.to_dict('records'))
+    return records
+
+
+def hashableValue(value):
+    '''
+    A hashable form of an input value, which keeps values of different types apart (True is not 1.0)
+    '''
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(hashableValue(thisValue) for thisValue in value))
+    if isinstance(value, dict):
+        return ('dict', frozenset((key, hashableValue(thisValue)) for (key, thisValue) in value.items()))
+    return (type(value).__name__, value)
+
+
+def sameValue(value0, value1):
+    '''
+    True if two values are the same type and equal (NaN is never the same)
+    '''
+    return (type(value0) is type(value1)) and (value0 == value1)
+
+
+class DecisionContext(dict):
+    '''
+    The values of the Glossary items during one decision, and that decision's errors
+    S-FEEL that couldn't be compiled is evaluated against this context, not the DMN,
+    so any number of decisions can be made from one loaded DMN at the same time.
+    '''
+
+    def __init__(self, names):
+        super().__init__(names)
+        self.errors = []
+
+
+    def sfeel(self, text):
+        (status, retVal) = sfeelParse(self, text)
+        if 'errors' in status:
+            self.errors += status['errors']
+        return retVal
+
 
 class DMN():
 
 
     def __init__(self):
-        self.lexer = pySFeel.SFeelLexer()
-        self.parser = pySFeel.SFeelParser()
+        # The names that the shared S-FEEL parser sees while the rulesBook is loaded and compiled
+        self.names = {}
         self.glossaryLoaded = False
         self.isLoaded = False
         self.errors = []
         self.warnings = []
+        self.compiledTests = {}
+        self.compiledResults = {}
+        self.predicates = {}
+        self.testStats = {}
+        self.collectingStats = False
+        # Per table and per rule profiles of decide() - off until profileDecisions() is called
+        self.profiling = False
+        self.tableProfiles = {}
+        self.ruleProfiles = {}
+        self.rulesBookHash = None
+        self.scratchName = 'pyDMNrulesValue'
+        # Memoised decide() results - off until cacheResults() is called
+        self.rulesBookVersion = 0
+        self.resultLock = threading.Lock()
+        self.results = collections.OrderedDict()
+        self.resultsSize = 0
+        self.resultHits = 0
+        self.resultMisses = 0
 
 
     def sfeel(self, text):
-        (status, retVal) = self.parser.sFeelParse(text)
+        (status, retVal) = sfeelParse(self.names, text)
         if 'errors' in status:
             self.errors += status['errors']
         return retVal
@@ -33,7 +298,7 @@ class DMN():
             return self.glossary[data]['item']
 
         isError = False
-        tokens = self.lexer.tokenize(data)
+        tokens = sfeelTokenize(data)
         yaccTokens = []
         for token in tokens:
             if token.type == 'ERROR':
@@ -303,21 +568,922 @@ class DMN():
             days = int(duration / 24)
             return 'P%dDT%dH%dM%dS' % (days, hours, mins, secs)
         else:
-            self.errors.append("Invalid Data '{!r}' - not a valid S-FEEL data type".format(value))
             return None
 
 
+    def value2native(self, value):
+        '''
+        Convert a data value into the value the S-FEEL parser holds for it - see nativeValue()
+        '''
+        return nativeValue(value, self.glossary)
+
+
     def result2sfeel(self, variable, coordinate, result):
         if isinstance(result, str):
             thisResult = result.strip()
         thisResult = self.data2sfeel(coordinate, thisResult)
-        (status, retVal) = self.parser.sFeelParse(thisResult)
+        (status, retVal) = sfeelParse(self.names, thisResult)
         if 'errors' in status:
             self.errors.append("Invalid Output value '{!r}' at '{!s}'".format(result, coordinate))
             self.errors += status['errors']
         return thisResult
 
 
+    def sfeelTokens(self, text):
+        '''
+        Tokenize S-FEEL text - returns None if the text has lexical errors
+        '''
+        tokens = []
+        for token in sfeelTokenize(text):
+            if token.type == 'ERROR':
+                return None
+            tokens.append(token)
+        return tokens
+
+
+    def compileOperand(self, tokens):
+        '''
+        Compile the tokens of a simple S-FEEL operand into ('value', value) or ('item', item)
+        Returns None if the operand is not a literal or a Glossary item
+        '''
+        if len(tokens) == 1:
+            if tokens[0].type == 'NAME':
+                if tokens[0].value in self.glossaryItems:
+                    return ('item', tokens[0].value)
+                return None
+            if tokens[0].type not in literalTokens:
+                return None
+        elif (len(tokens) != 2) or (tokens[0].type != 'MINUS') or (tokens[1].type != 'NUMBER'):
+            return None
+        (status, value) = sfeelParse(self.names, ' '.join([token.value for token in tokens]))
+        if 'errors' in status:
+            return None
+        return ('value', value)
+
+
+    def compileTest(self, test):
+        '''
+        Compile the S-FEEL text of a test into a test specification
+        The specification is one of
+            ('compare', op, item, operand)
+            ('range', item, openBracket, lowOperand, highOperand, closeBracket)
+            ('in', item, [(op, operand), ...])
+            ('sfeel', test) - anything else, which will be evaluated by the S-FEEL parser
+        '''
+        if test in self.compiledTests:
+            return self.compiledTests[test]
+        spec = ('sfeel', test)
+        tokens = self.sfeelTokens(test)
+        if (tokens is not None) and (len(tokens) > 2) and (tokens[0].type == 'NAME') and (tokens[0].value in self.glossaryItems):
+            # Only compile tests that the S-FEEL parser accepts
+            (status, retVal) = sfeelParse(self.names, test)
+            if 'errors' not in status:
+                item = tokens[0].value
+                if tokens[1].type in comparisonTokens:
+                    operand = self.compileOperand(tokens[2:])
+                    if operand is not None:
+                        spec = ('compare', tokens[1].value, item, operand)
+                elif (tokens[1].type == 'IN') and (len(tokens) > 5):
+                    if (tokens[2].type in ['LBRACKET', 'LPAREN', 'RBRACKET']) and (tokens[-1].type in ['RBRACKET', 'RPAREN', 'LBRACKET']):
+                        ellipses = [i for i in range(3, len(tokens) - 1) if tokens[i].type == 'ELLIPSE']
+                        if len(ellipses) == 1:
+                            lowOperand = self.compileOperand(tokens[3:ellipses[0]])
+                            highOperand = self.compileOperand(tokens[ellipses[0] + 1:-1])
+                            if (lowOperand is not None) and (highOperand is not None):
+                                spec = ('range', item, tokens[2].value, lowOperand, highOperand, tokens[-1].value)
+                elif (tokens[1].type == 'INFUNC') and (tokens[-1].type == 'RPAREN'):
+                    comparisons = []
+                    part = []
+                    for token in tokens[2:-1] + [None]:
+                        if (token is not None) and (token.type != 'COMMA'):
+                            part.append(token)
+                            continue
+                        op = '='
+                        if (len(comparisons) == 0) and (len(part) > 0) and (part[0].type in comparisonTokens) and (part[0].type != 'EQUALS'):
+                            op = part[0].value
+                            part = part[1:]
+                        operand = self.compileOperand(part)
+                        if operand is None:
+                            comparisons = None
+                            break
+                        comparisons.append((op, operand))
+                        part = []
+                    if comparisons:
+                        spec = ('in', item, comparisons)
+        self.compiledTests[test] = spec
+        return spec
+
+
+    def compileResult(self, result):
+        '''
+        Compile the S-FEEL text of an output value into a value specification
+        The specification is one of
+            ('value', value) - a constant
+            ('item', item) - the value of a Glossary item
+            ('sfeel', result) - anything else, which will be evaluated by the S-FEEL parser
+        '''
+        if result not in self.compiledResults:
+            self.compiledResults[result] = self.compileResultText(result)
+        return self.compiledResults[result]
+
+
+    def compileResultText(self, result):
+        tokens = self.sfeelTokens(result)
+        if (tokens is None) or (len(tokens) == 0):
+            return ('sfeel', result)
+        if (len(tokens) == 1) and (tokens[0].type == 'NAME') and (tokens[0].value in self.glossaryItems):
+            return ('item', tokens[0].value)
+        for token in tokens:
+            if token.type not in constantTokens:
+                return ('sfeel', result)
+        # Evaluate as an assignment, so that the value is exactly the value the S-FEEL parser would assign
+        (status, value) = sfeelParse(self.names, '{} <- {}'.format(self.scratchName, result))
+        self.names.pop(self.scratchName, None)
+        if 'errors' in status:
+            return ('sfeel', result)
+        return ('value', value)
+
+
+    def operandValue(self, operand):
+        '''
+        Build a function that returns the value of a compiled operand
+        '''
+        (kind, value) = operand
+        if kind == 'item':
+            return lambda names: names.get(value)
+        else:
+            return lambda names: value
+
+
+    def makePredicate(self, spec):
+        '''
+        Build a function, of the Glossary item values, that evaluates a compiled test
+        '''
+        kind = spec[0]
+        if kind == 'compare':
+            (kind, op, item, operand) = spec
+            if operand[0] == 'value':
+                value = operand[1]
+                if (op == '=') and not isinstance(value, list):
+                    return lambda names: sfeelUnwrap(names.get(item)) == value
+                return lambda names: sfeelCompare(op, names.get(item), value)
+            getValue = self.operandValue(operand)
+            return lambda names: sfeelCompare(op, names.get(item), getValue(names))
+        elif kind == 'range':
+            (kind, item, openBracket, lowOperand, highOperand, closeBracket) = spec
+            getLow = self.operandValue(lowOperand)
+            getHigh = self.operandValue(highOperand)
+            return lambda names: sfeelInRange(names.get(item), openBracket, getLow(names), getHigh(names), closeBracket)
+        elif kind == 'in':
+            (kind, item, comparisons) = spec
+            if all([operand[0] == 'value' for (op, operand) in comparisons]):
+                values = [(op, operand[1]) for (op, operand) in comparisons]
+                return lambda names: sfeelIn(names.get(item), values)
+            getValues = [(op, self.operandValue(operand)) for (op, operand) in comparisons]
+            return lambda names: sfeelIn(names.get(item), [(op, getValue(names)) for (op, getValue) in getValues])
+        else:
+            test = spec[1]
+            return lambda names: names.sfeel(test)
+
+
+    def makeValue(self, item, spec):
+        '''
+        Build a function, of the Glossary item values, that returns the value to be assigned to item
+        '''
+        (kind, value) = spec
+        if kind == 'value':
+            if isinstance(value, (list, dict)):
+                return lambda names: copy.deepcopy(value)
+            return lambda names: value
+        elif kind == 'item':
+            return lambda names: names.get(value)
+        else:
+            return lambda names: names.sfeel('{} <- {}'.format(item, value))
+
+
+    def compileRules(self):
+        '''
+        Compile all the tests and output values, so that decide() does not need the S-FEEL parser
+        '''
+        self.predicates = predicates = {}
+        for (table, inputTests, annotations) in self.decisions:
+            self.decisionTables[table]['inputPredicates'] = []
+            for (variable, test) in inputTests:
+                spec = self.compileTest(test)
+                if test not in predicates:
+                    predicates[test] = self.makePredicate(spec)
+                self.decisionTables[table]['inputPredicates'].append((variable, spec, predicates[test]))
+        for table in self.rules:
+            for rule in self.rules[table]:
+                for (variable, test) in rule['tests']:
+                    if test not in predicates:
+                        predicates[test] = self.makePredicate(self.compileTest(test))
+                rule['values'] = []
+                for (variable, result, rank) in rule['outputs']:
+                    item = self.glossary[variable]['item']
+                    spec = self.compileResult(result)
+                    rule['values'].append((variable, spec, self.makeValue(item, spec)))
+                # The 'P' and 'O' hit policy priority of this rule - output values without a rank come last
+                rule['rank'] = tuple((rank if rank is not None else float('inf')) for (variable, result, rank) in rule['outputs'])
+        self.rulePredicates()
+        self.tableDependencies()
+
+
+    def sfeelItems(self, text):
+        '''
+        The Glossary items named in some S-FEEL text (every Glossary item if the text can't be tokenized)
+        '''
+        tokens = self.sfeelTokens(text)
+        if tokens is None:
+            return set(self.glossaryItems)
+        return set([token.value for token in tokens if (token.type == 'NAME') and (token.value in self.glossaryItems)])
+
+
+    def specItems(self, spec):
+        '''
+        The Glossary items read by a compiled test or output value
+        '''
+        kind = spec[0]
+        if kind == 'sfeel':
+            return self.sfeelItems(spec[1])
+        elif kind == 'value':
+            return set()
+        elif kind == 'item':
+            return set([spec[1]])
+        elif kind == 'compare':
+            operands = [spec[3]]
+            item = spec[2]
+        elif kind == 'range':
+            operands = [spec[3], spec[4]]
+            item = spec[1]
+        else:
+            operands = [operand for (op, operand) in spec[2]]
+            item = spec[1]
+        items = set([item])
+        for (operandKind, operand) in operands:
+            if operandKind == 'item':
+                items.add(operand)
+        return items
+
+
+    def tableDependencies(self):
+        '''
+        Find the Glossary items each DMN rules table reads (in its 'Decision' table input tests, its rule tests and its output values)
+        and writes (its outputs). Tables also read the items they write, as the 'C' hit policies start from their current values.
+        '''
+        for (table, inputTests, annotations) in self.decisions:
+            reads = set()
+            writes = set()
+            for (variable, spec, predicate) in self.decisionTables[table]['inputPredicates']:
+                reads |= self.specItems(spec)
+            for rule in self.rules[table]:
+                for (variable, test) in rule['tests']:
+                    reads |= self.specItems(self.compileTest(test))
+                for (variable, result, rank) in rule['outputs']:
+                    reads |= self.specItems(self.compileResult(result))
+                    writes.add(self.glossary[variable]['item'])
+            self.decisionTables[table]['reads'] = reads | writes
+            self.decisionTables[table]['writes'] = writes
+
+
+    def rulePredicates(self):
+        '''
+        Set the predicates of every rule from its tests, in the order of its tests
+        Each predicate counts its evaluations and passes while test statistics are being collected
+        '''
+        for table in self.rules:
+            for thisRule in range(len(self.rules[table])):
+                rule = self.rules[table][thisRule]
+                rule['predicates'] = []
+                for (variable, test) in rule['tests']:
+                    predicate = self.predicates[test]
+                    if self.collectingStats:
+                        predicate = self.countingPredicate(test, predicate)
+                    if self.profiling:
+                        predicate = self.profiledPredicate(self.ruleProfile(table, thisRule), len(rule['predicates']) == 0, predicate)
+                    rule['predicates'].append((variable, self.compileTest(test), predicate))
+
+
+    def countingPredicate(self, test, predicate):
+        '''
+        Wrap a predicate so that it counts [evaluations, passes] in testStats
+        '''
+        counts = self.testStats.setdefault(test, [0, 0])
+        def counted(names):
+            retVal = predicate(names)
+            counts[0] += 1
+            if retVal:
+                counts[1] += 1
+            return retVal
+        return counted
+
+
+    def profiledPredicate(self, profile, first, predicate):
+        '''
+        Wrap a predicate so that it counts the rule's evaluations (if it is the rule's first test) and tests in the rule's profile
+        '''
+        if first:
+            def profiled(names):
+                profile[0] += 1
+                profile[1] += 1
+                return predicate(names)
+        else:
+            def profiled(names):
+                profile[1] += 1
+                return predicate(names)
+        return profiled
+
+
+    def ruleProfile(self, table, thisRule):
+        '''
+        The [evaluations, tests, hits] profile of a rule
+        '''
+        if table not in self.ruleProfiles:
+            self.ruleProfiles[table] = [[0, 0, 0] for rule in self.rules[table]]
+        return self.ruleProfiles[table][thisRule]
+
+
+    def tableProfile(self, table):
+        '''
+        The profile of a decision table
+        '''
+        if table not in self.tableProfiles:
+            self.tableProfiles[table] = {'evaluations': 0, 'skipped': 0, 'hits': 0, 'time': 0.0}
+        return self.tableProfiles[table]
+
+
+    def profileDecisions(self, profile=True):
+        '''
+        Start (or stop) profiling each decision table and rule used by decide()
+        The counts are approximate if decisions are being made in more than one thread
+        '''
+        self.profiling = profile
+        self.rulePredicates()
+
+
+    def resetProfile(self):
+        '''
+        Discard the profile collected so far
+        '''
+        self.tableProfiles = {}
+        self.ruleProfiles = {}
+        self.rulePredicates()
+
+
+    def profileStats(self):
+        """
+        Return a snapshot of the profile collected while profileDecisions() was on
+
+        Returns:
+            dict: {table: tableProfile}
+
+            Each table profile is a dictionary with the keys
+                - 'evaluations' - the number of decisions that used the DMN rules table
+                - 'skipped' - the number of decisions that skipped the table because of its input tests in the 'Decision' table
+                - 'hits' - the number of decisions where one or more rules matched
+                - 'time' - the wall time, in seconds, spent finding the matching rules and setting the outputs
+                - 'rulesEvaluated' - the number of rules tested
+                - 'testsEvaluated' - the number of rule tests evaluated
+                - 'rules' - a list of dictionaries, one per rule, of the 'ruleId' and the number of 'evaluations', 'tests' and 'hits' of each rule
+
+            Rules without any tests (all '-') are counted as evaluated every time they match.
+
+        """
+
+        stats = {}
+        for (table, inputTests, decisionAnnotations) in self.decisions:
+            stats[table] = dict(self.tableProfile(table))
+            rules = []
+            for thisRule in range(len(self.rules[table])):
+                (evaluations, tests, hits) = self.ruleProfile(table, thisRule)
+                if len(self.rules[table][thisRule]['tests']) == 0:
+                    evaluations = hits
+                rules.append({'ruleId': self.rules[table][thisRule]['ruleId'], 'evaluations': evaluations, 'tests': tests, 'hits': hits})
+            stats[table]['rulesEvaluated'] = sum([rule['evaluations'] for rule in rules])
+            stats[table]['testsEvaluated'] = sum([rule['tests'] for rule in rules])
+            stats[table]['rules'] = rules
+        return stats
+
+
+    def profileTable(self, table, started, matchedRules):
+        '''
+        Add one evaluation of a decision table to its profile
+        '''
+        profile = self.tableProfile(table)
+        profile['evaluations'] += 1
+        if len(matchedRules) > 0:
+            profile['hits'] += 1
+        for thisRule in matchedRules:
+            self.ruleProfile(table, thisRule)[2] += 1
+        profile['time'] += time.perf_counter() - started
+
+
+    def collectTestStats(self, collect=True):
+        '''
+        Start (or stop) counting how often each rule test is evaluated, and how often it passes, for orderTests()
+        The counts are approximate if decisions are being made in more than one thread
+        '''
+        self.collectingStats = collect
+        self.rulePredicates()
+
+
+    def testScore(self, test):
+        '''
+        The expected cost of a test per rule it rejects - the cost of evaluating it divided by how often it fails
+        Tests that haven't been counted are assumed to pass half the time
+        '''
+        spec = self.compileTest(test)
+        cost = testCosts[spec[0]]
+        if spec[0] == 'in':
+            cost += len(spec[2]) / 2
+        (evaluations, passes) = self.testStats.get(test, (0, 0))
+        passRate = (passes + 1) / (evaluations + 2)
+        return cost / (1.0 - passRate)
+
+
+    def orderTests(self):
+        """
+        Reorder the tests of each rule so that the tests most likely to reject the rule, for the least cost, are evaluated first
+
+        Tests are ordered by their static cost (compiled comparisons are cheap, tests evaluated by the S-FEEL parser are expensive)
+        and by how often they passed while statistics were being collected with collectTestStats().
+        A rule only matches if all its tests pass, so the order of the tests doesn't change any decision,
+        but errors reported by S-FEEL tests that are no longer evaluated will no longer be reported.
+
+        Args:
+            None
+
+        Returns:
+            dict: status - as for load()
+
+        """
+
+        if not self.isLoaded:
+            status = {}
+            status['errors'] = ['No rulesBook has been loaded']
+            return status
+        for table in self.rules:
+            for rule in self.rules[table]:
+                rule['tests'].sort(key=lambda thisTest: self.testScore(thisTest[1]))
+        self.rulePredicates()
+        return {}
+
+
+    def indexKeys(self, spec):
+        '''
+        Return (item, values) if a compiled test requires a Glossary item to equal one of a list of literal values
+        Returns None if the test isn't a pure equality test
+        '''
+        kind = spec[0]
+        if (kind == 'compare') and (spec[1] == '=') and (spec[3][0] == 'value'):
+            (item, keys) = (spec[2], [spec[3][1]])
+        elif (kind == 'in') and all([(op == '=') and (operand[0] == 'value') for (op, operand) in spec[2]]):
+            (item, keys) = (spec[1], [operand[1] for (op, operand) in spec[2]])
+        else:
+            return None
+        for key in keys:
+            try:
+                hash(key)
+            except TypeError:
+                return None
+        return (item, keys)
+
+
+    def indexRules(self):
+        '''
+        Build an index, for each Glossary item that is tested for equality with literal values,
+        from each of those values to the rules that can possibly match it.
+        Rules that don't test the item for equality (e.g. '-' cells) can match any value (the wildcard rules).
+        Pruning a rule doesn't change any decision, but the other tests of a pruned rule aren't evaluated,
+        so errors reported by its S-FEEL tests (tests that couldn't be compiled) will no longer be reported.
+        '''
+        for table in self.rules:
+            (ruleIndex, rangeIndex) = self.ruleIndexes(self.rules[table])
+            self.decisionTables[table]['ruleIndex'] = ruleIndex
+            self.decisionTables[table]['rangeIndex'] = rangeIndex
+            if 'output' in self.decisionTables[table]:
+                self.decisionTables[table]['crosstab'] = self.crosstabLookup(table)
+
+
+    def ruleIndexes(self, rules):
+        '''
+        Build the equality index and the range index for a list of rules (see indexRules() and indexRanges())
+        '''
+        ruleIndex = []
+        items = []
+        for rule in rules:
+            for (variable, spec, predicate) in rule['predicates']:
+                indexKeys = self.indexKeys(spec)
+                if (indexKeys is not None) and (indexKeys[0] not in items):
+                    items.append(indexKeys[0])
+        for item in items:
+            buckets = {}
+            wildcard = []
+            for thisRule in range(len(rules)):
+                for (variable, spec, predicate) in rules[thisRule]['predicates']:
+                    indexKeys = self.indexKeys(spec)
+                    if (indexKeys is not None) and (indexKeys[0] == item):
+                        for key in indexKeys[1]:
+                            if key not in buckets:
+                                buckets[key] = []
+                            if thisRule not in buckets[key]:
+                                buckets[key].append(thisRule)
+                        break
+                else:
+                    wildcard.append(thisRule)
+            index = {}
+            for key in buckets:
+                index[key] = self.ruleSet(buckets[key] + wildcard)
+            ruleIndex.append((item, index, self.ruleSet(wildcard)))
+        return (ruleIndex, self.indexRanges(rules))
+
+
+    def intervalBounds(self, spec):
+        '''
+        Return (item, low, lowClosed, high, highClosed) if a compiled test requires a Glossary item to be
+        a number in an interval (a numeric range or a numeric <, <=, > or >= comparison)
+        Returns None for any other test. Missing bounds are None.
+        '''
+        kind = spec[0]
+        if (kind == 'compare') and (spec[1] in ['<', '<=', '>', '>=']) and (spec[3][0] == 'value') and isinstance(spec[3][1], float):
+            (kind, op, item, (valueKind, value)) = spec
+            if op[0] == '<':
+                return (item, None, False, value, op == '<=')
+            return (item, value, op == '>=', None, False)
+        elif (kind == 'range') and (spec[3][0] == 'value') and (spec[4][0] == 'value'):
+            (kind, item, openBracket, (lowKind, lowVal), (highKind, highVal), closeBracket) = spec
+            if isinstance(lowVal, float) and isinstance(highVal, float):
+                return (item, lowVal, openBracket == '[', highVal, closeBracket == ']')
+        return None
+
+
+    def indexRanges(self, rules):
+        '''
+        Build a sorted boundary index, for each Glossary item that is tested against numeric intervals by a list of rules.
+        The boundaries split the number line into segments (the open intervals between boundaries and the boundaries themselves)
+        and each segment lists the rules whose interval covers it, plus the rules that don't test the item as an interval.
+        Items where the segments would hold more than a quarter of the rules, on average, aren't indexed -
+        they wouldn't prune much and the index would grow with the square of the number of rules.
+        As with indexRules(), errors reported by the S-FEEL tests of the rules that are pruned will no longer be reported.
+        '''
+        rangeIndex = []
+        items = []
+        for rule in rules:
+            for (variable, spec, predicate) in rule['predicates']:
+                bounds = self.intervalBounds(spec)
+                if (bounds is not None) and (bounds[0] not in items):
+                    items.append(bounds[0])
+        for item in items:
+            intervals = []
+            wildcard = []
+            for thisRule in range(len(rules)):
+                for (variable, spec, predicate) in rules[thisRule]['predicates']:
+                    bounds = self.intervalBounds(spec)
+                    if (bounds is not None) and (bounds[0] == item):
+                        intervals.append((thisRule, bounds[1:]))
+                        break
+                else:
+                    wildcard.append(thisRule)
+            boundaries = set()
+            for (thisRule, (low, lowClosed, high, highClosed)) in intervals:
+                if low is not None:
+                    boundaries.add(low)
+                if high is not None:
+                    boundaries.add(high)
+            boundaries = sorted(boundaries)
+            # Segment 2i is the open interval below boundaries[i], segment 2i + 1 is boundaries[i] itself
+            spans = []
+            size = 0
+            for (thisRule, (low, lowClosed, high, highClosed)) in intervals:
+                if low is None:
+                    first = 0
+                else:
+                    first = 2 * bisect.bisect_left(boundaries, low) + (1 if lowClosed else 2)
+                if high is None:
+                    last = 2 * len(boundaries)
+                else:
+                    last = 2 * bisect.bisect_left(boundaries, high) + (1 if highClosed else 0)
+                if first <= last:
+                    spans.append((thisRule, first, last))
+                    size += last - first + 1
+            segmentCount = 2 * len(boundaries) + 1
+            if size + segmentCount * len(wildcard) > segmentCount * len(rules) / 4:
+                continue
+            segments = [[] for segment in range(segmentCount)]
+            for (thisRule, first, last) in spans:
+                for segment in range(first, last + 1):
+                    segments[segment].append(thisRule)
+            for segment in range(segmentCount):
+                segments[segment] = self.ruleSet(segments[segment] + wildcard)
+            rangeIndex.append((item, boundaries, segments))
+        return rangeIndex
+
+
+    def ruleSet(self, rules):
+        '''
+        A set of rule numbers, as (the rule numbers in order, the frozenset of the rule numbers)
+        '''
+        return (tuple(sorted(rules)), frozenset(rules))
+
+
+    def crosstabLookup(self, table):
+        '''
+        Build the two dimensional lookup of a crosstab decision table.
+        Every rule is the tests of one horizontal column plus the tests of one vertical row, so the first matching rule
+        is the cell of the first matching row and the first matching column, and each can be found with its own indexes.
+        '''
+        axes = []
+        for heading in ['inputRows', 'inputColumns']:
+            entries = []
+            for entry in self.decisionTables[table][heading]:
+                predicates = []
+                for (variable, test) in entry['tests']:
+                    predicates.append((variable, self.compileTest(test), self.predicates[test]))
+                entries.append({'predicates':predicates})
+            (ruleIndex, rangeIndex) = self.ruleIndexes(entries)
+            axes.append({'entries':entries, 'ruleIndex':ruleIndex, 'rangeIndex':rangeIndex})
+        horizontalCols = len(self.decisionTables[table]['inputColumns'])
+        cells = []
+        for row in range(len(self.decisionTables[table]['inputRows'])):
+            cells.append(tuple(range(row * horizontalCols, (row + 1) * horizontalCols)))
+        return {'rows':axes[0], 'columns':axes[1], 'cells':cells}
+
+
+    def firstEntry(self, axis, names):
+        '''
+        The first row (or column) of a crosstab axis whose tests all pass, or None
+        '''
+        for thisEntry in self.indexedRules(axis, len(axis['entries']), names):
+            for (variable, spec, predicate) in axis['entries'][thisEntry]['predicates']:
+                if not predicate(names):
+                    break
+            else:
+                return thisEntry
+        return None
+
+
+    def crosstabRules(self, crosstab, names):
+        '''
+        The only rule of a crosstab decision table that can match the Glossary item values - the first rule that matches
+        '''
+        row = self.firstEntry(crosstab['rows'], names)
+        if row is None:
+            return ()
+        column = self.firstEntry(crosstab['columns'], names)
+        if column is None:
+            return ()
+        return (crosstab['cells'][row][column],)
+
+
+    def candidateRules(self, table, names):
+        '''
+        The rules of a decision table that can possibly match the Glossary item values, in rule order
+        '''
+        if 'crosstab' in self.decisionTables[table]:
+            return self.crosstabRules(self.decisionTables[table]['crosstab'], names)
+        if 'decisionTree' in self.decisionTables[table]:
+            rules = self.walkTree(self.decisionTables[table]['decisionTree'], names)
+            if rules is not None:
+                return rules
+        return self.indexedRules(self.decisionTables[table], len(self.rules[table]), names)
+
+
+    def indexedRules(self, indexes, count, names):
+        '''
+        The rules, of count rules, that the equality and range indexes say can possibly match the Glossary item values, in rule order
+        '''
+        candidates = []
+        for (item, index, wildcard) in indexes['ruleIndex']:
+            try:
+                candidates.append(index.get(sfeelUnwrap(names.get(item)), wildcard))
+            except TypeError:
+                # Unhashable values can't be looked up
+                continue
+        for (item, boundaries, segments) in indexes['rangeIndex']:
+            value = sfeelUnwrap(names.get(item))
+            # Only numbers are pruned - other values compare with numbers in their own ways (and NaN is in every range)
+            if isinstance(value, float) and (value == value):
+                i = bisect.bisect_left(boundaries, value)
+                if (i < len(boundaries)) and (boundaries[i] == value):
+                    candidates.append(segments[2 * i + 1])
+                else:
+                    candidates.append(segments[2 * i])
+        if len(candidates) == 0:
+            return range(count)
+        if len(candidates) == 1:
+            return candidates[0][0]
+        candidates.sort(key=lambda ruleSet: len(ruleSet[0]))
+        rules = candidates[0][0]
+        otherSets = [otherSet for (others, otherSet) in candidates[1:]]
+        # Lazily, as single hit policies stop at the first matching rule
+        if len(otherSets) == 1:
+            otherSet = otherSets[0]
+            return (thisRule for thisRule in rules if thisRule in otherSet)
+        return (thisRule for thisRule in rules if all([thisRule in otherSet for otherSet in otherSets]))
+
+
+    def walkTree(self, node, names):
+        '''
+        Walk a decision tree to the leaf for the Glossary item values, and return the rules of that leaf
+        Returns None if a value can't be looked up (an unhashable value, or a value that isn't a number in a numeric split)
+        '''
+        while node[0] != 'rules':
+            value = sfeelUnwrap(names.get(node[1]))
+            if node[0] == 'value':
+                try:
+                    node = node[2].get(value, node[3])
+                except TypeError:
+                    return None
+            else:
+                if not (isinstance(value, float) and (value == value)):
+                    return None
+                boundaries = node[2]
+                i = bisect.bisect_left(boundaries, value)
+                if (i < len(boundaries)) and (boundaries[i] == value):
+                    node = node[3][2 * i + 1]
+                else:
+                    node = node[3][2 * i]
+        return node[1]
+
+
+    def treeSplits(self, table):
+        '''
+        The Glossary items a decision tree splits on, as (item, kind, {rule: keys or interval}),
+        with the items that the fewest rules leave untested first
+        An item is split by value if more rules test it for equality than against a numeric interval, otherwise by interval
+        '''
+        rules = self.rules[table]
+        tested = {}
+        for thisRule in range(len(rules)):
+            for (variable, spec, predicate) in rules[thisRule]['predicates']:
+                indexKeys = self.indexKeys(spec)
+                if indexKeys is not None:
+                    tested.setdefault(indexKeys[0], ({}, {}))[0].setdefault(thisRule, indexKeys[1])
+                    continue
+                bounds = self.intervalBounds(spec)
+                if bounds is not None:
+                    tested.setdefault(bounds[0], ({}, {}))[1].setdefault(thisRule, bounds[1:])
+        splits = []
+        for item in tested:
+            (keys, intervals) = tested[item]
+            if len(keys) >= len(intervals):
+                splits.append((item, 'value', keys))
+            else:
+                splits.append((item, 'range', intervals))
+        splits.sort(key=lambda split: -len(split[2]))
+        return splits
+
+
+    def exactRules(self, table, splits):
+        '''
+        The rules whose every test is decided by the decision tree splits, so the rule matches every value that reaches it
+        '''
+        exact = set()
+        splitKinds = {item: kind for (item, kind, tests) in splits}
+        for thisRule in range(len(self.rules[table])):
+            items = []
+            for (variable, spec, predicate) in self.rules[table][thisRule]['predicates']:
+                indexKeys = self.indexKeys(spec)
+                bounds = self.intervalBounds(spec)
+                if (indexKeys is not None) and (splitKinds.get(indexKeys[0]) == 'value'):
+                    items.append(indexKeys[0])
+                elif (bounds is not None) and (splitKinds.get(bounds[0]) == 'range'):
+                    items.append(bounds[0])
+                else:
+                    break
+            else:
+                if len(items) == len(set(items)):
+                    exact.add(thisRule)
+        return exact
+
+
+    def buildTree(self, table):
+        '''
+        Build a reduced decision diagram for a decision table - a decision tree that shares identical subtrees.
+        Each level splits on one Glossary item, either by value (a dictionary from each value to the subtree, plus a default subtree)
+        or by numeric interval (the segments of a sorted boundary list, as for the range index),
+        and each leaf lists the rules that can match the values that reach it, in rule order.
+        Returns (tree, leaves), or (None, None) if the tree would hold more than treeLimit rule references.
+        '''
+        splits = self.treeSplits(table)
+        nodes = {}
+        leaves = []
+        size = [0]
+
+        def build(level, rules):
+            if (level, rules) in nodes:
+                return nodes[(level, rules)]
+            size[0] += len(rules)
+            if size[0] > treeLimit:
+                raise OverflowError
+            if (level == len(splits)) or (len(rules) <= 1):
+                node = ('rules', rules)
+                leaves.append(rules)
+            else:
+                (item, kind, tests) = splits[level]
+                wildcard = [thisRule for thisRule in rules if thisRule not in tests]
+                if kind == 'value':
+                    buckets = {}
+                    for thisRule in rules:
+                        if thisRule in tests:
+                            for key in tests[thisRule]:
+                                buckets.setdefault(key, set()).add(thisRule)
+                    children = {}
+                    for key in buckets:
+                        children[key] = build(level + 1, tuple(sorted(buckets[key].union(wildcard))))
+                    node = ('value', item, children, build(level + 1, tuple(wildcard)))
+                else:
+                    boundaries = set()
+                    for thisRule in rules:
+                        if thisRule in tests:
+                            (low, lowClosed, high, highClosed) = tests[thisRule]
+                            if low is not None:
+                                boundaries.add(low)
+                            if high is not None:
+                                boundaries.add(high)
+                    boundaries = sorted(boundaries)
+                    segments = [list(wildcard) for segment in range(2 * len(boundaries) + 1)]
+                    for thisRule in rules:
+                        if thisRule in tests:
+                            (low, lowClosed, high, highClosed) = tests[thisRule]
+                            first = 0 if low is None else 2 * bisect.bisect_left(boundaries, low) + (1 if lowClosed else 2)
+                            last = 2 * len(boundaries) if high is None else 2 * bisect.bisect_left(boundaries, high) + (1 if highClosed else 0)
+                            for segment in range(first, last + 1):
+                                segments[segment].append(thisRule)
+                    node = ('range', item, boundaries, [build(level + 1, tuple(sorted(segment))) for segment in segments])
+            nodes[(level, rules)] = node
+            return node
+
+        try:
+            tree = build(0, tuple(range(len(self.rules[table]))))
+        except OverflowError:
+            return (None, None)
+        return (tree, leaves)
+
+
+    def buildDecisionTrees(self):
+        """
+        Compile each 'U' and 'A' hit policy DMN rules table into a decision tree over its input columns
+
+        decide() then walks one path through the tree, to the few rules that can match the input values,
+        instead of scanning or intersecting the rule indexes. The rules at the leaf are still tested, so no decision changes.
+        Building the trees also finds rules that overlap (rules of a 'U' table, or rules of an 'A' table with different outputs,
+        that match the same input values) and rules that can never be reached, because an earlier rule always matches first.
+
+        Returns:
+            dict: status - status['warnings'] is the list of overlapping and unreachable rules, if there are any
+
+        """
+
+        warnings = []
+        for table in self.rules:
+            self.decisionTables[table].pop('decisionTree', None)
+            hitPolicy = self.decisionTables[table]['hitPolicy']
+            if hitPolicy not in ['U', 'A']:
+                continue
+            rules = self.rules[table]
+            (tree, leaves) = self.buildTree(table)
+            if tree is None:
+                warnings.append("Decision table '{!s}' is too large for a decision tree".format(table))
+                continue
+            self.decisionTables[table]['decisionTree'] = tree
+            exact = self.exactRules(table, self.treeSplits(table))
+            reachable = set()
+            overlaps = set()
+            for leaf in leaves:
+                firstExact = None
+                for thisRule in leaf:
+                    if firstExact is None:
+                        reachable.add(thisRule)
+                        if thisRule in exact:
+                            firstExact = thisRule
+                    elif thisRule in exact:
+                        if (hitPolicy == 'U') or ([result for (variable, result, rank) in rules[firstExact]['outputs']] != [result for (variable, result, rank) in rules[thisRule]['outputs']]):
+                            overlaps.add((firstExact, thisRule))
+            for (thisRule, otherRule) in sorted(overlaps):
+                warnings.append("Rules '{!s}' and '{!s}' in decision table '{!s}' overlap".format(rules[thisRule]['ruleId'], rules[otherRule]['ruleId'], table))
+            for thisRule in range(len(rules)):
+                if thisRule not in reachable:
+                    warnings.append("Rule '{!s}' in decision table '{!s}' is unreachable".format(rules[thisRule]['ruleId'], table))
+        status = {}
+        if len(warnings) > 0:
+            status['warnings'] = warnings
+        return status
+
+
+    def mapMergedCells(self, ws):
+        '''
+        Index the merged cell ranges of a worksheet by the coordinate of every cell in them
+        '''
+        from openpyxl import utils
+        self.mergedCells = ws.merged_cells.ranges
+        self.mergedMap = {}
+        for merged in self.mergedCells:
+            for row in range(merged.min_row, merged.max_row + 1):
+                for col in range(merged.min_col, merged.max_col + 1):
+                    self.mergedMap.setdefault(utils.get_column_letter(col) + str(row), merged)
+
+
     def tableSize(self, cell):
         '''
         Determine the size of a table
@@ -327,10 +1493,9 @@ class DMN():
         # The headers must not be null
         while cell.offset(row=1, column=cols).value is not None:
             coordinate = cell.offset(row=1, column=cols).coordinate
-            for merged in self.mergedCells:
-                if coordinate in merged:
-                    cols += merged.max_col - merged.min_col + 1
-                    break
+            merged = self.mergedMap.get(coordinate)
+            if merged is not None:
+                cols += merged.max_col - merged.min_col + 1
             else:
                 cols += 1
 
@@ -341,10 +1506,9 @@ class DMN():
             for col in range(cols):
                 if cell.offset(row=rows, column=col).value is not None:
                     coordinate = cell.offset(row=rows).coordinate
-                    for merged in self.mergedCells:
-                        if coordinate in merged:
-                            rows += merged.max_row - merged.min_row + 1
-                            break
+                    merged = self.mergedMap.get(coordinate)
+                    if merged is not None:
+                        rows += merged.max_row - merged.min_row + 1
                     else:
                         rows += 1
                     inTable = True
@@ -536,10 +1700,9 @@ class DMN():
                     coordinate = cell.offset(row=thisRow, column=thisCol).coordinate
                     if thisCol <= inputColumns:
                         if thisCell is not None:
-                            for merged in self.mergedCells:
-                                if coordinate in merged:
-                                    mergeCount = merged.max_row - merged.min_row
-                                    break
+                            merged = self.mergedMap.get(coordinate)
+                            if merged is not None:
+                                mergeCount = merged.max_row - merged.min_row
                             else:
                                 mergeCount = 0
                             thisCell = str(thisCell).strip()
@@ -579,10 +1742,9 @@ class DMN():
                         self.rules[table][thisRule]['tests'].append((name, test))
                     elif thisCol <= inputColumns + outputColumns:
                         if thisCell is not None:
-                            for merged in self.mergedCells:
-                                if coordinate in merged:
-                                    mergeCount = merged.max_row - merged.min_row
-                                    break
+                            merged = self.mergedMap.get(coordinate)
+                            if merged is not None:
+                                mergeCount = merged.max_row - merged.min_row
                             else:
                                 mergeCount = 0
                             thisCell = str(thisCell).strip()
@@ -786,10 +1948,9 @@ class DMN():
                     coordinate = cell.offset(row=thisRow, column=thisCol).coordinate
                     if inputRow < inputRows:
                         if thisCell is not None:
-                            for merged in self.mergedCells:
-                                if coordinate in merged:
-                                    mergeCount = merged.max_col - merged.min_col
-                                    break
+                            merged = self.mergedMap.get(coordinate)
+                            if merged is not None:
+                                mergeCount = merged.max_col - merged.min_col
                             else:
                                 mergeCount = 0
                             thisCell = str(thisCell).strip()
@@ -829,10 +1990,9 @@ class DMN():
                         self.rules[table][thisRule]['tests'].append((name, test))
                     elif outputRow < outputRows:
                         if thisCell is not None:
-                            for merged in self.mergedCells:
-                                if coordinate in merged:
-                                    mergeCount = merged.max_col - merged.min_col
-                                    break
+                            merged = self.mergedMap.get(coordinate)
+                            if merged is not None:
+                                mergeCount = merged.max_col - merged.min_col
                             else:
                                 mergeCount = 0
                             thisCell = str(thisCell).strip()
@@ -882,11 +2042,10 @@ class DMN():
             outputVariable = str(thisCell).strip()
             # This should be merged cell - need a row and a column of variables, plus another row and column of tests (as a minimum)
             coordinate = cell.offset(row=1).coordinate
-            for merged in self.mergedCells:
-                if coordinate in merged:
-                    width = merged.max_col - merged.min_col + 1
-                    height = merged.max_row - merged.min_row + 1
-                    break
+            merged = self.mergedMap.get(coordinate)
+            if merged is not None:
+                width = merged.max_col - merged.min_col + 1
+                height = merged.max_row - merged.min_row + 1
             else:
                 self.errors.append("Decision table '{!s}' - unknown DMN rules table type".format(table))
                 return (rows, cols, -1)
@@ -899,10 +2058,9 @@ class DMN():
 
             # Parse the horizontal heading
             coordinate = cell.offset(row=1, column=width).coordinate
-            for merged in self.mergedCells:
-                if coordinate in merged:
-                    horizontalCols = merged.max_col - merged.min_col + 1
-                    break
+            merged = self.mergedMap.get(coordinate)
+            if merged is not None:
+                horizontalCols = merged.max_col - merged.min_col + 1
             else:
                 horizontalCols = 1
 
@@ -932,10 +2090,9 @@ class DMN():
                     thisCell = cell.offset(row=2 + thisVariable, column=width + thisCol).value
                     coordinate = cell.offset(row=2 + thisVariable, column=width + thisCol).coordinate
                     if thisCell is not None:
-                        for merged in self.mergedCells:
-                            if coordinate in merged:
-                                mergeCount = merged.max_col - merged.min_col
-                                break
+                        merged = self.mergedMap.get(coordinate)
+                        if merged is not None:
+                            mergeCount = merged.max_col - merged.min_col
                         else:
                             mergeCount = 0
                         thisCell = str(thisCell).strip()
@@ -969,10 +2126,9 @@ class DMN():
 
             # Parse the vertical heading
             coordinate = cell.offset(row=1 + height).coordinate
-            for merged in self.mergedCells:
-                if coordinate in merged:
-                    verticalRows = merged.max_row - merged.min_row + 1
-                    break
+            merged = self.mergedMap.get(coordinate)
+            if merged is not None:
+                verticalRows = merged.max_row - merged.min_row + 1
             else:
                 verticalRows = 1
 
@@ -1002,10 +2158,9 @@ class DMN():
                     thisCell = cell.offset(row=1 + height + thisRow, column=1 + thisVariable).value
                     coordinate = cell.offset(row=1 + height + thisRow, column=1 + thisVariable).coordinate
                     if thisCell is not None:
-                        for merged in self.mergedCells:
-                            if coordinate in merged:
-                                mergeCount = merged.max_row - merged.min_row
-                                break
+                        merged = self.mergedMap.get(coordinate)
+                        if merged is not None:
+                            mergeCount = merged.max_row - merged.min_row
                         else:
                             mergeCount = 0
                         thisCell = str(thisCell).strip()
@@ -1063,7 +2218,7 @@ class DMN():
         return (rows, cols, len(self.rules[table]))
 
 
-    def load(self, rulesBook):
+    def load(self, rulesBook, decisionTrees=False):
         """
         Load a rulesBook
 
@@ -1072,6 +2227,7 @@ class DMN():
 
         Args:
             param1 (str): The name of the Excel workbook (including path if it is not in the current working directory
+            param2 (bool): optional - compile the 'U' and 'A' hit policy DMN rules tables into decision trees - see buildDecisionTrees()
 
         Returns:
             dict: status
@@ -1084,8 +2240,17 @@ class DMN():
         """
 
         self.errors = []
+        self.compiledTests = {}
+        self.compiledResults = {}
+        self.testStats = {}
+        self.tableProfiles = {}
+        self.ruleProfiles = {}
+        self.newVersion()
+        # openpyxl is only needed to read workbooks - not to load compiled rulesBooks
+        from openpyxl import load_workbook
         try:
             self.wb = load_workbook(filename=rulesBook)
+            self.rulesBookHash = fileHash(rulesBook)
         except Exception as e:
             self.errors.append("No readable workbook named '{!s}'!".format(rulesBook))
             status = {}
@@ -1100,7 +2265,7 @@ class DMN():
             status = {}
             status['errors'] = self.errors
             return status
-        self.mergedCells = ws.merged_cells.ranges
+        self.mapMergedCells(ws)
         inGlossary = False
         self.glossary = {}
         self.glossaryItems = {}
@@ -1204,7 +2369,7 @@ class DMN():
             status = {}
             status['errors'] = self.errors
             return status
-        self.mergedCells = ws.merged_cells.ranges
+        self.mapMergedCells(ws)
         inDecision = False
         endDecision = False
         decisionColumn = None
@@ -1282,10 +2447,9 @@ class DMN():
                 coordinate = cell.offset(row=thisRow, column=thisCol).coordinate
                 if thisCol < inputColumns:
                     if thisCell is not None:
-                        for merged in self.mergedCells:
-                            if coordinate in merged:
-                                mergeCount = merged.max_row - merged.min_row
-                                break
+                        merged = self.mergedMap.get(coordinate)
+                        if merged is not None:
+                            mergeCount = merged.max_row - merged.min_row
                         else:
                             mergeCount = 0
                         thisCell = str(thisCell).strip()
@@ -1338,17 +2502,21 @@ class DMN():
             if sheet in ['Glossary', 'Decision', 'Test']:
                 continue
             ws = self.wb[sheet]
-            self.mergedCells = ws.merged_cells.ranges
+            self.mapMergedCells(ws)
+            # Find the table names from the cell values, skipping the cells of tables that have been parsed
             parsedRanges = []
-            for row in ws.rows:
-                for cell in row:
-                    for i in range(len(parsedRanges)):
-                        parsed = parsedRanges[i]
-                        if cell.coordinate in parsed:
-                            continue
-                    thisCell = cell.value
+            for (thisRow, values) in enumerate(ws.iter_rows(values_only=True), start=1):
+                for (thisCol, thisCell) in enumerate(values, start=1):
                     if isinstance(thisCell, str):
                         if thisCell in self.decisionTables:
+                            inParsed = False
+                            for (minRow, minCol, maxRow, maxCol) in parsedRanges:
+                                if (minRow <= thisRow <= maxRow) and (minCol <= thisCol <= maxCol):
+                                    inParsed = True
+                                    break
+                            if inParsed:
+                                continue
+                            cell = ws.cell(row=thisRow, column=thisCol)
                             (rows, cols, rules) = self.parseDecionTable(cell)
                             if rules == -1:
                                 status = {}
@@ -1361,36 +2529,253 @@ class DMN():
                                 status['errors'] = self.errors
                                 return status
                                 continue
-                            # Symbolically merge all the cells in this table
-                            thisRow = cell.row
-                            thisCol = cell.column
-                            ws.merge_cells(start_row=thisRow, start_column=thisCol,
-                                           end_row=thisRow + rows - 1, end_column=thisCol + cols - 1)
-                            # Find this merge range
-                            for thisMerged in self.mergedCells:
-                                if (thisMerged.min_col == cell.column) and (thisMerged.min_row == cell.row):
-                                    if thisMerged.max_col != (cell.column + cols - 1):
-                                        continue
-                                    if thisMerged.max_row != (cell.row + rows - 1):
-                                        continue
-                                    # Mark it as parsed
-                                    parsedRanges.append(thisMerged)
+                            # Mark all the cells in this table as parsed
+                            parsedRanges.append((thisRow, thisCol, thisRow + rows - 1, thisCol + cols - 1))
                             break
+        self.compileRules()
+        self.indexRules()
         self.isLoaded = True
         status = {}
+        if decisionTrees and (len(self.errors) == 0):
+            status = self.buildDecisionTrees()
         if len(self.errors) > 0:
             status['errors'] = self.errors
         return status
 
+
+    def loadXML(self, dmnFile, decisionTrees=False):
+        """
+        Load a DMN XML file (DMN 1.1 to 1.3, as saved by Camunda Modeler and other DMN modelers)
+
+        Each decision table becomes a DMN rules table, named by the decision's id, and the Decision table runs them
+        in the order of their decision requirements. The Glossary is built from the input expressions and output names -
+        'concept.attribute' names keep their Business Concept, other names are in the Business Concept 'Data'.
+        The UNIQUE, FIRST, PRIORITY, ANY, COLLECT (with or without an aggregation), RULE ORDER and OUTPUT ORDER hit policies are supported,
+        and rule descriptions become the rule annotation 'Description'.
+
+        Args:
+            param1 (str): The name of the DMN XML file (including path if it is not in the current working directory
+            param2 (bool): optional - compile the 'U' and 'A' hit policy tables into decision trees - see buildDecisionTrees()
+
+        Returns:
+            dict: status - see load()
+
+        """
+
+        from .dmnxml import loadXML
+        return loadXML(self, dmnFile, decisionTrees)
+
+    def saveCompiled(self, compiledFile):
+        """
+        Save the loaded rulesBook as a compiled rulesBook file, which loadCompiled() can load without reading the workbook
+
+        The compiled rulesBook holds the Glossary, the Decision table, the DMN rules tables and their compiled tests and output values,
+        plus the version of the compiled file format and the SHA-256 hash of the workbook it was compiled from.
+        If the rulesBook has decision trees (see buildDecisionTrees()), loadCompiled() builds them again.
+
+        Args:
+            param1 (str): The name of the compiled rulesBook file to write
+
+        Returns:
+            dict: status - as for load()
+
+        """
+
+        self.errors = []
+        if not self.isLoaded:
+            self.errors.append('No rulesBook has been loaded')
+            status = {}
+            status['errors'] = self.errors
+            return status
+        compiled = self.compiledRulesBook()
+        try:
+            with open(compiledFile, 'wb') as fp:
+                pickle.dump(compiled, fp, protocol=4)
+        except Exception as e:
+            self.errors.append("Cannot write compiled rulesBook '{!s}' - {!s}".format(compiledFile, e))
+        status = {}
+        if len(self.errors) > 0:
+            status['errors'] = self.errors
+        return status
+
+
+    def compiledRulesBook(self):
+        '''
+        The loaded rulesBook as a compiled rulesBook dictionary, which can be pickled
+        The compiled functions and indexes are rebuilt from the compiled specifications by restoreCompiled()
+        '''
+        decisionTables = {}
+        for table in self.decisionTables:
+            decisionTables[table] = {}
+            for key in self.decisionTables[table]:
+                if key not in ['inputPredicates', 'ruleIndex', 'rangeIndex', 'decisionTree', 'crosstab', 'reads', 'writes']:
+                    decisionTables[table][key] = self.decisionTables[table][key]
+        rules = {}
+        for table in self.rules:
+            rules[table] = []
+            for rule in self.rules[table]:
+                rules[table].append({key: rule[key] for key in rule if key not in ['predicates', 'values', 'rank']})
+        compiled = {}
+        compiled['format'] = compiledFormat
+        compiled['version'] = compiledVersion
+        compiled['rulesBookHash'] = self.rulesBookHash
+        compiled['glossary'] = self.glossary
+        compiled['glossaryItems'] = self.glossaryItems
+        compiled['glossaryConcepts'] = self.glossaryConcepts
+        compiled['decisions'] = self.decisions
+        compiled['decisionTables'] = decisionTables
+        compiled['rules'] = rules
+        compiled['compiledTests'] = self.compiledTests
+        compiled['compiledResults'] = self.compiledResults
+        # The decision trees are rebuilt, not saved
+        compiled['decisionTrees'] = any(['decisionTree' in self.decisionTables[table] for table in self.decisionTables])
+        return compiled
+
+
+    def loadCompiled(self, compiledFile, rulesBook=None):
+        """
+        Load a compiled rulesBook, as saved by saveCompiled()
+
+        Compiled rulesBook files are Python pickles - only load compiled rulesBooks from trusted sources.
+        A DMN loaded from a compiled rulesBook can make decisions, but cannot run test(), as it has no workbook.
+
+        Args:
+            param1 (str): The name of the compiled rulesBook file
+            param2 (str): optional - the name of the Excel workbook that was compiled.
+                The workbook is loaded with load() instead if the compiled rulesBook is unreadable,
+                was saved by a different version of pyDMNrules, or was compiled from a different version of the workbook.
+                The compiled rulesBook is used if the workbook does not exist.
+
+        Returns:
+            dict: status - as for load()
+
+        """
+
+        self.errors = []
+        compiled = None
+        try:
+            with open(compiledFile, 'rb') as fp:
+                compiled = pickle.load(fp)
+        except Exception as e:
+            self.errors.append("No readable compiled rulesBook named '{!s}'!".format(compiledFile))
+        if (compiled is not None) and (not isinstance(compiled, dict) or (compiled.get('format') != compiledFormat) or (compiled.get('version') != compiledVersion)):
+            self.errors.append("'{!s}' is not a compiled rulesBook for this version of pyDMNrules".format(compiledFile))
+        if (len(self.errors) == 0) and (rulesBook is not None):
+            try:
+                rulesBookHash = fileHash(rulesBook)
+            except OSError:
+                rulesBookHash = None
+            if (rulesBookHash is not None) and (rulesBookHash != compiled['rulesBookHash']):
+                self.errors.append("Compiled rulesBook '{!s}' was not compiled from '{!s}'".format(compiledFile, rulesBook))
+        if len(self.errors) > 0:
+            if rulesBook is not None:
+                return self.load(rulesBook)
+            status = {}
+            status['errors'] = self.errors
+            return status
+        self.restoreCompiled(compiled)
+        return {}
+
+
+    def restoreCompiled(self, compiled):
+        '''
+        Make this DMN the rulesBook in a compiled rulesBook dictionary from compiledRulesBook()
+        '''
+        self.newVersion()
+        self.wb = None
+        self.rulesBookHash = compiled['rulesBookHash']
+        self.glossary = compiled['glossary']
+        self.glossaryItems = compiled['glossaryItems']
+        self.glossaryConcepts = compiled['glossaryConcepts']
+        self.glossaryLoaded = True
+        self.decisions = compiled['decisions']
+        self.decisionTables = compiled['decisionTables']
+        self.rules = compiled['rules']
+        self.compiledTests = compiled['compiledTests']
+        self.testStats = {}
+        self.tableProfiles = {}
+        self.ruleProfiles = {}
+        self.compiledResults = compiled['compiledResults']
+        self.compileRules()
+        self.indexRules()
+        self.isLoaded = True
+        if compiled.get('decisionTrees', False):
+            self.buildDecisionTrees()
+
+
+    def newVersion(self):
+        '''
+        A new rulesBook is being loaded - forget the memoised results of the old one
+        '''
+        with self.resultLock:
+            self.rulesBookVersion += 1
+            self.results.clear()
+
+
+    def cacheResults(self, maxSize=1024):
+        '''
+        Memoise the results of decide() for up to maxSize different sets of data (0 turns memoisation off)
+        '''
+        with self.resultLock:
+            self.resultsSize = max(maxSize, 0)
+            self.evictResults()
+
+
+    def evictResults(self):
+        '''
+        Discard the least recently used results (the result lock must be held)
+        '''
+        while len(self.results) > self.resultsSize:
+            self.results.popitem(last=False)
+
+
+    def clearResults(self):
+        '''
+        Discard all the memoised results
+        '''
+        with self.resultLock:
+            self.results.clear()
+            self.resultHits = 0
+            self.resultMisses = 0
+
+
+    def resultStats(self):
+        '''
+        Return the number of memoised results and the hit/miss counters
+        '''
+        with self.resultLock:
+            return {'size': len(self.results), 'maxSize': self.resultsSize, 'hits': self.resultHits, 'misses': self.resultMisses}
+
+
+    def resultKey(self, data, outputs):
+        '''
+        The memoised result key for this data - the normalised input values, the outputs and the rulesBook version
+        None if the data can't be used as a key
+        '''
+        inputs = []
+        for variable in data:
+            (isNative, value) = self.value2native(data[variable])
+            if not isNative:
+                value = data[variable]
+            inputs.append((variable, hashableValue(value)))
+        key = (self.rulesBookVersion, None if outputs is None else tuple(outputs), frozenset(inputs))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
     def initGlossary(self):
         if not self.glossaryLoaded:
             self.errors.append('No rulesBook has been loaded')
             sys.exit(0)
+        names = self.names
         for item in self.glossaryItems:
-            retVal = self.sfeel('{} <- null'.format(item))
+            names[item] = None
 
 
-    def decide(self, data):
+    def decide(self, data, outputs=None):
         """
         Make a decision
 
@@ -1404,6 +2789,8 @@ class DMN():
                 - Any entry in the Glossary which does not have a key in the 'data' dictionary will be set to the value 'None'.
                 - The values associated with each 'Variable' in the Glossary
                   will be the input values, for the input columns, in the first DMN rules table in the 'Decision'.
+            param2 (list): optional - the 'Variables' to return in each 'Result' dictionary (default - every 'Variable' in the Glossary).
+                Only these 'Variables' are read back after each DMN rules table has been run.
 
         Returns:
             tuple: (status, newData)
@@ -1447,269 +2834,635 @@ class DMN():
             The final enty in this list is the final decision.
             All other entries are the intermediate states involved in making the final decision.
 
+            If cacheResults() has been called, decisions without errors are memoised and
+            each decision is a copy of the memoised decision, so changing it doesn't change later decisions.
+
         """
 
-        self.errors = []
         if not self.isLoaded:
-            self.errors.append('No rulesBook has been loaded')
             status = {}
-            status['errors'] = self.errors
-            self.errors = []
+            status['errors'] = ['No rulesBook has been loaded']
             return (status, {})
-        self.errors = []
-        self.warnings = []
-        self.initGlossary()
+        errors = self.outputErrors(outputs)
+        if len(errors) > 0:
+            status = {}
+            status['errors'] = errors
+            return (status, {})
+        if self.resultsSize == 0:
+            return self.makeDecision(self.newContext(), data, outputs)
+        key = self.resultKey(data, outputs)
+        if key is None:
+            return self.makeDecision(self.newContext(), data, outputs)
+        with self.resultLock:
+            newData = self.results.get(key)
+            if newData is not None:
+                self.results.move_to_end(key)
+                self.resultHits += 1
+            else:
+                self.resultMisses += 1
+        if newData is not None:
+            # A copy, so that a caller changing its decision can't change the memoised decision
+            return ({}, copy.deepcopy(newData))
+        (status, newData) = self.makeDecision(self.newContext(), data, outputs)
+        if 'errors' in status:
+            return (status, newData)
+        with self.resultLock:
+            if key[0] == self.rulesBookVersion:
+                self.results[key] = copy.deepcopy(newData)
+                self.results.move_to_end(key)
+                self.evictResults()
+        return (status, newData)
+
+
+    def decideMany(self, records, outputs=None):
+        """
+        Make a decision for each of a batch of records
+
+        This routine runs each record through the loaded DMN rules, exactly as decide() would,
+        in a decision context of its own.
+
+        Args:
+            param1 (iterable): The records - an iterable of data dictionaries, each as passed to decide(),
+                or a pandas DataFrame, with one column for each 'Variable' (NaN values are passed as None).
+            param2 (list): optional - the 'Variables' to return in each 'Result' dictionary - see decide()
+
+        Returns:
+            list: [(status, newData), ...]
+
+            One (status, newData) tuple for each record, in the order of the records - see decide()
+            If no rulesBook is loaded, or an output is not in the Glossary, each record's status has the error.
+
+        """
+
+        records = dataRecords(records)
+        if not self.isLoaded:
+            return [({'errors': ['No rulesBook has been loaded']}, {}) for data in records]
+        errors = self.outputErrors(outputs)
+        if len(errors) > 0:
+            return [({'errors': list(errors)}, {}) for data in records]
+        initialNames = dict.fromkeys(self.glossaryItems)
+        results = []
+        for data in records:
+            results.append(self.makeDecision(DecisionContext(initialNames), data, outputs))
+        return results
+
+
+    def decideIncremental(self, data, previous=None, outputs=None):
+        """
+        Make a decision, re-running only the DMN rules tables that depend on data that has changed since a previous decision
+
+        When the workbook was loaded, the Glossary items that each DMN rules table in the 'Decision' table reads and writes were found.
+        A DMN rules table is only run again if an input 'Variable' it reads has changed, or an earlier table that was run again
+        changed an output it reads. The previous decision of every other table is reused.
+
+        Args:
+            param1 (dict): The data - as for decide(). With previous, only the 'Variables' that have changed are needed.
+            param2 (dict): optional - the decision state returned by the previous call of decideIncremental() (default - decide everything)
+            param3 (list): optional - the 'Variables' to return in each 'Result' dictionary - see decide()
+
+        Returns:
+            tuple: (status, newData, decision)
+
+            status and newData are as returned by decide().
+            decision is the decision state to pass to the next call, or None if there were errors.
+            Treat it, and the decision dictionaries in newData, as read only.
+
+        """
+
+        if not self.isLoaded:
+            status = {}
+            status['errors'] = ['No rulesBook has been loaded']
+            return (status, {}, None)
+        errors = self.outputErrors(outputs)
+        if len(errors) > 0:
+            status = {}
+            status['errors'] = errors
+            return (status, {}, None)
+        if outputs is not None:
+            outputs = list(outputs)
+        if (previous is not None) and ((previous['version'] != self.rulesBookVersion) or (previous['outputs'] != outputs)):
+            previous = None
+
+        # The items that have changed - None means everything must be decided
+        if previous is None:
+            allData = dict(data)
+            changed = None
+        else:
+            allData = dict(previous['data'])
+            allData.update(data)
+            changed = set()
+            for variable in data:
+                if (variable not in previous['data']) or not sameValue(previous['data'][variable], data[variable]):
+                    if variable in self.glossary:
+                        changed.add(self.glossary[variable]['item'])
+        context = self.newContext()
+        if not self.bindData(context, allData):
+            status = {}
+            status['errors'] = context.errors
+            return (status, {}, None)
+
+        names = context
+        tables = []
+        allResults = []
+        for thisTable in range(len(self.decisions)):
+            (table, inputTests, decisionAnnotations) = self.decisions[thisTable]
+            before = previous['tables'][thisTable] if previous is not None else None
+            if (changed is not None) and changed.isdisjoint(self.decisionTables[table]['reads']):
+                # Nothing this table reads has changed, so neither has its decision
+                tables.append(before)
+                if before['newData'] is not None:
+                    for item in before['written']:
+                        names[item] = before['written'][item]
+                    allResults.append(self.reuseDecision(names, table, before['newData'], outputs))
+                continue
+            newData = None
+            written = {}
+            if self.tableApplies(context, table, inputTests):
+                newData = self.decideTable(context, table, decisionAnnotations, outputs)
+                if newData is None:
+                    status = {}
+                    status['errors'] = context.errors
+                    return (status, {}, None)
+                allResults.append(newData)
+                for item in self.decisionTables[table]['writes']:
+                    written[item] = names[item]
+            tables.append({'newData': newData, 'written': written})
+            if changed is not None:
+                for item in self.decisionTables[table]['writes']:
+                    if (item in written) != (item in before['written']):
+                        changed.add(item)
+                    elif (item in written) and not sameValue(written[item], before['written'][item]):
+                        changed.add(item)
+
+        status = {}
+        decision = None
+        if len(context.errors) > 0:
+            status['errors'] = context.errors
+        else:
+            decision = {'version': self.rulesBookVersion, 'outputs': outputs, 'data': allData, 'tables': tables}
+        if len(allResults) == 1:
+            return (status, allResults[0], decision)
+        else:
+            return (status, allResults, decision)
+
+
+    def reuseDecision(self, names, table, newData, outputs):
+        '''
+        A previous decision dictionary for a DMN rules table, with the 'Result' read back from the current Glossary item values,
+        except for the outputs of the table, which keep their previous values
+        '''
+        writes = self.decisionTables[table]['writes']
+        newData = dict(newData)
+        result = {}
+        for variable in (self.glossary if outputs is None else outputs):
+            item = self.glossary[variable]['item']
+            if item in writes:
+                result[variable] = newData['Result'][variable]
+                continue
+            thisResult = sfeelUnwrap(names[item])
+            if isinstance(thisResult, str):
+                if (thisResult[0] == '"') and (thisResult[-1] == '"'):
+                    thisResult = thisResult[1:-1]
+            result[variable] = thisResult
+        newData['Result'] = result
+        return newData
+
+
+    def decideColumns(self, data, table=None):
+        """
+        Make a decision for whole columns of data at once
+
+        Each rule's tests are evaluated as numpy boolean masks over all the records,
+        and the hit policy is then resolved with array operations.
+        Tests that can't be vectorised (S-FEEL functions, tests against other Glossary items)
+        are evaluated record by record, and values that decide() binds through the S-FEEL parser
+        (e.g. strings that are Glossary Variables) are bound record by record, the same way. Requires numpy.
+
+        Args:
+            param1 (dict): The columns of data - each key must match a 'Variable' in the Glossary
+                and each value is a numpy array (or list) of the values for that 'Variable', one per record.
+                NaN values are passed as None. Missing 'Variables' are None for every record.
+            param2 (str): The name of the DMN rules table to use (default - the first table in the 'Decision' table).
+                Only tables with a 'U', 'A', 'F', 'R' or 'C' (including 'C+', 'C#', 'C<' and 'C>') hit policy can be used.
+
+        Returns:
+            tuple: (status, results)
+
+            status is as returned by decide(), except that there is one 'No rules matched' error
+                for all the records that matched no rule.
+
+            results is a dictionary with the keys
+                - 'Result' - a dictionary of numpy object arrays, one for each output 'Variable' of the DMN rules table,
+                  holding the value decide() would have returned for each record (None if no rule matched).
+                - 'Executed Rule' - a numpy object array of the 'Executed Rule' tuple for each record (None if there isn't one).
+                - 'Matched' - a numpy boolean array, True for each record that matched one or more rules.
+
+        """
+
+        from .columnar import decideColumns
+        return decideColumns(self, data, table)
+
+
+    def decideParallel(self, records, outputs=None, workers=None, chunkSize=1000):
+        """
+        Make a decision for each of a large batch of records, using a pool of worker processes
+
+        The loaded rulesBook is sent to each worker process once, when the pool starts.
+        The records are sent to the workers in chunks of chunkSize records, and each chunk is run through decideMany().
+        Only a few chunks per worker are in progress at any time, so records can be a generator of any length.
+
+        Args:
+            param1 (iterable): The records - as for decideMany()
+            param2 (list): optional - the 'Variables' to return in each 'Result' dictionary - see decide()
+            param3 (int): optional - the number of worker processes (default - the number of CPUs)
+            param4 (int): optional - the number of records in each chunk (default 1000)
+
+        Returns:
+            generator: of (status, newData)
+
+            One (status, newData) tuple for each record, in the order of the records - see decide().
+            Results are yielded as soon as the chunk that holds them, and every earlier chunk, has been decided.
+
+        """
+
+        from .parallel import decideParallel
+        return decideParallel(self, records, outputs, workers, chunkSize)
+
+
+    async def decideAsync(self, data, outputs=None):
+        """
+        Make a decision, in asyncio code, without blocking the event loop
+
+        The decision is made by a thread of a bounded thread pool, shared by every asyncio decision in this process
+        (PYDMNRULES_ASYNC_WORKERS threads, default - up to 4). Decisions are made in decision contexts of their own,
+        so any number of them can be awaited at the same time - see pyDMNrules.aio.gatherLimited().
+
+        Args:
+            param1 (dict): The data - see decide()
+            param2 (list): optional - the 'Variables' to return in each 'Result' dictionary - see decide()
+
+        Returns:
+            tuple: (status, newData) - see decide()
+
+        """
+
+        from .aio import decideAsync
+        return await decideAsync(self, data, outputs)
+
+
+    async def decideManyAsync(self, records, outputs=None, chunkSize=100):
+        """
+        Make a decision for each of a batch of records, in asyncio code, without blocking the event loop
+
+        The records are decided chunkSize records at a time, by decideMany(), in the threads that decideAsync() uses.
+
+        Args:
+            param1 (iterable): The records - as for decideMany()
+            param2 (list): optional - the 'Variables' to return in each 'Result' dictionary - see decide()
+            param3 (int): optional - the number of records in each chunk (default 100)
+
+        Returns:
+            list: [(status, newData), ...] - see decideMany()
+
+        """
+
+        from .aio import decideManyAsync
+        return await decideManyAsync(self, records, outputs, chunkSize)
+
+
+    def generatePython(self, moduleFile=None):
+        """
+        Generate a standalone Python module that makes the same decisions as this rulesBook
+
+        Each DMN rules table becomes a function, with its tests written as inline Python comparisons,
+        its hit policy written out, and large tables split into a dictionary of their most selective equality test.
+        The module's decide(data, outputs=None) returns the same (status, newData) as decide(), and only needs the Python standard library.
+        Only tests that compile without the S-FEEL parser can be generated - a value ('p', '5'), a comparison with a value ('< 5', '!= p'),
+        a list of values ('p, q', 'in(p, q)') and a range that opens with '[' ('[2..8]', '[2..8)'), where a value can also be a Glossary item.
+        Rulesbooks with other tests (e.g. '(2..8]', ']2..8]', 'not(5)', 'in(< 2, > 8)', '"p"' or S-FEEL functions),
+        or with outputs that need the S-FEEL parser, can't be generated - status['errors'] names each of those tests.
+        The generated module rejects data that only the S-FEEL parser can bind (e.g. strings containing '"').
+
+        Args:
+            param1 (str): optional - the name of the file to write the module to
+
+        Returns:
+            tuple: (status, source)
+
+            status is a dictionary - if the key 'errors' is present, the module could not be generated
+            and status['errors'] is the list of reasons why.
+
+            source is the Python source of the module (None if it could not be generated).
+
+        """
+
+        from .codegen import generatePython
+        return generatePython(self, moduleFile)
+
+
+    def checkGenerated(self, module):
+        """
+        Check a generated module against this rulesBook, by running the unit tests in the 'Test' worksheet through both
+
+        Args:
+            param1 (module or str): the generated module, or the name of its file
+
+        Returns:
+            tuple: (status, mismatches)
+
+            status has the errors returned by test() if no tests were run through the generated module.
+            test() can only run the tests of a loaded workbook once, so load the workbook again to check another module.
+
+            mismatches is a list of the tests where the generated module's (status, newData) differs from decide()'s.
+
+        """
+
+        from .codegen import checkGenerated
+        return checkGenerated(self, module)
+
+
+    def outputErrors(self, outputs):
+        '''
+        Check that the requested output Variables are all in the Glossary
+        '''
+        errors = []
+        if outputs is not None:
+            for variable in outputs:
+                if variable not in self.glossary:
+                    errors.append('output variable ({!s}) not in Glossary'.format(variable))
+        return errors
+
+
+    def newContext(self):
+        '''
+        A new decision context, with every Glossary item set to None
+        '''
+        return DecisionContext(dict.fromkeys(self.glossaryItems))
+
+
+    def makeDecision(self, context, data, outputs=None):
+        '''
+        Make a decision about data, in a new decision context
+        If outputs is a list of Variables, only those Variables are returned in each 'Result'
+        '''
+        if not self.bindData(context, data):
+            status = {}
+            status['errors'] = context.errors
+            context.errors = []
+            return (status, {})
+
+        # Process each decision table in order
+        allResults = []
+        for (table, inputTests, decisionAnnotations) in self.decisions:
+            if not self.tableApplies(context, table, inputTests):
+                continue
+            newData = self.decideTable(context, table, decisionAnnotations, outputs)
+            if newData is None:
+                status = {}
+                status['errors'] = context.errors
+                context.errors = []
+                return (status, {})
+            allResults.append(newData)
+
+        status = {}
+        if len(context.errors) > 0:
+            status['errors'] = context.errors
+            context.errors = []
+        if len(allResults) == 1:
+            return (status, newData)
+        else:
+            return (status, allResults)
+
+
+    def bindData(self, context, data):
+        '''
+        Set the Glossary items in a decision context to the values in data
+        Returns False if the data is invalid (the errors are in context.errors)
+        '''
+        names = context
         validData = True
         for variable in data:
             if variable not in self.glossary:
-                self.errors.append('variable ({!s}) not in Glossary'.format(variable))
-                status = {}
-                status['errors'] = self.errors
-                self.errors = []
-                return (status, {})
+                context.errors.append('variable ({!s}) not in Glossary'.format(variable))
+                return False
             item = self.glossary[variable]['item']
             value = data[variable]
-            value = self.value2sfeel(value)
-            if value is None:
+            (isNative, nativeValue) = self.value2native(value)
+            if isNative:
+                names[item] = nativeValue
+                continue
+            sfeelValue = self.value2sfeel(value)
+            if sfeelValue is None:
+                context.errors.append("Invalid Data '{!r}' - not a valid S-FEEL data type".format(value))
                 validData = False
             else:
-                # print('Setting Variable ({!s}) [item ({!s})] to value ({!s})'.format(variable, item, value))
-                retVal = self.sfeel('{} <- {}'.format(item, value))
-        if not validData:
-            status = {}
-            status['errors'] = self.errors
-            self.errors = []
-            return (status, {})
+                # print('Setting Variable ({!s}) [item ({!s})] to value ({!s})'.format(variable, item, sfeelValue))
+                retVal = context.sfeel('{} <- {}'.format(item, sfeelValue))
+        return validData
 
-        # Process each decision table in order
-        allResults = []
-        for (table, inputTests, decisionAnnotations) in self.decisions:
-            if len(inputTests) > 0:
-                doDecision = True
-                for (variable, test) in inputTests:
-                    item = self.glossary[variable]['item']
-                    itemValue = self.sfeel('{}'.format(item))
-                    retVal = self.sfeel('{}'.format(test))
-                    # print("Decision Variable '{!s}' [data '{!s}'] with test '{!s}' returned '{!s}'".format(variable, itemValue, test, retVal))
-                    if not retVal:
-                        doDecision = False
-                        break
-                if not doDecision:
-                    continue
-                
-            ranks = []
-            foundRule = None
-            rankedRules = []
-            for thisRule in range(len(self.rules[table])):
-                for (variable, test) in self.rules[table][thisRule]['tests']:
+
+    def tableApplies(self, context, table, inputTests):
+        '''
+        Check the input tests, from the 'Decision' table, that decide if a DMN rules table is used
+        '''
+        names = context
+        if len(inputTests) > 0:
+            for (variable, spec, predicate) in self.decisionTables[table]['inputPredicates']:
+                retVal = predicate(names)
+                # print("Decision Variable '{!s}' with test '{!s}' returned '{!s}'".format(variable, spec, retVal))
+                if not retVal:
+                    if self.profiling:
+                        self.tableProfile(table)['skipped'] += 1
+                    return False
+        return True
+
+
+    def decideTable(self, context, table, decisionAnnotations, outputs=None):
+        '''
+        Run a DMN rules table against the Glossary item values in a decision context
+        Returns the decision dictionary for this table, or None if no rules matched (the errors are in context.errors)
+        '''
+        names = context
+        profiling = self.profiling
+        if profiling:
+            started = time.perf_counter()
+        ranks = []
+        foundRule = None
+        rankedRules = []
+        for thisRule in self.candidateRules(table, names):
+            for (variable, spec, predicate) in self.rules[table][thisRule]['predicates']:
+                retVal = predicate(names)
+                # print("variable '{!s}' with test '{!s}' returned '{!s}'".format(variable, spec, retVal))
+                if not retVal:
+                    break
+            else:
+                # We found a hit
+                if self.decisionTables[table]['hitPolicy'] in ['U', 'A', 'F']:
+                    foundRule = thisRule
+                    break
+                elif self.decisionTables[table]['hitPolicy'][0] in ['R', 'C']:
+                    rankedRules.append(thisRule)
+                elif self.decisionTables[table]['hitPolicy'][0] in ['P', 'O']:
+                    # Ranked by the priority of the output values, then by rule order
+                    ranks.append((self.rules[table][thisRule]['rank'], thisRule))
+        if profiling:
+            self.profileTable(table, started, ([foundRule] if foundRule is not None else []) + rankedRules + [thisRule for (rank, thisRule) in ranks])
+            started = time.perf_counter()
+        newData = {}
+        newData['Result'] = {}
+        annotations = []
+        for variable in (self.glossary if outputs is None else outputs):
+            item = self.glossary[variable]['item']
+            thisResult = sfeelUnwrap(names[item])
+            if isinstance(thisResult, str):
+                if (thisResult[0] == '"') and (thisResult[-1] == '"'):
+                    thisResult = thisResult[1:-1]
+            newData['Result'][variable] = thisResult
+        if self.decisionTables[table]['hitPolicy'] in ['U', 'A', 'F']:
+            if foundRule is None:
+                context.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
+                return None
+            else:
+                for (variable, spec, value) in self.rules[table][foundRule]['values']:
                     item = self.glossary[variable]['item']
-                    itemValue = self.sfeel('{}'.format(item))
-                    retVal = self.sfeel('{}'.format(test))
-                    # print("variable '{!s}' [data '{!s}'] with test '{!s}' returned '{!s}'".format(variable, itemValue, test, retVal))
-                    if not retVal:
-                        break
-                else:
-                    # We found a hit
-                    if self.decisionTables[table]['hitPolicy'] in ['U', 'A', 'F']:
-                        foundRule = thisRule
-                        break
-                    elif self.decisionTables[table]['hitPolicy'][0] in ['R', 'C']:
-                        rankedRules.append(thisRule)
-                    elif self.decisionTables[table]['hitPolicy'] in ['P', 'O']:
-                        # Rank the multiple outputs
-                        if ranks == []:
-                            theseRanks = []
-                            for (variable, result, rank) in self.rules[table][thisRule]['outputs']:
-                                theseRanks.append(rank)
-                            theseRanks.append(thisRule)
-                            ranks.append(theseRanks)
-                        else:
-                            before = None
-                            beforeFound = False
-                            for i in len(range(ranks)):
-                                for (variable, result, rank) in self.rules[table][thisRule]['outputs']:
-                                    if rank < ranks[i]:
-                                        before = i
-                                        break
-                                    elif rank > ranks[i]:
-                                        beforeFound = True
-                                        break
-                                if beforeFound:
-                                    break
-                            theseRanks = []
-                            for (variable, result, rank) in self.rules[table][thisRule]['outputs']:
-                                theseRanks.append(rank)
-                            theseRanks.append(thisRule)
-                            if not beforeFound:
-                                ranks.append(theseRanks)
-                            else:
-                                ranks.insert(i, theseRanks)
-            newData = {}
-            newData['Result'] = {}
-            annotations = []
-            for variable in self.glossary:
-                item = self.glossary[variable]['item']
-                thisResult = self.sfeel('{}'.format(item))
-                if isinstance(thisResult, str):
-                    if (thisResult[0] == '"') and (thisResult[-1] == '"'):
-                        thisResult = thisResult[1:-1]
-                newData['Result'][variable] = thisResult
-            if self.decisionTables[table]['hitPolicy'] in ['U', 'A', 'F']:
-                if foundRule is None:
-                    self.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
-                    status = {}
-                    status['errors'] = self.errors
-                    self.errors = []
-                    return (status, {})
-                else:
-                    for (variable, result, rank) in self.rules[table][foundRule]['outputs']:
+                    names[item] = value(names)
+                    thisResult = sfeelUnwrap(names[item])
+                    if isinstance(thisResult, str):
+                        if (thisResult[0] == '"') and (thisResult[-1] == '"'):
+                            thisResult = thisResult[1:-1]
+                    newData['Result'][variable] = thisResult
+                ruleId = (self.decisionTables[table]['name'], table, str(self.rules[table][foundRule]['ruleId']))
+                if 'annotation' in self.decisionTables[table]:
+                    for annotation in range(len(self.decisionTables[table]['annotation'])):
+                        name = self.decisionTables[table]['annotation'][annotation]
+                        text = self.rules[table][foundRule]['annotation'][annotation]
+                        annotations.append((name, text))
+            newData['Executed Rule'] = ruleId
+            if len(decisionAnnotations) > 0:
+                newData['DecisionAnnotations'] = decisionAnnotations
+            if len(annotations) > 0:
+                newData['RuleAnnotations'] = annotations
+        elif self.decisionTables[table]['hitPolicy'][0] in ['R', 'C']:
+            if len(rankedRules) == 0:
+                context.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
+                return None
+            else:
+                for rankedRule in rankedRules[1:]:
+                    foundRule = rankedRule
+                    first = True
+                    for (variable, spec, value) in self.rules[table][foundRule]['values']:
                         item = self.glossary[variable]['item']
-                        retVal = self.sfeel('{} <- {}'.format(item, result))
-                        thisResult = self.sfeel('{}'.format(item))
-                        if isinstance(thisResult, str):
-                            if (thisResult[0] == '"') and (thisResult[-1] == '"'):
-                                thisResult = thisResult[1:-1]
-                        newData['Result'][variable] = thisResult
+                        if variable not in newData['Result']:
+                            # Not a requested output, but collecting starts from its current value
+                            newData['Result'][variable] = sfeelUnwrap(names[item])
+                        if first:
+                            if not newData['Result'][variable]:
+                                if len(self.decisionTables[table]['hitPolicy']) == 1:
+                                    newData['Result'][variable] = []
+                                elif self.decisionTables[table]['hitPolicy'][1] in ['+', '#']:
+                                    newData['Result'][variable] = 0
+                                else:
+                                    newData['Result'][item] = None
+                            first = False
+                        names[item] = value(names)
+                        thisOutput = sfeelUnwrap(names[item])
+                        if isinstance(thisOutput, str):
+                            if (thisOutput[0] == '"') and (thisOutput[-1] == '"'):
+                                thisOutput = thisOutput[1:-1]
+                        if len(self.decisionTables[table]['hitPolicy']) == 1:
+                            newData['Result'][variable].append(thisOutput)
+                        elif self.decisionTables[table]['hitPolicy'][1] == '+':
+                            newData['Result'][variable] += thisOutput
+                        elif self.decisionTables[table]['hitPolicy'][1] == '<':
+                            if newData['Result'][variable] is None:
+                                newData['Result'][variable] = thisOutput
+                            elif thisOutput < newData['Result'][variable]:
+                                newData['Result'][variable] = thisOutput
+                        elif self.decisionTables[table]['hitPolicy'][1] == '>':
+                            if newData['Result'][variable] is None:
+                                newData['Result'][variable] = thisOutput
+                            elif thisOutput > newData['Result'][variable]:
+                                newData['Result'][variable] = thisOutput
+                        else:
+                            newData['Result'][variable] += 1
                     ruleId = (self.decisionTables[table]['name'], table, str(self.rules[table][foundRule]['ruleId']))
                     if 'annotation' in self.decisionTables[table]:
                         for annotation in range(len(self.decisionTables[table]['annotation'])):
                             name = self.decisionTables[table]['annotation'][annotation]
                             text = self.rules[table][foundRule]['annotation'][annotation]
                             annotations.append((name, text))
+                    newData['Executed Rule'] = ruleId
+                    if len(decisionAnnotations) > 0:
+                        newData['DecisionAnnotations'] = decisionAnnotations
+                    if len(annotations) > 0:
+                        newData['RuleAnnotations'] = annotations
+                    
+        elif self.decisionTables[table]['hitPolicy'][0] == 'P':
+            if len(ranks) == 0:
+                context.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
+                return None
+            else:
+                foundRule = min(ranks)[-1]
+                for (variable, spec, value) in self.rules[table][foundRule]['values']:
+                    item = self.glossary[variable]['item']
+                    names[item] = value(names)
+                    thisResult = sfeelUnwrap(names[item])
+                    if isinstance(thisResult, str):
+                        if (thisResult[0] == '"') and (thisResult[-1] == '"'):
+                            thisResult = thisResult[1:-1]
+                    newData['Result'][variable] = thisResult
+                ruleId = (self.decisionTables[table]['name'], table, str(self.rules[table][foundRule]['ruleId']))
+                if 'annotation' in self.decisionTables[table]:
+                    for annotation in range(len(self.decisionTables[table]['annotation'])):
+                        name = self.decisionTables[table]['annotation'][annotation]
+                        text = self.rules[table][foundRule]['annotation'][annotation]
+                        annotations.append((name, text))
                 newData['Executed Rule'] = ruleId
                 if len(decisionAnnotations) > 0:
                     newData['DecisionAnnotations'] = decisionAnnotations
                 if len(annotations) > 0:
                     newData['RuleAnnotations'] = annotations
-            elif self.decisionTables[table]['hitPolicy'][0] in ['R', 'C']:
-                if len(rankedRules) == 0:
-                    self.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
-                    status = {}
-                    status['errors'] = self.errors
-                    self.errors = []
-                    return (status, {})
-                else:
-                    for rankedRule in rankedRules[1:]:
-                        foundRule = rankedRule
-                        first = True
-                        for (variable, result, rank) in self.rules[table][foundRule]['outputs']:
-                            item = self.glossary[variable]['item']
-                            if first:
-                                if not newData['Result'][variable]:
-                                    if len(self.decisionTables[table]['hitPolicy']) == 1:
-                                        newData['Result'][variable] = []
-                                    elif self.decisionTables[table]['hitPolicy'][1] in ['+', '#']:
-                                        newData['Result'][variable] = 0
-                                    else:
-                                        newData['Result'][item] = None
-                                first = False
-                            retVal = self.sfeel('{} <- {}'.format(item, result))
-                            thisOutput = self.sfeel('{}'.format(item))
-                            if isinstance(thisOutput, str):
-                                if (thisOutput[0] == '"') and (thisOutput[-1] == '"'):
-                                    thisOutput = thisOutput[1:-1]
-                            if len(self.decisionTables[table]['hitPolicy']) == 1:
-                                newData['Result'][variable].append(thisOutput)
-                            elif self.decisionTables[table]['hitPolicy'][1] == '+':
-                                newData['Result'][variable] += thisOutput
-                            elif self.decisionTables[table]['hitPolicy'][1] == '<':
-                                if newData['Result'][variable] is None:
-                                    newData['Result'][variable] = thisOutput
-                                elif thisOutput < newData['Result'][variable]:
-                                    newData['Result'][variable] = thisOutput
-                            elif self.decisionTables[table]['hitPolicy'][1] == '>':
-                                if newData['Result'][variable] is None:
-                                    newData['Result'][variable] = thisOutput
-                                elif thisOutput > newData['Result'][variable]:
-                                    newData['Result'][variable] = thisOutput
-                            else:
-                                newData['Result'][variable] += 1
-                        ruleId = (self.decisionTables[table]['name'], table, str(self.rules[table][foundRule]['ruleId']))
-                        if 'annotation' in self.decisionTables[table]:
-                            for annotation in range(len(self.decisionTables[table]['annotation'])):
-                                name = self.decisionTables[table]['annotation'][annotation]
-                                text = self.rules[table][foundRule]['annotation'][annotation]
-                                annotations.append((name, text))
-                        newData['Executed Rule'] = ruleId
-                        if len(decisionAnnotations) > 0:
-                            newData['DecisionAnnotations'] = decisionAnnotations
-                        if len(annotations) > 0:
-                            newData['RuleAnnotations'] = annotations
-                        
-            elif self.decisionTables[table]['hitPolicy'][0] == 'P':
-                if len(ranks) == 0:
-                    self.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
-                    status = {}
-                    status['errors'] = self.errors
-                    self.errors = []
-                    return (status, {})
-                else:
-                    foundRule = ranks[0][-1]
-                    for (variable, result, rank) in self.rules[table][foundRule]['outputs']:
+        elif self.decisionTables[table]['hitPolicy'][0] == 'O':
+            if len(ranks) == 0:
+                context.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
+                return None
+            else:
+                ranks.sort()
+                ruleIds = []
+                haveAnnotations = False
+                outputLists = set()
+                for i in range(len(ranks)):
+                    annotations.append([])
+                    foundRule = ranks[i][-1]
+                    for (variable, spec, value) in self.rules[table][foundRule]['values']:
                         item = self.glossary[variable]['item']
-                        retVal = self.sfeel('{} <- {}'.format(item, result))
-                        thisResult = self.sfeel('{}'.format(item))
+                        if variable not in outputLists:
+                            newData['Result'][variable] = []
+                            outputLists.add(variable)
+                        names[item] = value(names)
+                        thisResult = sfeelUnwrap(names[item])
                         if isinstance(thisResult, str):
                             if (thisResult[0] == '"') and (thisResult[-1] == '"'):
                                 thisResult = thisResult[1:-1]
-                        newData['Result'][variable] = thisResult
-                    ruleId = (self.decisionTables[table]['name'], table, str(self.rules[table][foundRule]['ruleId']))
+                        newData['Result'][variable].append(thisResult)
+                    ruleIds.append((self.decisionTables[table]['name'], table, str(self.rules[table][foundRule]['ruleId'])))
                     if 'annotation' in self.decisionTables[table]:
                         for annotation in range(len(self.decisionTables[table]['annotation'])):
                             name = self.decisionTables[table]['annotation'][annotation]
                             text = self.rules[table][foundRule]['annotation'][annotation]
-                            annotations.append((name, text))
-                    newData['Executed Rule'] = ruleId
-                    if len(decisionAnnotations) > 0:
-                        newData['DecisionAnnotations'] = decisionAnnotations
-                    if len(annotations) > 0:
-                        newData['RuleAnnotations'] = annotations
-            elif self.decisionTables[table]['hitPolicy'][0] == 'O':
-                if len(ranks) == 0:
-                    self.errors.append("No rules matched the input data for decision table '{!s}'".format(table))
-                    status = {}
-                    status['errors'] = self.errors
-                    self.errors = []
-                    return (status, {})
-                else:
-                    ruleIds = []
-                    haveAnnotations = False
-                    for i in range(len(ranks)):
-                        annotations.append([])
-                        foundRule = ranks[i][-1]
-                        for (variable, result, rank) in self.rules[table][foundRule]['outputs']:
-                            item = self.glossary[variable]['item']
-                            if item not in newData['Result']:
-                                newData['Result'][variable] = []
-                            retVal = self.sfeel('{} <- {}'.format(item, result))
-                            thisResult = self.sfeel('{}'.format(item))
-                            if isinstance(thisResult, str):
-                                if (thisResult[0] == '"') and (thisResult[-1] == '"'):
-                                    thisResult = thisResult[1:-1]
-                            newData['Result'][variable].append(thisResult)
-                        ruleIds.append(self.decisionTables[table]['name'], table + ':' + str(self.rules[table][foundRule]['ruleId']))
-                        if 'annotation' in self.decisionTables[table]:
-                            for annotation in range(len(self.decisionTables[table]['annotation'])):
-                                name = self.decisionTables[table]['annotation'][annotation]
-                                text = self.rules[table][foundRule]['annotation'][annotation]
-                                annotations[i].append((name, text))
-                                haveAnnotations = True
-                    newData['Executed Rule'] = ruleIds
-                    if len(decisionAnnotations) > 0:
-                        newData['DecisionAnnotations'] = decisionAnnotations
-                    if haveAnnotations:
-                        newData['RuleAnnotations'] = annotations
+                            annotations[i].append((name, text))
+                            haveAnnotations = True
+                newData['Executed Rule'] = ruleIds
+                if len(decisionAnnotations) > 0:
+                    newData['DecisionAnnotations'] = decisionAnnotations
+                if haveAnnotations:
+                    newData['RuleAnnotations'] = annotations
 
-            allResults.append(newData)
-
-        status = {}
-        if len(self.errors) > 0:
-            status['errors'] = self.errors
-            self.errors = []
-        if len(allResults) == 1:
-            return (status, newData)
-        else:
-            return (status, allResults)
+        if outputs is not None:
+            newData['Result'] = {variable: newData['Result'][variable] for variable in outputs}
+        if profiling:
+            self.tableProfile(table)['time'] += time.perf_counter() - started
+        return newData
 
 
     def test(self):
@@ -1759,6 +3512,11 @@ class DMN():
             return (status, {})
 
         # Read in the Test worksheet
+        if self.wb is None:
+            self.errors.append('No workbook - the rulesBook was loaded from a compiled rulesBook')
+            status = {}
+            status['errors'] = self.errors
+            return status
         try:
             ws = self.wb['Test']
         except (KeyError):
@@ -1768,7 +3526,7 @@ class DMN():
             return status
 
         # Now search for the unit test data
-        self.mergedCells = ws.merged_cells.ranges
+        self.mapMergedCells(ws)
         tests = {}
         testData = {}
         parsedRanges = []
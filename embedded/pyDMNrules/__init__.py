@@ -0,0 +1,3 @@
+from .DMNrules import DMN
+from .cache import RulesBookCache, rulesBookCache
+
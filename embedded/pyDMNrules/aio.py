@@ -0,0 +1,79 @@
+# -----------------------------------------------------------------------------
+# aio.py
+# -----------------------------------------------------------------------------
+
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .DMNrules import dataRecords
+from .cache import rulesBookCache
+from .parallel import chunks
+
+# The number of threads that load rulesBooks and make decisions for asyncio code
+decisionWorkers = int(os.environ.get('PYDMNRULES_ASYNC_WORKERS', str(min(4, os.cpu_count() or 1))))
+decisionExecutor = None
+executorLock = threading.Lock()
+
+
+def executor():
+    '''
+    The bounded thread pool shared by every asyncio decision in this process, started on first use
+    '''
+    global decisionExecutor
+    with executorLock:
+        if decisionExecutor is None:
+            decisionExecutor = ThreadPoolExecutor(max_workers=max(decisionWorkers, 1), thread_name_prefix='pyDMNrules')
+    return decisionExecutor
+
+
+async def run(function, *args):
+    '''
+    Run a blocking function in the decision thread pool, without blocking the event loop
+    '''
+    return await asyncio.get_running_loop().run_in_executor(executor(), functools.partial(function, *args))
+
+
+async def loadAsync(rulesBook, cache=None):
+    """
+    Load a rulesBook through a RulesBookCache (default - rulesBookCache), without blocking the event loop
+
+    Returns:
+        tuple: (status, dmnRules) - see RulesBookCache.load()
+
+    """
+    return await run((rulesBookCache if cache is None else cache).load, rulesBook)
+
+
+async def gatherLimited(awaitables, limit=100, return_exceptions=False):
+    """
+    asyncio.gather() the awaitables, with no more than limit of them running at a time
+
+    Coroutines are only started when there is room, so hundreds of decision requests can be gathered
+    without opening hundreds of connections, or queueing hundreds of decisions, at once.
+
+    Returns:
+        list: the results of the awaitables, in order
+
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+    async def limited(awaitable):
+        async with semaphore:
+            return await awaitable
+    return await asyncio.gather(*[limited(awaitable) for awaitable in awaitables], return_exceptions=return_exceptions)
+
+
+async def decideAsync(dmnRules, data, outputs=None):
+    '''
+    See DMN.decideAsync()
+    '''
+    return await run(dmnRules.decide, data, outputs)
+
+
+async def decideManyAsync(dmnRules, records, outputs=None, chunkSize=100):
+    '''
+    See DMN.decideManyAsync()
+    '''
+    results = await gatherLimited([run(dmnRules.decideMany, chunk, outputs) for chunk in chunks(dataRecords(records), max(chunkSize, 1))], max(decisionWorkers, 1))
+    return [result for chunk in results for result in chunk]
@@ -0,0 +1,116 @@
+# -----------------------------------------------------------------------------
+# cache.py
+# -----------------------------------------------------------------------------
+
+import os
+import threading
+import collections
+from .DMNrules import DMN
+
+
+class RulesBookCache():
+    '''
+    A process wide, thread safe cache of loaded rulesBooks
+
+    Loaded DMN instances are keyed by the absolute path of the rulesBook.
+    A cached DMN is reloaded if the modification time or the size of the rulesBook changes.
+    The least recently used DMN is discarded when the cache holds more than maxSize rulesBooks.
+    If resultsSize is not 0, each loaded DMN memoises up to resultsSize decide() results (see DMN.cacheResults()).
+    '''
+
+    def __init__(self, maxSize=16, resultsSize=0):
+        self.maxSize = maxSize
+        self.resultsSize = resultsSize
+        self.lock = threading.Lock()
+        self.rulesBooks = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def load(self, rulesBook):
+        """
+        Load a rulesBook, or return the already loaded DMN for this rulesBook
+
+        Args:
+            param1 (str): The name of the Excel workbook, or of a DMN XML file ending in '.dmn' or '.xml' (including path if it is not in the current working directory
+
+        Returns:
+            tuple: (status, dmnRules)
+
+            'status' is the status returned by DMN.load() or DMN.loadXML() - rulesBooks with errors are not cached.
+            'dmnRules' is the loaded DMN instance.
+
+        """
+
+        path = os.path.abspath(rulesBook)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            status = {}
+            status['errors'] = ["No readable workbook named '{!s}'!".format(rulesBook)]
+            return (status, None)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if path in self.rulesBooks:
+                (thisVersion, dmnRules) = self.rulesBooks[path]
+                if thisVersion == version:
+                    self.rulesBooks.move_to_end(path)
+                    self.hits += 1
+                    return ({}, dmnRules)
+                del self.rulesBooks[path]
+            self.misses += 1
+
+        # Load outside the lock, so that other rulesBooks remain available while this one loads
+        dmnRules = DMN()
+        if os.path.splitext(path)[1].lower() in ['.dmn', '.xml']:
+            status = dmnRules.loadXML(path)
+        else:
+            status = dmnRules.load(path)
+        if 'errors' in status:
+            return (status, dmnRules)
+        if self.resultsSize > 0:
+            dmnRules.cacheResults(self.resultsSize)
+        with self.lock:
+            self.rulesBooks[path] = (version, dmnRules)
+            self.rulesBooks.move_to_end(path)
+            self.evict()
+        return (status, dmnRules)
+
+
+    def evict(self):
+        '''
+        Discard the least recently used rulesBooks (the cache lock must be held)
+        '''
+        while len(self.rulesBooks) > max(self.maxSize, 0):
+            self.rulesBooks.popitem(last=False)
+
+
+    def resize(self, maxSize):
+        '''
+        Change the maximum number of cached rulesBooks
+        '''
+        with self.lock:
+            self.maxSize = maxSize
+            self.evict()
+
+
+    def clear(self):
+        '''
+        Discard all the cached rulesBooks
+        '''
+        with self.lock:
+            self.rulesBooks.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+    def stats(self):
+        '''
+        Return the cache size and the hit/miss counters
+        '''
+        with self.lock:
+            return {'size': len(self.rulesBooks), 'maxSize': self.maxSize, 'hits': self.hits, 'misses': self.misses}
+
+
+# The cache shared by everything in this process
+rulesBookCache = RulesBookCache(int(os.environ.get('PYDMNRULES_CACHE_SIZE', '16')), int(os.environ.get('PYDMNRULES_RESULT_CACHE_SIZE', '0')))
@@ -0,0 +1,240 @@
+# -----------------------------------------------------------------------------
+# cli.py
+# -----------------------------------------------------------------------------
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+import collections
+from .DMNrules import DMN
+from .parallel import chunks
+
+numberPattern = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+
+
+def loadRulesBook(rulesBook):
+    '''
+    Load a workbook, a DMN XML file or a compiled rulesBook, by its file extension
+    '''
+    dmnRules = DMN()
+    extension = os.path.splitext(rulesBook)[1].lower()
+    if extension in ['.dmn', '.xml']:
+        status = dmnRules.loadXML(rulesBook)
+    elif extension == '.dmnc':
+        status = dmnRules.loadCompiled(rulesBook)
+    else:
+        status = dmnRules.load(rulesBook)
+    return (status, dmnRules)
+
+
+def csvValue(text):
+    '''
+    A CSV field as a decide() value - empty fields are None, numbers are numbers, true and false are booleans
+    '''
+    if text is None:
+        return None
+    text = text.strip()
+    if text == '':
+        return None
+    if numberPattern.fullmatch(text) is not None:
+        return float(text)
+    if text in ['true', 'false']:
+        return text == 'true'
+    return text
+
+
+class InvalidRecord():
+    '''
+    A record that could not be read, and why
+    '''
+
+    def __init__(self, error):
+        self.error = error
+
+
+def readRecords(fp, inputFormat):
+    '''
+    Read data dictionaries, one at a time, from JSON lines or CSV with a header row
+    Lines that are not JSON objects are read as an InvalidRecord
+    '''
+    if inputFormat == 'csv':
+        for row in csv.DictReader(fp):
+            yield {variable:csvValue(row[variable]) for variable in row if variable is not None}
+    else:
+        for (lineNumber, line) in enumerate(fp, 1):
+            if line.strip() == '':
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield InvalidRecord('Line {!s}: not valid JSON - {!s}'.format(lineNumber, e))
+                continue
+            if not isinstance(record, dict):
+                yield InvalidRecord('Line {!s}: not a JSON object'.format(lineNumber))
+                continue
+            yield record
+
+
+def onlyGlossary(dmnRules, records):
+    '''
+    Drop the fields of each record that are not Glossary Variables
+    '''
+    for record in records:
+        if isinstance(record, InvalidRecord):
+            yield record
+        else:
+            yield {variable:record[variable] for variable in record if variable in dmnRules.glossary}
+
+
+def decideRecords(dmnRules, records, outputs, workers, chunkSize):
+    '''
+    Decide each record, in order - an InvalidRecord is returned as its error, without stopping the stream
+    '''
+    pending = collections.deque()
+    def validRecords():
+        for record in records:
+            pending.append(record)
+            if not isinstance(record, InvalidRecord):
+                yield record
+    if workers > 1:
+        results = dmnRules.decideParallel(validRecords(), outputs, workers, chunkSize)
+    else:
+        results = (result for chunk in chunks(validRecords(), max(chunkSize, 1)) for result in dmnRules.decideMany(chunk, outputs))
+    for result in results:
+        # Every record up to this one has been read, so the invalid records before it are pending
+        while isinstance(pending[0], InvalidRecord):
+            yield ({'errors': [pending.popleft().error]}, {})
+        pending.popleft()
+        yield result
+    while len(pending) > 0:
+        yield ({'errors': [pending.popleft().error]}, {})
+
+
+def finalResult(newData):
+    '''
+    The 'Result' of the last DMN rules table that was run, and the rules that were executed, from the newData of decide()
+    '''
+    if isinstance(newData, list):
+        decisions = newData
+    elif len(newData) > 0:
+        decisions = [newData]
+    else:
+        decisions = []
+    if len(decisions) == 0:
+        return ({}, [])
+    executed = []
+    for decision in decisions:
+        if isinstance(decision.get('Executed Rule'), list):
+            executed += decision['Executed Rule']
+        elif 'Executed Rule' in decision:
+            executed.append(decision['Executed Rule'])
+    return (decisions[-1]['Result'], executed)
+
+
+class JSONWriter():
+
+    def __init__(self, fp):
+        self.fp = fp
+
+    def write(self, status, newData):
+        (result, executed) = finalResult(newData)
+        line = {'Result':result, 'Executed Rule':executed}
+        if 'errors' in status:
+            line['errors'] = status['errors']
+        self.fp.write(json.dumps(line, default=str) + '\n')
+
+
+class CSVWriter():
+
+    def __init__(self, fp, variables):
+        self.variables = variables
+        self.writer = csv.writer(fp)
+        self.writer.writerow(variables + ['errors'])
+
+    def write(self, status, newData):
+        (result, executed) = finalResult(newData)
+        row = []
+        for variable in self.variables:
+            value = result.get(variable)
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, default=str)
+            row.append('' if value is None else value)
+        row.append('; '.join(status.get('errors', [])))
+        self.writer.writerow(row)
+
+
+def main(argv=None):
+    '''
+    Run a rulesBook over a file of records - see python -m pyDMNrules --help
+    '''
+    parser = argparse.ArgumentParser(prog='python -m pyDMNrules',
+        description='Load a rulesBook once and stream records (JSON lines or CSV) through DMN.decide(), writing one result per record')
+    parser.add_argument('rulesBook', help="the Excel workbook, DMN XML file ('.dmn', '.xml') or compiled rulesBook ('.dmnc')")
+    parser.add_argument('input', nargs='?', default='-', help='the records (default - stdin)')
+    parser.add_argument('-o', '--output', default='-', help='where to write the results (default - stdout)')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], help="the format of the records (default - 'csv' for '.csv' files, otherwise 'jsonl')")
+    parser.add_argument('-F', '--output-format', choices=['jsonl', 'csv'], help='the format of the results (default - the format of the records)')
+    parser.add_argument('--outputs', help="a comma separated list of the Variables to return (default - every Variable in the Glossary)")
+    parser.add_argument('-w', '--workers', type=int, default=1, help='the number of worker processes (default 1 - decide in this process)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='the number of records decided at a time (default 1000)')
+    parser.add_argument('--ignore-unknown', action='store_true', help='drop the fields of each record that are not Glossary Variables')
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't write the throughput summary to stderr")
+    args = parser.parse_args(argv)
+
+    (status, dmnRules) = loadRulesBook(args.rulesBook)
+    if 'errors' in status:
+        for error in status['errors']:
+            print(error, file=sys.stderr)
+        return 1
+    outputs = None
+    if args.outputs is not None:
+        outputs = [variable.strip() for variable in args.outputs.split(',')]
+        errors = dmnRules.outputErrors(outputs)
+        if len(errors) > 0:
+            for error in errors:
+                print(error, file=sys.stderr)
+            return 1
+    inputFormat = args.format
+    if inputFormat is None:
+        inputFormat = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+    outputFormat = args.output_format or inputFormat
+
+    started = time.perf_counter()
+    count = failed = 0
+    inputFile = outputFile = None
+    try:
+        inputFile = sys.stdin if args.input == '-' else open(args.input, newline='')
+        outputFile = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    except OSError as e:
+        if (inputFile is not None) and (inputFile is not sys.stdin):
+            inputFile.close()
+        print(e, file=sys.stderr)
+        return 1
+    try:
+        if outputFormat == 'csv':
+            writer = CSVWriter(outputFile, outputs if outputs is not None else list(dmnRules.glossary))
+        else:
+            writer = JSONWriter(outputFile)
+        records = readRecords(inputFile, inputFormat)
+        if args.ignore_unknown:
+            records = onlyGlossary(dmnRules, records)
+        for (status, newData) in decideRecords(dmnRules, records, outputs, args.workers, args.chunk_size):
+            writer.write(status, newData)
+            count += 1
+            if 'errors' in status:
+                failed += 1
+    finally:
+        if inputFile is not sys.stdin:
+            inputFile.close()
+        if outputFile is not sys.stdout:
+            outputFile.close()
+        else:
+            outputFile.flush()
+    elapsed = time.perf_counter() - started
+    if not args.quiet:
+        print('{!s} records ({!s} with errors) in {:.2f}s - {:.0f} records/s'.format(count, failed, elapsed, count / elapsed if elapsed > 0 else 0.0), file=sys.stderr)
+    return 0
@@ -0,0 +1,536 @@
+# -----------------------------------------------------------------------------
+# codegen.py
+# -----------------------------------------------------------------------------
+
+import math
+import inspect
+import datetime
+import importlib.util
+from .DMNrules import sfeelUnwrap, sfeelCompare, sfeelInRange, sfeelIn, readback, nativeValue
+
+# Tables with more rules than this are matched through a dictionary of their most selective equality test
+dispatchRules = 16
+
+moduleHeader = """# -----------------------------------------------------------------------------
+# Generated by pyDMNrules - DMN.generatePython()
+# Decide with decide(data, outputs=None), which returns the (status, newData) that DMN.decide() returns.
+# This module only needs the Python standard library - regenerate it when the rulesBook changes.
+# -----------------------------------------------------------------------------
+
+import datetime
+"""
+
+moduleHelpers = '''
+def results(names, outputs):
+    """
+    The 'Result' of a DMN rules table, before its rules are run
+    """
+    return {variable: readback(names[GLOSSARY[variable]]) for variable in (GLOSSARY if outputs is None else outputs)}
+'''
+
+decideSource = '''
+def decide(data, outputs=None):
+    """
+    Make a decision about data - see DMN.decide()
+    """
+    errors = []
+    if outputs is not None:
+        for variable in outputs:
+            if variable not in GLOSSARY:
+                errors.append('output variable ({!s}) not in Glossary'.format(variable))
+    if len(errors) > 0:
+        return ({'errors': errors}, {})
+    names = dict.fromkeys(ITEMS)
+    for variable in data:
+        if variable not in GLOSSARY:
+            return ({'errors': ['variable ({!s}) not in Glossary'.format(variable)]}, {})
+        (isNative, value) = nativeValue(data[variable], GLOSSARY)
+        if not isNative:
+            return ({'errors': ["Invalid Data '{!r}' - only the S-FEEL parser can bind this value".format(data[variable])]}, {})
+        names[GLOSSARY[variable]] = value
+
+    # Run each DMN rules table in the order of the Decision table
+    allResults = []
+    newData = {}
+'''
+
+decideReturn = '''
+    status = {}
+    if len(errors) > 0:
+        status['errors'] = errors
+    if len(allResults) == 1:
+        return (status, newData)
+    return (status, allResults)
+'''
+
+
+class Generator():
+    '''
+    Write the compiled rules of a loaded DMN as a standalone Python module
+    '''
+
+    def __init__(self, dmnRules):
+        self.dmnRules = dmnRules
+        self.errors = []
+        self.lines = []
+
+
+    def literal(self, value):
+        '''
+        Python source for a value - None (with an error) if the value can't be written as Python
+        '''
+        if (value is None) or isinstance(value, (bool, int, str)):
+            return repr(value)
+        elif isinstance(value, float):
+            if math.isfinite(value):
+                return repr(value)
+            return "float('{!r}')".format(value)
+        elif isinstance(value, list):
+            values = [self.literal(thisValue) for thisValue in value]
+            if None in values:
+                return None
+            return '[' + ', '.join(values) + ']'
+        elif isinstance(value, tuple):
+            values = [self.literal(thisValue) for thisValue in value]
+            if None in values:
+                return None
+            if len(values) == 1:
+                return '(' + values[0] + ',)'
+            return '(' + ', '.join(values) + ')'
+        elif isinstance(value, dict):
+            values = [(self.literal(key), self.literal(value[key])) for key in value]
+            if any([(key is None) or (thisValue is None) for (key, thisValue) in values]):
+                return None
+            return '{' + ', '.join(['{!s}: {!s}'.format(key, thisValue) for (key, thisValue) in values]) + '}'
+        elif isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+            try:
+                if eval(repr(value), {'datetime': datetime}) == value:
+                    return repr(value)
+            except Exception:
+                pass
+        self.errors.append("Value '{!r}' can't be written as Python".format(value))
+        return None
+
+
+    def operand(self, operand):
+        '''
+        Python source for a compiled operand ('value', value) or ('item', item)
+        '''
+        (kind, value) = operand
+        if kind == 'item':
+            return 'names.get({!r})'.format(value)
+        return self.literal(value)
+
+
+    def condition(self, spec, local, table):
+        '''
+        Python source for a compiled test - local(item, unwrapped) names the local variable holding an item's value
+        The inline comparisons are the checks that sfeelCompare(), sfeelInRange() and sfeelIn() make for literal values
+        '''
+        kind = spec[0]
+        if kind == 'compare':
+            (kind, op, item, operand) = spec
+            source = self.operand(operand)
+            if source is None:
+                return None
+            if operand[0] == 'value':
+                value = operand[1]
+                if (op in ['=', '!=']) and not isinstance(value, list):
+                    return '{!s} {!s} {!s}'.format(local(item, True), '==' if op == '=' else '!=', source)
+                if (op in ['<', '<=', '>', '>=']) and isinstance(value, (float, str)) and not isinstance(value, bool):
+                    types = '(int, float)' if isinstance(value, float) else 'str'
+                    return 'isinstance({0!s}, {1!s}) and ({0!s} {2!s} {3!s})'.format(local(item, True), types, op, source)
+            return 'sfeelCompare({!r}, {!s}, {!s})'.format(op, local(item, False), source)
+        elif kind == 'range':
+            (kind, item, openBracket, lowOperand, highOperand, closeBracket) = spec
+            low = self.operand(lowOperand)
+            high = self.operand(highOperand)
+            if (low is None) or (high is None):
+                return None
+            if (lowOperand[0] == 'value') and (highOperand[0] == 'value'):
+                for types in [float, str]:
+                    if (type(lowOperand[1]) is types) and (type(highOperand[1]) is types):
+                        value = local(item, False)
+                        source = 'isinstance({0!s}, {1!s}) and not (({0!s} < {2!s}) or ({0!s} > {3!s}))'.format(value, types.__name__, low, high)
+                        if openBracket != '[':
+                            source += ' and ({!s} != {!s})'.format(value, low)
+                        if closeBracket != ']':
+                            source += ' and ({!s} != {!s})'.format(value, high)
+                        return source
+            return 'sfeelInRange({!s}, {!r}, {!s}, {!s}, {!r})'.format(local(item, False), openBracket, low, high, closeBracket)
+        elif kind == 'in':
+            (kind, item, comparisons) = spec
+            sources = [(op, self.operand(operand)) for (op, operand) in comparisons]
+            if any([source is None for (op, source) in sources]):
+                return None
+            if all([(op == '=') and (operand[0] == 'value') for (op, operand) in comparisons]):
+                return '{!s} in {!s}'.format(local(item, False), self.literal(tuple([operand[1] for (op, operand) in comparisons])))
+            return 'sfeelIn({!s}, [{!s}])'.format(local(item, False), ', '.join(['({!r}, {!s})'.format(op, source) for (op, source) in sources]))
+        self.errors.append("Test '{!s}' in table '{!s}' needs the S-FEEL parser, so it can't be generated".format(spec[1], table))
+        return None
+
+
+    def conditions(self, tests, table):
+        '''
+        The lines that read the tested items into local variables, and the Python source of each list of compiled tests
+        '''
+        locals = {}
+        def local(item, unwrapped):
+            if item not in locals:
+                locals[item] = [len(locals), False]
+            if unwrapped:
+                locals[item][1] = True
+                return 'u{!s}'.format(locals[item][0])
+            return 'x{!s}'.format(locals[item][0])
+        sources = []
+        for specs in tests:
+            source = [self.condition(spec, local, table) for spec in specs]
+            if None in source:
+                source = ['False']
+            sources.append(' and '.join(['({!s})'.format(thisSource) for thisSource in source]) if len(source) > 0 else 'True')
+        reads = []
+        for item in locals:
+            (number, unwrapped) = locals[item]
+            reads.append('    x{!s} = names.get({!r})'.format(number, item))
+            if unwrapped:
+                reads.append('    u{0!s} = sfeelUnwrap(x{0!s})'.format(number))
+        return (reads, sources)
+
+
+    def matcher(self, name, table, tests, singleHit):
+        '''
+        A function that returns the first match (single hit policies), or the list of matches, of tests - a list of (number, compiled tests)
+        '''
+        (reads, sources) = self.conditions([specs for (number, specs) in tests], table)
+        self.lines.append('def {!s}(names):'.format(name))
+        self.lines += reads
+        if not singleHit:
+            self.lines.append('    hits = []')
+        for ((number, specs), source) in zip(tests, sources):
+            if singleHit:
+                if source == 'True':
+                    self.lines.append('    return {!s}'.format(number))
+                    break
+                self.lines.append('    if {!s}:'.format(source))
+                self.lines.append('        return {!s}'.format(number))
+            elif source == 'True':
+                self.lines.append('    hits.append({!s})'.format(number))
+            else:
+                self.lines.append('    if {!s}:'.format(source))
+                self.lines.append('        hits.append({!s})'.format(number))
+        else:
+            self.lines.append('    return {!s}'.format('None' if singleHit else 'hits'))
+        self.lines += ['', '']
+
+
+    def ruleTests(self, table, ruleNumbers):
+        rules = self.dmnRules.rules[table]
+        return [(thisRule, [spec for (variable, spec, predicate) in rules[thisRule]['predicates']]) for thisRule in ruleNumbers]
+
+
+    def matchers(self, number, table, singleHit):
+        '''
+        The matching functions of a table - returns the Python source that finds the matching rules
+        Crosstab tables find their first matching row and column. Large tables are split by their most selective equality test,
+        into a dictionary of functions that only test the rules that can match.
+        '''
+        count = len(self.dmnRules.rules[table])
+        if 'crosstab' in self.dmnRules.decisionTables[table]:
+            crosstab = self.dmnRules.decisionTables[table]['crosstab']
+            for axis in ['rows', 'columns']:
+                entries = crosstab[axis]['entries']
+                self.matcher('{!s}{!s}'.format(axis, number), table,
+                             [(thisEntry, [spec for (variable, spec, predicate) in entries[thisEntry]['predicates']]) for thisEntry in range(len(entries))], True)
+            noMatch = 'None' if singleHit else '[]'
+            self.lines.append('def crosstab{!s}(names):'.format(number))
+            self.lines.append('    row = rows{!s}(names)'.format(number))
+            self.lines.append('    if row is None:')
+            self.lines.append('        return {!s}'.format(noMatch))
+            self.lines.append('    column = columns{!s}(names)'.format(number))
+            self.lines.append('    if column is None:')
+            self.lines.append('        return {!s}'.format(noMatch))
+            hit = 'row * {!s} + column'.format(len(crosstab['columns']['entries']))
+            self.lines.append('    return {!s}'.format(hit if singleHit else '[' + hit + ']'))
+            self.lines += ['', '']
+            return 'crosstab{!s}(names)'.format(number)
+        ruleIndex = self.dmnRules.decisionTables[table].get('ruleIndex', [])
+        self.matcher('match{!s}'.format(number), table, self.ruleTests(table, range(count)), singleHit)
+        if (count <= dispatchRules) or (len(ruleIndex) == 0):
+            return 'match{!s}(names)'.format(number)
+        # The index with the smallest largest list of rules to test
+        (item, index, wildcard) = min(ruleIndex, key=lambda entry: max([len(entry[2][0])] + [len(rules) for (rules, ruleSet) in entry[1].values()]))
+        keys = []
+        for (key, thisKey) in zip(index, range(len(index))):
+            source = self.literal(key)
+            if source is None:
+                return 'match{!s}(names)'.format(number)
+            self.matcher('match{!s}_{!s}'.format(number, thisKey), table, self.ruleTests(table, index[key][0]), singleHit)
+            keys.append('    {!s}: match{!s}_{!s},'.format(source, number, thisKey))
+        self.matcher('match{!s}_wildcard'.format(number), table, self.ruleTests(table, wildcard[0]), singleHit)
+        self.lines.append('MATCH{!s} = {{'.format(number))
+        self.lines += keys
+        self.lines += ['}', '', '']
+        self.lines.append('def dispatch{!s}(names):'.format(number))
+        self.lines.append('    try:')
+        self.lines.append('        return MATCH{!s}.get(sfeelUnwrap(names.get({!r})), match{!s}_wildcard)(names)'.format(number, item, number))
+        self.lines.append('    except TypeError:')
+        self.lines.append('        # Unhashable values can\'t be looked up')
+        self.lines.append('        return match{!s}(names)'.format(number))
+        self.lines += ['', '']
+        return 'dispatch{!s}(names)'.format(number)
+
+
+    def appliers(self, number, table):
+        '''
+        A function for each rule, that sets its outputs and adds them to the 'Result' - as its hit policy aggregates them
+        '''
+        dmnRules = self.dmnRules
+        hitPolicy = dmnRules.decisionTables[table]['hitPolicy']
+        for thisRule in range(len(dmnRules.rules[table])):
+            if hitPolicy[0] == 'O':
+                self.lines.append('def apply{!s}_{!s}(names, result, outputLists):'.format(number, thisRule))
+            else:
+                self.lines.append('def apply{!s}_{!s}(names, result):'.format(number, thisRule))
+            first = True
+            for (variable, spec, value) in dmnRules.rules[table][thisRule]['values']:
+                item = dmnRules.glossary[variable]['item']
+                if spec[0] == 'sfeel':
+                    self.errors.append("Output '{!s}' in table '{!s}' needs the S-FEEL parser, so it can't be generated".format(spec[1], table))
+                    source = None
+                else:
+                    source = self.operand(spec)
+                if source is None:
+                    source = 'None'
+                if hitPolicy[0] in ['C', 'R']:
+                    self.lines.append('    if {!r} not in result:'.format(variable))
+                    self.lines.append('        result[{!r}] = sfeelUnwrap(names[{!r}])'.format(variable, item))
+                    if first:
+                        self.lines.append('    if not result[{!r}]:'.format(variable))
+                        if len(hitPolicy) == 1:
+                            self.lines.append('        result[{!r}] = []'.format(variable))
+                        elif hitPolicy[1] in ['+', '#']:
+                            self.lines.append('        result[{!r}] = 0'.format(variable))
+                        else:
+                            self.lines.append('        result[{!r}] = None'.format(item))
+                        first = False
+                    self.lines.append('    names[{!r}] = {!s}'.format(item, source))
+                    self.lines.append('    value = readback(names[{!r}])'.format(item))
+                    if len(hitPolicy) == 1:
+                        self.lines.append('    result[{!r}].append(value)'.format(variable))
+                    elif hitPolicy[1] == '+':
+                        self.lines.append('    result[{!r}] += value'.format(variable))
+                    elif hitPolicy[1] in ['<', '>']:
+                        self.lines.append('    if (result[{0!r}] is None) or (value {1!s} result[{0!r}]):'.format(variable, hitPolicy[1]))
+                        self.lines.append('        result[{!r}] = value'.format(variable))
+                    else:
+                        self.lines.append('    result[{!r}] += 1'.format(variable))
+                elif hitPolicy[0] == 'O':
+                    self.lines.append('    if {!r} not in outputLists:'.format(variable))
+                    self.lines.append('        result[{!r}] = []'.format(variable))
+                    self.lines.append('        outputLists.add({!r})'.format(variable))
+                    self.lines.append('    names[{!r}] = {!s}'.format(item, source))
+                    self.lines.append('    result[{!r}].append(readback(names[{!r}]))'.format(variable, item))
+                else:
+                    self.lines.append('    names[{!r}] = {!s}'.format(item, source))
+                    self.lines.append('    result[{!r}] = readback(names[{!r}])'.format(variable, item))
+            if len(dmnRules.rules[table][thisRule]['values']) == 0:
+                self.lines.append('    return')
+            self.lines += ['', '']
+        self.lines.append('APPLY{!s} = [{!s}]'.format(number, ', '.join(['apply{!s}_{!s}'.format(number, thisRule) for thisRule in range(len(dmnRules.rules[table]))])))
+
+
+    def constants(self, number, table, decisionAnnotations):
+        '''
+        The 'Executed Rule', rule annotations and priorities of every rule, and the annotations from the Decision table
+        '''
+        dmnRules = self.dmnRules
+        name = dmnRules.decisionTables[table]['name']
+        rules = dmnRules.rules[table]
+        self.lines.append('RULES{!s} = {!s}'.format(number, self.literal(tuple([(name, table, str(rule['ruleId'])) for rule in rules]))))
+        if 'annotation' in dmnRules.decisionTables[table]:
+            headings = dmnRules.decisionTables[table]['annotation']
+            annotations = [[(headings[annotation], rule['annotation'][annotation]) for annotation in range(len(headings))] for rule in rules]
+            self.lines.append('ANNOTATIONS{!s} = {!s}'.format(number, self.literal(tuple(annotations))))
+        if dmnRules.decisionTables[table]['hitPolicy'][0] in ['P', 'O']:
+            self.lines.append('RANKS{!s} = {!s}'.format(number, self.literal(tuple([rule['rank'] for rule in rules]))))
+        if len(decisionAnnotations) > 0:
+            self.lines.append('DECISION_ANNOTATIONS{!s} = {!s}'.format(number, self.literal(decisionAnnotations)))
+        self.lines += ['', '']
+
+
+    def tableFunction(self, number, table, decisionAnnotations):
+        '''
+        The function that runs a DMN rules table - decideTable() for this table, with its hit policy inlined
+        '''
+        dmnRules = self.dmnRules
+        hitPolicy = dmnRules.decisionTables[table]['hitPolicy']
+        singleHit = hitPolicy in ['U', 'A', 'F']
+        annotated = ('annotation' in dmnRules.decisionTables[table]) and (len(dmnRules.decisionTables[table]['annotation']) > 0)
+        self.lines.append('# ' + '-' * 77)
+        self.lines.append("# DMN rules table '{!s}' - hit policy '{!s}'".format(table, hitPolicy))
+        self.lines.append('# ' + '-' * 77)
+        self.lines.append('')
+        self.constants(number, table, decisionAnnotations)
+        match = self.matchers(number, table, singleHit)
+        self.appliers(number, table)
+        self.lines += ['', '']
+        lines = []
+        lines.append('def table{!s}(names, outputs, errors):'.format(number))
+        lines.append('    """')
+        lines.append("    Run the DMN rules table {!r} - returns the decision dictionary, or None if no rules matched".format(table))
+        lines.append('    """')
+        lines.append('    {!s} = {!s}'.format('hit' if singleHit else 'hits', match))
+        lines.append('    result = results(names, outputs)')
+        lines.append('    if {!s}:'.format('hit is None' if singleHit else 'len(hits) == 0'))
+        lines.append('        errors.append({!r})'.format("No rules matched the input data for decision table '{!s}'".format(table)))
+        lines.append('        return None')
+        lines.append("    newData = {'Result': result}")
+        if singleHit or (hitPolicy[0] == 'P'):
+            if not singleHit:
+                lines.append('    hit = min([(RANKS{!s}[thisHit], thisHit) for thisHit in hits])[-1]'.format(number))
+            lines.append('    APPLY{!s}[hit](names, result)'.format(number))
+            lines.append("    newData['Executed Rule'] = RULES{!s}[hit]".format(number))
+            if len(decisionAnnotations) > 0:
+                lines.append("    newData['DecisionAnnotations'] = DECISION_ANNOTATIONS{!s}".format(number))
+            if annotated:
+                lines.append("    newData['RuleAnnotations'] = list(ANNOTATIONS{!s}[hit])".format(number))
+        elif hitPolicy[0] in ['C', 'R']:
+            # The first matched rule is not collected - as decideTable() does
+            if annotated:
+                lines.append('    annotations = []')
+            lines.append('    for hit in hits[1:]:')
+            lines.append('        APPLY{!s}[hit](names, result)'.format(number))
+            lines.append("        newData['Executed Rule'] = RULES{!s}[hit]".format(number))
+            if annotated:
+                lines.append('        annotations += ANNOTATIONS{!s}[hit]'.format(number))
+            if len(decisionAnnotations) > 0:
+                lines.append('        newData[\'DecisionAnnotations\'] = DECISION_ANNOTATIONS{!s}'.format(number))
+            if annotated:
+                lines.append('    if len(annotations) > 0:')
+                lines.append("        newData['RuleAnnotations'] = annotations")
+        else:
+            lines.append('    outputLists = set()')
+            lines.append("    newData['Executed Rule'] = []")
+            if annotated:
+                lines.append('    annotations = []')
+            lines.append('    for (rank, hit) in sorted([(RANKS{!s}[thisHit], thisHit) for thisHit in hits]):'.format(number))
+            lines.append('        APPLY{!s}[hit](names, result, outputLists)'.format(number))
+            lines.append("        newData['Executed Rule'].append(RULES{!s}[hit])".format(number))
+            if annotated:
+                lines.append('        annotations.append(list(ANNOTATIONS{!s}[hit]))'.format(number))
+            if len(decisionAnnotations) > 0:
+                lines.append("    newData['DecisionAnnotations'] = DECISION_ANNOTATIONS{!s}".format(number))
+            if annotated:
+                lines.append("    newData['RuleAnnotations'] = annotations")
+        lines.append('    if outputs is not None:')
+        lines.append("        newData['Result'] = {variable: newData['Result'][variable] for variable in outputs}")
+        lines.append('    return newData')
+        self.lines += lines + ['', '']
+
+
+    def applies(self, number, table):
+        '''
+        The function that checks the Decision table input tests of a DMN rules table - None if the table always runs
+        '''
+        inputPredicates = self.dmnRules.decisionTables[table]['inputPredicates']
+        if len(inputPredicates) == 0:
+            return None
+        (reads, sources) = self.conditions([[spec for (variable, spec, predicate) in inputPredicates]], table)
+        self.lines.append('def applies{!s}(names):'.format(number))
+        self.lines += reads
+        self.lines.append('    return bool({!s})'.format(sources[0]))
+        self.lines += ['', '']
+        return 'applies{!s}(names)'.format(number)
+
+
+    def module(self):
+        '''
+        The Python source of the module
+        '''
+        dmnRules = self.dmnRules
+        self.lines = [moduleHeader]
+        # The runtime helpers are the functions decide() uses, so the generated module binds, compares and reads back values the same way
+        for function in [sfeelUnwrap, sfeelCompare, sfeelInRange, sfeelIn, readback, nativeValue]:
+            self.lines += ['', inspect.getsource(function)]
+        self.lines.append('GLOSSARY = {!s}'.format(self.literal({variable: dmnRules.glossary[variable]['item'] for variable in dmnRules.glossary})))
+        self.lines.append('ITEMS = {!s}'.format(self.literal(list(dmnRules.glossaryItems))))
+        self.lines.append(moduleHelpers)
+        self.lines.append('')
+        decide = [decideSource]
+        for (number, (table, inputTests, decisionAnnotations)) in enumerate(dmnRules.decisions):
+            self.tableFunction(number, table, decisionAnnotations)
+            applies = self.applies(number, table)
+            indent = '    '
+            if applies is not None:
+                decide.append('    if {!s}:'.format(applies))
+                indent = '        '
+            decide.append('{0!s}newData = table{1!s}(names, outputs, errors)'.format(indent, number))
+            decide.append('{!s}if newData is None:'.format(indent))
+            decide.append("{!s}    return ({{'errors': errors}}, {{}})".format(indent))
+            decide.append('{!s}allResults.append(newData)'.format(indent))
+        decide.append(decideReturn)
+        self.lines += decide
+        return '\n'.join(self.lines)
+
+
+def generatePython(dmnRules, moduleFile=None):
+    '''
+    See DMN.generatePython()
+    '''
+    status = {}
+    if not dmnRules.isLoaded:
+        status['errors'] = ['No rulesBook has been loaded']
+        return (status, None)
+    generator = Generator(dmnRules)
+    source = generator.module()
+    if len(generator.errors) > 0:
+        status['errors'] = generator.errors
+        return (status, None)
+    try:
+        compile(source, moduleFile or '<pyDMNrules>', 'exec')
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        status['errors'] = ["The generated module does not compile - {!s}".format(e)]
+        return (status, None)
+    if moduleFile is not None:
+        with open(moduleFile, 'w') as fp:
+            fp.write(source)
+    return (status, source)
+
+
+def importGenerated(moduleFile):
+    '''
+    Import a generated module from its file
+    '''
+    spec = importlib.util.spec_from_file_location('pyDMNrules_generated', moduleFile)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def checkGenerated(dmnRules, module):
+    '''
+    See DMN.checkGenerated()
+    '''
+    if isinstance(module, str):
+        module = importGenerated(module)
+    testReturn = dmnRules.test()
+    if isinstance(testReturn, dict):
+        # test() could not run the tests
+        dmnRules.errors = []
+        (testStatus, results) = (testReturn, [])
+    else:
+        (testStatus, results) = testReturn
+    if isinstance(testStatus, dict) or (len(results) == 0):
+        # Nothing was replayed through the generated module, so nothing was checked
+        status = {}
+        status['errors'] = (testStatus.get('errors', []) if isinstance(testStatus, dict) else []) + ['No unit tests were run through the generated module']
+        return (status, [])
+    mismatches = []
+    for result in results:
+        (status, newData) = module.decide(result['data'])
+        if isinstance(newData, list):
+            newData = newData[-1]
+        if (status != result['status']) or (newData != result['newData']):
+            mismatches.append("Test ID {!s}: the generated module returned ({!r}, {!r}) but decide() returned ({!r}, {!r})".format(
+                result['Test ID'], status, newData, result['status'], result['newData']))
+    return ({}, mismatches)
@@ -0,0 +1,437 @@
+# -----------------------------------------------------------------------------
+# columnar.py
+# -----------------------------------------------------------------------------
+
+import math
+import numpy
+from .DMNrules import sfeelCompare, sfeelInRange, sfeelIn, readback
+
+
+def isNumber(value):
+    return isinstance(value, float) and not isinstance(value, bool)
+
+
+class Column():
+    '''
+    An input column, with the values bound the way decide() binds them
+
+    kind is 'number' (numbers is a float64 array, NaN is null),
+    'string' (strings is a str array, nulls marks the nulls)
+    or 'object' (anything else - only values is available)
+    '''
+
+    def __init__(self, column, n):
+        if column is None:
+            self.kind = 'number'
+            self.numbers = numpy.full(n, numpy.nan)
+            self.nulls = numpy.ones(n, dtype=bool)
+            self.valueList = None
+            return
+        array = numpy.asarray(column)
+        if array.shape != (n,):
+            raise ValueError('all input columns must have the same length')
+        self.valueList = None
+        if array.dtype.kind in 'iuf':
+            self.kind = 'number'
+            self.numbers = array.astype(numpy.float64)
+            self.nulls = numpy.isnan(self.numbers)
+        elif array.dtype.kind == 'U':
+            self.kind = 'string'
+            self.strings = array
+            self.nulls = numpy.zeros(n, dtype=bool)
+        else:
+            values = self.values(array.tolist())
+            nulls = numpy.fromiter((value is None for value in values), dtype=bool, count=n)
+            if nulls.all():
+                self.kind = 'number'
+                self.numbers = numpy.full(n, numpy.nan)
+                self.nulls = nulls
+            elif all([isinstance(value, str) for value in values if value is not None]):
+                self.kind = 'string'
+                self.strings = numpy.array(['' if value is None else value for value in values], dtype=str)
+                self.nulls = nulls
+            else:
+                self.kind = 'object'
+
+
+    def values(self, values=None):
+        '''
+        The Python values of this column - numbers as float, NaN as None
+        '''
+        if self.valueList is not None:
+            return self.valueList
+        if values is None:
+            if self.kind == 'number':
+                values = self.numbers.tolist()
+            else:
+                values = self.strings.tolist()
+                for i in numpy.nonzero(self.nulls)[0]:
+                    values[i] = None
+        for i in range(len(values)):
+            value = values[i]
+            if isinstance(value, float):
+                if math.isnan(value):
+                    values[i] = None
+            elif isinstance(value, int) and not isinstance(value, bool):
+                values[i] = float(value)
+        self.valueList = values
+        return values
+
+
+def compareMask(column, op, value, n):
+    '''
+    Vectorised sfeelCompare() of a column against a constant - None if it can't be vectorised
+    '''
+    if column.kind == 'number':
+        if isNumber(value):
+            x = column.numbers
+        elif isinstance(value, bool):
+            return None
+        elif value is None:
+            if op == '=':
+                return column.nulls.copy()
+            elif op == '!=':
+                return ~column.nulls
+            return numpy.zeros(n, dtype=bool)
+        else:
+            return numpy.full(n, op == '!=')
+        if op == '=':
+            return x == value
+        elif op == '!=':
+            return x != value
+        elif op == '<':
+            return x < value
+        elif op == '<=':
+            return x <= value
+        elif op == '>':
+            return x > value
+        return x >= value
+    elif column.kind == 'string':
+        if isinstance(value, str):
+            x = column.strings
+        elif value is None:
+            if op == '=':
+                return column.nulls.copy()
+            elif op == '!=':
+                return ~column.nulls
+            return numpy.zeros(n, dtype=bool)
+        else:
+            return numpy.full(n, op == '!=')
+        if op == '=':
+            return (x == value) & ~column.nulls
+        elif op == '!=':
+            return (x != value) | column.nulls
+        elif op == '<':
+            return (x < value) & ~column.nulls
+        elif op == '<=':
+            return (x <= value) & ~column.nulls
+        elif op == '>':
+            return (x > value) & ~column.nulls
+        return (x >= value) & ~column.nulls
+    return None
+
+
+def rangeMask(column, openBracket, lowVal, highVal, closeBracket, n):
+    '''
+    Vectorised sfeelInRange() of a column - None if it can't be vectorised
+    '''
+    if column.kind == 'number':
+        if not isNumber(lowVal) or not isNumber(highVal):
+            return numpy.zeros(n, dtype=bool)
+        x = column.numbers
+    elif column.kind == 'string':
+        if not isinstance(lowVal, str) or not isinstance(highVal, str):
+            return numpy.zeros(n, dtype=bool)
+        x = column.strings
+    else:
+        return None
+    if openBracket == '[':
+        mask = x >= lowVal
+    else:
+        mask = x > lowVal
+    if closeBracket == ']':
+        mask &= x <= highVal
+    else:
+        mask &= x < highVal
+    return mask & ~column.nulls
+
+
+def inMask(column, comparisons, n):
+    '''
+    Vectorised sfeelIn() of a column - None if it can't be vectorised
+    '''
+    if column.kind == 'number':
+        if not all([isNumber(value) for (op, value) in comparisons]):
+            return None
+    elif column.kind == 'string':
+        if not all([isinstance(value, str) for (op, value) in comparisons]):
+            return None
+    else:
+        return None
+    mask = numpy.zeros(n, dtype=bool)
+    for (op, value) in comparisons:
+        mask |= compareMask(column, op, value, n)
+    # Nulls short circuit the way pySFeel does
+    mask[column.nulls] = bool(sfeelIn(None, comparisons))
+    return mask
+
+
+def specMask(spec, columns, n):
+    '''
+    Evaluate a compiled test against whole columns - None if it can't be vectorised
+    '''
+    kind = spec[0]
+    if kind == 'compare':
+        (kind, op, item, operand) = spec
+        if operand[0] == 'value':
+            return compareMask(columns[item], op, operand[1], n)
+    elif kind == 'range':
+        (kind, item, openBracket, lowOperand, highOperand, closeBracket) = spec
+        if (lowOperand[0] == 'value') and (highOperand[0] == 'value'):
+            return rangeMask(columns[item], openBracket, lowOperand[1], highOperand[1], closeBracket, n)
+    elif kind == 'in':
+        (kind, item, comparisons) = spec
+        if all([operand[0] == 'value' for (op, operand) in comparisons]):
+            return inMask(columns[item], [(op, operand[1]) for (op, operand) in comparisons], n)
+    return None
+
+
+def objectArray(values):
+    '''
+    A numpy object array of values (which may themselves be lists)
+    '''
+    array = numpy.empty(len(values), dtype=object)
+    for i in range(len(values)):
+        array[i] = values[i]
+    return array
+
+
+def rowByRow(context, columns, rows, function):
+    '''
+    Call function(names) for each of the rows, with the Glossary items in context set to the values in that row
+    '''
+    names = context
+    valueLists = [(item, columns[item].values()) for item in columns]
+    results = []
+    for i in rows:
+        for (item, values) in valueLists:
+            names[item] = values[i]
+        results.append(function(names))
+    return results
+
+
+def boundColumns(dmnRules, data, n, errors):
+    '''
+    The columns of data, with the values that decide() binds through the S-FEEL parser
+    (e.g. strings that are Glossary Variables) bound the same way, record by record
+    '''
+    valueLists = {}
+    rows = set()
+    for variable in data:
+        if isinstance(data[variable], numpy.ndarray):
+            if data[variable].dtype.kind in 'iuf':
+                continue
+            values = data[variable].tolist()
+        else:
+            values = list(data[variable])
+        valueLists[variable] = values
+        for i in range(len(values)):
+            if not dmnRules.value2native(values[i])[0]:
+                rows.add(i)
+    if len(rows) == 0:
+        return data
+    data = dict(data)
+    for i in sorted(rows):
+        context = dmnRules.newContext()
+        record = {}
+        for variable in data:
+            record[variable] = valueLists[variable][i] if variable in valueLists else data[variable][i].item()
+        dmnRules.bindData(context, record)
+        errors += ['{!s} for record {!s}'.format(error, i) for error in context.errors]
+        for variable in valueLists:
+            valueLists[variable][i] = context[dmnRules.glossary[variable]['item']]
+    for variable in valueLists:
+        data[variable] = objectArray(valueLists[variable])
+    return data
+
+
+def decideColumns(dmnRules, data, table=None):
+    """
+    Make a decision for whole columns of data, using one decision table
+
+    See DMN.decideColumns()
+    """
+
+    status = {}
+    errors = []
+    if not dmnRules.isLoaded:
+        status['errors'] = ['No rulesBook has been loaded']
+        return (status, {})
+    if table is None:
+        table = dmnRules.decisions[0][0]
+    if table not in dmnRules.rules:
+        status['errors'] = ["No decision table named '{!s}'".format(table)]
+        return (status, {})
+    hitPolicy = dmnRules.decisionTables[table]['hitPolicy']
+    if hitPolicy[0] not in ['U', 'A', 'F', 'C', 'R']:
+        status['errors'] = ["Hit policy '{!s}' of decision table '{!s}' cannot be evaluated by columns".format(hitPolicy, table)]
+        return (status, {})
+    for variable in data:
+        if variable not in dmnRules.glossary:
+            status['errors'] = ['variable ({!s}) not in Glossary'.format(variable)]
+            return (status, {})
+    n = None
+    for variable in data:
+        n = len(data[variable])
+        break
+    if n is None:
+        status['errors'] = ['No input columns']
+        return (status, {})
+
+    # Bind the columns to the Glossary items - missing columns are null
+    data = boundColumns(dmnRules, data, n, errors)
+    context = dmnRules.newContext()
+    columns = {}
+    for variable in dmnRules.glossary:
+        item = dmnRules.glossary[variable]['item']
+        columns[item] = Column(data.get(variable), n)
+
+    # Test each rule, caching the mask of each distinct test
+    masks = {}
+    def testMask(test, spec, predicate):
+        if test not in masks:
+            mask = specMask(spec, columns, n)
+            if mask is None:
+                mask = numpy.array([bool(retVal) for retVal in rowByRow(context, columns, range(n), predicate)], dtype=bool)
+            masks[test] = mask
+        return masks[test]
+
+    # Only the records that pass the 'Decision' table input tests use this decision table
+    active = numpy.ones(n, dtype=bool)
+    for (variable, spec, predicate) in dmnRules.decisionTables[table]['inputPredicates']:
+        active &= testMask(('Decision', repr(spec)), spec, predicate)
+    rules = dmnRules.rules[table]
+    matches = numpy.zeros((len(rules), n), dtype=bool)
+    for thisRule in range(len(rules)):
+        mask = active.copy()
+        for ((variable, test), (variable, spec, predicate)) in zip(rules[thisRule]['tests'], rules[thisRule]['predicates']):
+            mask &= testMask(test, spec, predicate)
+            if not mask.any():
+                break
+        matches[thisRule] = mask
+
+    matched = matches.any(axis=0)
+    decisionName = dmnRules.decisionTables[table]['name']
+    outputs = [outputColumn['name'] for outputColumn in dmnRules.decisionTables[table]['outputColumns']]
+    # The (spec, value) of each rule's output, by Variable - a rule may not have a value for every output
+    ruleValues = [{variable: (spec, value) for (variable, spec, value) in rule['values']} for rule in rules]
+    results = {}
+    results['Result'] = {}
+    executed = numpy.full(n, None, dtype=object)
+    ruleIds = objectArray([(decisionName, table, str(rule['ruleId'])) for rule in rules])
+    if hitPolicy in ['U', 'A', 'F']:
+        # The first matching rule
+        firstRule = matches.argmax(axis=0)
+        executed[matched] = ruleIds[firstRule[matched]]
+        for variable in outputs:
+            item = dmnRules.glossary[variable]['item']
+            column = numpy.full(n, None, dtype=object)
+            for thisRule in range(len(rules)):
+                rows = numpy.nonzero(matched & (firstRule == thisRule))[0]
+                if len(rows) == 0:
+                    continue
+                if variable not in ruleValues[thisRule]:
+                    # The rule leaves the Variable as it was
+                    values = columns[item].values()
+                    for i in rows:
+                        column[i] = readback(values[i])
+                    continue
+                (spec, value) = ruleValues[thisRule][variable]
+                if (spec[0] == 'value') and not isinstance(spec[1], (list, dict)):
+                    column[rows] = readback(value(None))
+                    continue
+                elif spec[0] == 'value':
+                    outputValues = [readback(value(None)) for i in rows]
+                else:
+                    outputValues = [readback(retVal) for retVal in rowByRow(context, columns, rows, value)]
+                for (i, thisResult) in zip(rows, outputValues):
+                    column[i] = thisResult
+            results['Result'][variable] = column
+    else:
+        # Collect - the first matching rule is skipped, as decide() does
+        firstRule = matches.argmax(axis=0)
+        collected = matches.copy()
+        collected[firstRule, numpy.arange(n)] = False
+        collecting = collected.any(axis=0)
+        lastRule = len(rules) - 1 - collected[::-1].argmax(axis=0)
+        executed[collecting] = ruleIds[lastRule[collecting]]
+        for variable in outputs:
+            item = dmnRules.glossary[variable]['item']
+            base = [readback(value) for value in columns[item].values()]
+            constants = []
+            for thisRule in range(len(rules)):
+                (spec, value) = ruleValues[thisRule].get(variable, (None, None))
+                constants.append(readback(value(None)) if (spec is not None) and (spec[0] == 'value') else None)
+            allNumbers = all([(variable in ruleValues[thisRule]) and (ruleValues[thisRule][variable][0][0] == 'value') and isNumber(constants[thisRule])
+                              for thisRule in range(len(rules))])
+            noBase = all([value is None for value in base])
+            column = objectArray(base)
+            if noBase and allNumbers and (len(hitPolicy) == 2):
+                numbers = numpy.array(constants, dtype=numpy.float64)
+                if hitPolicy[1] == '+':
+                    totals = numbers @ collected
+                elif hitPolicy[1] == '#':
+                    totals = collected.sum(axis=0).astype(numpy.float64)
+                elif hitPolicy[1] == '<':
+                    totals = numpy.where(collected, numbers[:, None], numpy.inf).min(axis=0)
+                else:
+                    totals = numpy.where(collected, numbers[:, None], -numpy.inf).max(axis=0)
+                if hitPolicy[1] == '#':
+                    column[collecting] = totals[collecting].astype(numpy.int64).tolist()
+                else:
+                    column[collecting] = totals[collecting].tolist()
+            else:
+                for thisRule in range(len(rules)):
+                    rows = numpy.nonzero(collected[thisRule])[0]
+                    if (len(rows) == 0) or (variable not in ruleValues[thisRule]):
+                        continue
+                    (spec, value) = ruleValues[thisRule][variable]
+                    if (spec[0] == 'value') and not isinstance(spec[1], (list, dict)):
+                        outputValues = [constants[thisRule]] * len(rows)
+                    elif spec[0] == 'value':
+                        outputValues = [readback(value(None)) for i in rows]
+                    else:
+                        outputValues = [readback(retVal) for retVal in rowByRow(context, columns, rows, value)]
+                    for (i, thisOutput) in zip(rows, outputValues):
+                        if len(hitPolicy) == 1:
+                            if not column[i]:
+                                column[i] = []
+                            column[i].append(thisOutput)
+                        elif hitPolicy[1] == '+':
+                            if not column[i]:
+                                column[i] = 0
+                            try:
+                                column[i] += thisOutput
+                            except TypeError:
+                                errors.append("Cannot add '{!r}' in decision table '{!s}' for record {!s}".format(thisOutput, table, i))
+                        elif hitPolicy[1] == '#':
+                            if not column[i]:
+                                column[i] = 0
+                            column[i] += 1
+                        elif hitPolicy[1] == '<':
+                            if (column[i] is None) or sfeelCompare('<', thisOutput, column[i]):
+                                column[i] = thisOutput
+                        else:
+                            if (column[i] is None) or sfeelCompare('>', thisOutput, column[i]):
+                                column[i] = thisOutput
+            column[~matched] = None
+            results['Result'][variable] = column
+    results['Executed Rule'] = executed
+    results['Matched'] = matched
+    unmatched = int((active & ~matched).sum())
+    if unmatched > 0:
+        errors.append("No rules matched the input data for decision table '{!s}' for {!s} records".format(table, unmatched))
+    errors += context.errors
+    if len(errors) > 0:
+        status['errors'] = errors
+    return (status, results)
@@ -0,0 +1,324 @@
+# -----------------------------------------------------------------------------
+# dmnxml.py
+# -----------------------------------------------------------------------------
+
+import re
+import xml.etree.ElementTree as ElementTree
+from .DMNrules import fileHash
+
+camundaNamespace = 'http://camunda.org/schema/1.0/dmn'
+# DMN hit policies, and COLLECT aggregations, as pyDMNrules hit policies
+hitPolicies = {'UNIQUE': 'U', 'FIRST': 'F', 'PRIORITY': 'P', 'ANY': 'A', 'COLLECT': 'C', 'RULE ORDER': 'R', 'OUTPUT ORDER': 'O'}
+aggregations = {'SUM': '+', 'MIN': '<', 'MAX': '>', 'COUNT': '#'}
+# The Business Concept of the Glossary Variables whose DMN names are not of the form 'concept.attribute'
+defaultConcept = 'Data'
+
+
+def localName(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def children(element, name):
+    '''
+    The child elements with this local name, in whichever DMN namespace the file uses
+    '''
+    return [child for child in element if localName(child) == name]
+
+
+def expressionText(element):
+    '''
+    The text of the <text> of a DMN expression element, or '' if it has none
+    '''
+    for text in children(element, 'text'):
+        return (text.text or '').strip()
+    return ''
+
+
+def splitList(text):
+    '''
+    Split FEEL text at the commas that are not in a string, a list or a range
+    '''
+    parts = []
+    part = ''
+    depth = 0
+    inString = False
+    for char in text:
+        if inString:
+            if char == '"':
+                inString = False
+        elif char == '"':
+            inString = True
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif (char == ',') and (depth == 0):
+            parts.append(part.strip())
+            part = ''
+            continue
+        part += char
+    parts.append(part.strip())
+    return parts
+
+
+def isString(text):
+    return re.fullmatch(r'"[^"]*"', text) is not None
+
+
+def glossaryItem(variable):
+    '''
+    The (Business Concept, Attribute) for a DMN variable name, with any characters that can't be in an S-FEEL name replaced by '_'
+    '''
+    if '.' in variable:
+        (concept, attribute) = variable.split('.', 1)
+    else:
+        (concept, attribute) = (defaultConcept, variable)
+    concept = re.sub(r'\W', '_', concept.strip())
+    attribute = re.sub(r'\W', '_', attribute.strip())
+    if concept[:1].isdigit():
+        concept = '_' + concept
+    if attribute[:1].isdigit():
+        attribute = '_' + attribute
+    return (concept, attribute)
+
+
+def unaryTest(dmnRules, variable, location, text):
+    '''
+    Convert the FEEL unary tests of a DMN input entry into the S-FEEL test of a rule, or None if the entry matches anything
+    '''
+    if text in ['', '-']:
+        return None
+    isNot = False
+    tests = text
+    if tests.startswith('not(') and tests.endswith(')'):
+        isNot = True
+        tests = tests[4:-1].strip()
+    strings = splitList(tests)
+    # In a workbook a quoted string is an expression, but in DMN it is a value to be matched
+    if all([isString(string) for string in strings]):
+        if len(strings) == 1:
+            if isNot:
+                return variable + ' != ' + strings[0]
+            return variable + ' = ' + strings[0]
+        if isNot:
+            return 'not(' + variable + ' in(' + ','.join(strings) + '))'
+        return variable + ' in(' + ','.join(strings) + ')'
+    return dmnRules.test2sfeel(variable, location, text)
+
+
+def decisionOrder(dmnRules, decisions):
+    '''
+    The ids of the decisions, with every decision after the decisions it requires
+    '''
+    order = []
+    visiting = set()
+    def visit(decisionId):
+        if decisionId in order:
+            return
+        if decisionId in visiting:
+            dmnRules.errors.append("Decision '{!s}' requires itself".format(decisionId))
+            return
+        visiting.add(decisionId)
+        for requirement in children(decisions[decisionId], 'informationRequirement'):
+            for required in children(requirement, 'requiredDecision'):
+                requiredId = required.get('href', '').lstrip('#')
+                if requiredId not in decisions:
+                    dmnRules.errors.append("Decision '{!s}' requires the unknown decision '{!s}'".format(decisionId, requiredId))
+                    continue
+                visit(requiredId)
+        visiting.discard(decisionId)
+        order.append(decisionId)
+    for decisionId in decisions:
+        visit(decisionId)
+    return order
+
+
+def loadXML(dmnRules, dmnFile, decisionTrees=False):
+    """
+    Load a DMN XML file into a DMN
+
+    See DMN.loadXML()
+    """
+
+    dmnRules.errors = []
+    dmnRules.compiledTests = {}
+    dmnRules.compiledResults = {}
+    dmnRules.testStats = {}
+    dmnRules.tableProfiles = {}
+    dmnRules.ruleProfiles = {}
+    dmnRules.newVersion()
+    dmnRules.wb = None
+    try:
+        definitions = ElementTree.parse(dmnFile).getroot()
+        dmnRules.rulesBookHash = fileHash(dmnFile)
+    except (OSError, ElementTree.ParseError) as e:
+        dmnRules.errors.append("No readable DMN file named '{!s}' - {!s}".format(dmnFile, e))
+        status = {}
+        status['errors'] = dmnRules.errors
+        return status
+
+    decisions = {}
+    for decision in children(definitions, 'decision'):
+        decisionId = decision.get('id')
+        tables = children(decision, 'decisionTable')
+        if len(tables) == 0:
+            dmnRules.errors.append("Decision '{!s}' is not a decision table".format(decisionId))
+            continue
+        decisions[decisionId] = decision
+    if (len(decisions) == 0) and (len(dmnRules.errors) == 0):
+        dmnRules.errors.append('No decision tables found')
+    order = decisionOrder(dmnRules, decisions)
+    if len(dmnRules.errors) > 0:
+        status = {}
+        status['errors'] = dmnRules.errors
+        return status
+
+    # The Glossary is every input expression and output name - the DMN variables
+    inputNames = {}
+    outputNames = {}
+    variables = []
+    for decisionId in order:
+        decisionTable = children(decisions[decisionId], 'decisionTable')[0]
+        inputNames[decisionId] = []
+        for thisInput in children(decisionTable, 'input'):
+            name = ''
+            for inputExpression in children(thisInput, 'inputExpression'):
+                name = expressionText(inputExpression)
+            if name == '':
+                name = thisInput.get('{' + camundaNamespace + '}inputVariable', thisInput.get('label', '')).strip()
+            if name == '':
+                dmnRules.errors.append("Input '{!s}' in decision '{!s}' has no input expression".format(thisInput.get('id'), decisionId))
+                continue
+            inputNames[decisionId].append(name)
+        outputNames[decisionId] = []
+        for output in children(decisionTable, 'output'):
+            name = output.get('name', output.get('label', '')).strip()
+            if name == '':
+                dmnRules.errors.append("Output '{!s}' in decision '{!s}' has no name".format(output.get('id'), decisionId))
+                continue
+            outputNames[decisionId].append(name)
+        for name in inputNames[decisionId] + outputNames[decisionId]:
+            if name not in variables:
+                variables.append(name)
+    dmnRules.glossary = {}
+    dmnRules.glossaryItems = {}
+    dmnRules.glossaryConcepts = {}
+    for variable in variables:
+        (concept, attribute) = glossaryItem(variable)
+        item = concept + '.' + attribute
+        if item in dmnRules.glossaryItems:
+            dmnRules.errors.append("Variables '{!s}' and '{!s}' have the same name in S-FEEL".format(dmnRules.glossaryItems[item], variable))
+            continue
+        dmnRules.glossary[variable] = {}
+        dmnRules.glossary[variable]['item'] = item
+        dmnRules.glossary[variable]['concept'] = concept
+        dmnRules.glossaryItems[item] = variable
+        dmnRules.glossaryConcepts.setdefault(concept, []).append(variable)
+    dmnRules.glossaryLoaded = True
+    dmnRules.initGlossary()
+    if len(dmnRules.errors) > 0:
+        status = {}
+        status['errors'] = dmnRules.errors
+        return status
+
+    # Each decision table is a DMN rules table, run in the order of the decision requirements
+    dmnRules.decisions = []
+    dmnRules.decisionTables = {}
+    dmnRules.rules = {}
+    for decisionId in order:
+        decision = decisions[decisionId]
+        decisionTable = children(decision, 'decisionTable')[0]
+        table = decisionId
+        dmnRules.decisionTables[table] = {}
+        dmnRules.decisionTables[table]['name'] = decision.get('name', decisionId)
+        dmnRules.decisions.append((table, [], []))
+        hitPolicy = decisionTable.get('hitPolicy', 'UNIQUE')
+        if hitPolicy not in hitPolicies:
+            dmnRules.errors.append("Invalid hit policy '{!s}' for decision '{!s}'".format(hitPolicy, decisionId))
+            continue
+        hitPolicy = hitPolicies[hitPolicy]
+        aggregation = decisionTable.get('aggregation')
+        if aggregation is not None:
+            if (hitPolicy != 'C') or (aggregation not in aggregations):
+                dmnRules.errors.append("Invalid aggregation '{!s}' for decision '{!s}'".format(aggregation, decisionId))
+                continue
+            hitPolicy += aggregations[aggregation]
+        dmnRules.decisionTables[table]['hitPolicy'] = hitPolicy
+        dmnRules.decisionTables[table]['inputColumns'] = []
+        for name in inputNames[decisionId]:
+            dmnRules.decisionTables[table]['inputColumns'].append({'name':name})
+        dmnRules.decisionTables[table]['outputColumns'] = []
+        ranked = False
+        for (output, name) in zip(children(decisionTable, 'output'), outputNames[decisionId]):
+            dmnRules.decisionTables[table]['outputColumns'].append({'name':name})
+            for outputValues in children(output, 'outputValues'):
+                dmnRules.decisionTables[table]['outputColumns'][-1]['validity'] = splitList(expressionText(outputValues))
+                ranked = True
+        if (hitPolicy in ['P', 'O']) and not ranked:
+            dmnRules.errors.append("Decision '{!s}' has hit policy '{!s}' but there is no ordered list of output values".format(decisionId, hitPolicy))
+            continue
+        rules = children(decisionTable, 'rule')
+        hasDescriptions = any([len(children(rule, 'description')) > 0 for rule in rules])
+        if hasDescriptions:
+            dmnRules.decisionTables[table]['annotation'] = ['Description']
+        dmnRules.rules[table] = []
+        if hitPolicy[0] in ['C', 'R']:
+            # decide() collects from the second matching rule (the validity row of a workbook), so start with a rule that always matches
+            # and, like the validity row, has a value for every output
+            validityRow = {'ruleId':None, 'tests':[], 'outputs':[]}
+            for name in outputNames[decisionId]:
+                validityRow['outputs'].append((name, 'null', None))
+            dmnRules.rules[table].append(validityRow)
+            if hasDescriptions:
+                dmnRules.rules[table][-1]['annotation'] = [None]
+        for thisRule in range(len(rules)):
+            rule = rules[thisRule]
+            ruleId = rule.get('id', str(thisRule + 1))
+            location = '{!s}:{!s}'.format(decisionId, ruleId)
+            inputEntries = children(rule, 'inputEntry')
+            outputEntries = children(rule, 'outputEntry')
+            if (len(inputEntries) != len(inputNames[decisionId])) or (len(outputEntries) != len(outputNames[decisionId])):
+                dmnRules.errors.append("Rule '{!s}' in decision '{!s}' does not have an entry for every input and output".format(ruleId, decisionId))
+                continue
+            newRule = {'ruleId':ruleId, 'tests':[], 'outputs':[]}
+            for (name, inputEntry) in zip(inputNames[decisionId], inputEntries):
+                test = unaryTest(dmnRules, dmnRules.glossary[name]['item'], location, expressionText(inputEntry))
+                if test is not None:
+                    newRule['tests'].append((name, test))
+            for (thisOutput, outputEntry) in enumerate(outputEntries):
+                text = expressionText(outputEntry)
+                if text == '':
+                    continue
+                name = outputNames[decisionId][thisOutput]
+                result = dmnRules.result2sfeel(dmnRules.glossary[name]['item'], location, text)
+                rank = None
+                validity = dmnRules.decisionTables[table]['outputColumns'][thisOutput].get('validity')
+                if validity is not None:
+                    if text not in validity:
+                        dmnRules.errors.append("Output value '{!s}' at '{!s}' is not in the output valid list '{!s}'".format(text, location, validity))
+                    else:
+                        rank = validity.index(text)
+                newRule['outputs'].append((name, result, rank))
+            if hasDescriptions:
+                newRule['annotation'] = []
+                for description in children(rule, 'description'):
+                    newRule['annotation'].append((description.text or '').strip())
+                if len(newRule['annotation']) == 0:
+                    newRule['annotation'].append(None)
+            dmnRules.rules[table].append(newRule)
+        if len(rules) == 0:
+            dmnRules.errors.append("Decision table '{!s}' has no rules".format(decisionId))
+    if len(dmnRules.errors) > 0:
+        status = {}
+        status['errors'] = dmnRules.errors
+        return status
+
+    dmnRules.compileRules()
+    dmnRules.indexRules()
+    dmnRules.isLoaded = True
+    status = {}
+    if decisionTrees:
+        status = dmnRules.buildDecisionTrees()
+    if len(dmnRules.errors) > 0:
+        status['errors'] = dmnRules.errors
+    return status
@@ -0,0 +1,71 @@
+# -----------------------------------------------------------------------------
+# parallel.py
+# -----------------------------------------------------------------------------
+
+import os
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from .DMNrules import DMN, dataRecords
+
+
+# The DMN of a worker process, restored from the compiled rulesBook sent when the worker started
+workerRules = None
+
+
+def initWorker(compiled):
+    global workerRules
+    workerRules = DMN()
+    workerRules.restoreCompiled(compiled)
+
+
+def decideChunk(chunk, outputs):
+    return workerRules.decideMany(chunk, outputs)
+
+
+def chunks(records, chunkSize):
+    '''
+    Split the records into lists of chunkSize records
+    '''
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunkSize))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def decideParallel(dmnRules, records, outputs=None, workers=None, chunkSize=1000):
+    """
+    Make a decision for each of a large batch of records, using a pool of worker processes
+
+    See DMN.decideParallel()
+    """
+
+    if not dmnRules.isLoaded:
+        for data in dataRecords(records):
+            yield ({'errors': ['No rulesBook has been loaded']}, {})
+        return
+    errors = dmnRules.outputErrors(outputs)
+    if len(errors) > 0:
+        for data in dataRecords(records):
+            yield ({'errors': list(errors)}, {})
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(int(workers), 1)
+    chunkSize = max(int(chunkSize), 1)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(dmnRules.compiledRulesBook(),)) as executor:
+        # Keep every worker busy, but don't read further ahead than two chunks per worker
+        pending = collections.deque()
+        try:
+            for chunk in chunks(dataRecords(records), chunkSize):
+                pending.append(executor.submit(decideChunk, chunk, outputs))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while len(pending) > 0:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,330 @@
+# -----------------------------------------------------------------------------
+# service.py
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+import threading
+import urllib.parse
+from .cache import rulesBookCache
+
+# The largest request body the service reads
+maxBody = 64 * 1024 * 1024
+reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def typedValue(value):
+    '''
+    A decision output in Camunda's variable format
+    '''
+    if value is None:
+        return {'type': 'Null', 'value': None, 'valueInfo': {}}
+    if isinstance(value, bool):
+        return {'type': 'Boolean', 'value': value, 'valueInfo': {}}
+    if isinstance(value, int):
+        return {'type': 'Integer', 'value': value, 'valueInfo': {}}
+    if isinstance(value, float):
+        return {'type': 'Double', 'value': value, 'valueInfo': {}}
+    if isinstance(value, str):
+        return {'type': 'String', 'value': value, 'valueInfo': {}}
+    if isinstance(value, (list, dict)):
+        return {'type': 'Json', 'value': value, 'valueInfo': {}}
+    return {'type': 'String', 'value': str(value), 'valueInfo': {}}
+
+
+def exception(kind, message):
+    return {'type': kind, 'message': message}
+
+
+class DecisionService():
+    '''
+    A local decision service, compatible with the Camunda REST API for evaluating decisions, backed by pyDMNrules
+
+    Every DMN rules table of every rulesBook is a decision definition, keyed by its table name
+    (for DMN XML files, the id of the decision), and each rulesBook is also keyed by its file name without the extension.
+    Evaluating a key runs the whole rulesBook and returns the outputs of that table (of the last table, for a rulesBook key).
+    The rulesBooks are held by a RulesBookCache, so they stay loaded and are reloaded when they change
+    (in a thread, not on the event loop), and the keys are rebuilt when a rulesBook is reloaded.
+
+    POST {basePath}/decision-definition/key/{key}/evaluate - Camunda's evaluate request and response
+    POST {basePath}/decision-definition/key/{key}/evaluate-batch - a list of evaluate requests, returns a list of evaluate responses
+    GET {basePath}/decision-definition - the decision definitions
+    '''
+
+    def __init__(self, rulesBooks, basePath='/engine-rest', cache=None):
+        self.rulesBooks = [os.path.abspath(rulesBook) for rulesBook in rulesBooks]
+        self.basePath = '/' + basePath.strip('/')
+        self.cache = rulesBookCache if cache is None else cache
+        self.lock = threading.Lock()
+        self.keys = {}
+        self.loaded = {}
+        self.collisions = []
+
+
+    def load(self):
+        '''
+        Load every rulesBook, reloading those that have changed, and rebuild the decision keys
+        if any rulesBook was (re)loaded - returns the list of load errors and decision key collisions
+        (a key that is already used keeps its first binding)
+        '''
+        errors = []
+        loaded = {}
+        for path in self.rulesBooks:
+            (status, dmnRules) = self.cache.load(path)
+            if 'errors' in status:
+                errors += ['{!s}: {!s}'.format(path, error) for error in status['errors']]
+                continue
+            loaded[path] = dmnRules
+        with self.lock:
+            if (len(loaded) != len(self.loaded)) or any([self.loaded.get(path) is not loaded[path] for path in loaded]):
+                keys = {}
+                collisions = []
+                for path in loaded:
+                    # A table named after its own rulesBook is keyed by the table
+                    bindings = [(table, table) for table in loaded[path].decisionTables]
+                    stem = os.path.splitext(os.path.basename(path))[0]
+                    if stem not in loaded[path].decisionTables:
+                        bindings.insert(0, (stem, None))
+                    for (key, table) in bindings:
+                        if key in keys:
+                            collisions.append("{!s}: decision key '{!s}' is already used by {!s}".format(path, key, keys[key][0]))
+                            continue
+                        keys[key] = (path, table)
+                self.keys = keys
+                self.loaded = loaded
+                self.collisions = collisions
+            errors += self.collisions
+        return errors
+
+
+    def definitions(self):
+        '''
+        The decision definitions, in Camunda's format
+        '''
+        self.load()
+        with self.lock:
+            (keys, loaded) = (self.keys, self.loaded)
+        definitions = []
+        for key in keys:
+            (path, table) = keys[key]
+            name = key if table is None else loaded[path].decisionTables[table]['name']
+            definitions.append({'id': key, 'key': key, 'name': name, 'resource': os.path.basename(path)})
+        return definitions
+
+
+    def rulesBook(self, key):
+        '''
+        The loaded DMN and table for a decision key - (None, None) if the key is unknown
+        '''
+        self.load()
+        with self.lock:
+            (keys, loaded) = (self.keys, self.loaded)
+        if key not in keys:
+            return (None, None)
+        (path, table) = keys[key]
+        dmnRules = loaded[path]
+        if table is None:
+            table = dmnRules.decisions[-1][0]
+        if table not in dmnRules.decisionTables:
+            return (None, None)
+        return (dmnRules, table)
+
+
+    def variables(self, request):
+        '''
+        The data for decide() from the variables of an evaluate request
+        '''
+        if not isinstance(request, dict) or not isinstance(request.get('variables', {}), dict):
+            raise ValueError('The request must be an object with an object of variables')
+        data = {}
+        for (name, variable) in request.get('variables', {}).items():
+            if isinstance(variable, dict):
+                data[name] = variable.get('value')
+            else:
+                data[name] = variable
+        return data
+
+
+    def results(self, dmnRules, table, status, newData):
+        '''
+        The evaluate response for a table, from the status and newData returned by decide()
+        Collected outputs (hit policies 'C' without an aggregation, 'R' and 'O') are one result per matched rule, as Camunda returns them
+        '''
+        failures = [error for error in status.get('errors', []) if not error.startswith('No rules matched')]
+        if len(failures) > 0:
+            raise ValueError('; '.join(failures))
+        decisions = newData if isinstance(newData, list) else ([newData] if len(newData) > 0 else [])
+        for decision in decisions:
+            executed = decision.get('Executed Rule')
+            if isinstance(executed, list):
+                executed = executed[0] if len(executed) > 0 else None
+            if (executed is not None) and (executed[1] == table):
+                break
+        else:
+            return []
+        outputs = []
+        for rule in dmnRules.rules[table]:
+            for (name, result, rank) in rule['outputs']:
+                if name not in outputs:
+                    outputs.append(name)
+        hitPolicy = dmnRules.decisionTables[table]['hitPolicy']
+        if hitPolicy not in ['C', 'R', 'O']:
+            return [{name: typedValue(decision['Result'].get(name)) for name in outputs}]
+        rows = []
+        for name in outputs:
+            values = decision['Result'].get(name)
+            if not isinstance(values, list):
+                continue
+            for (row, value) in enumerate(values):
+                if row == len(rows):
+                    rows.append({})
+                rows[row][name] = typedValue(value)
+        return rows
+
+
+    def evaluate(self, key, request):
+        (dmnRules, table) = self.rulesBook(key)
+        if dmnRules is None:
+            return (404, exception('RestException', "No matching decision definition with key: {!s}".format(key)))
+        try:
+            (status, newData) = dmnRules.decide(self.variables(request))
+            return (200, self.results(dmnRules, table, status, newData))
+        except ValueError as e:
+            return (400, exception('InvalidRequestException', str(e)))
+
+
+    def evaluateBatch(self, key, requests):
+        (dmnRules, table) = self.rulesBook(key)
+        if dmnRules is None:
+            return (404, exception('RestException', "No matching decision definition with key: {!s}".format(key)))
+        if not isinstance(requests, list):
+            return (400, exception('InvalidRequestException', 'The request must be a list of evaluate requests'))
+        try:
+            records = [self.variables(request) for request in requests]
+        except ValueError as e:
+            return (400, exception('InvalidRequestException', str(e)))
+        responses = []
+        for (status, newData) in dmnRules.decideMany(records):
+            try:
+                responses.append(self.results(dmnRules, table, status, newData))
+            except ValueError as e:
+                responses.append(exception('InvalidRequestException', str(e)))
+        return (200, responses)
+
+
+    async def route(self, method, target, body):
+        '''
+        Handle one request - returns (HTTP status code, JSON response)
+        '''
+        path = urllib.parse.urlsplit(target).path.rstrip('/')
+        if not path.startswith(self.basePath + '/'):
+            return (404, exception('RestException', 'Not found: {!s}'.format(path)))
+        parts = path[len(self.basePath) + 1:].split('/')
+        if parts == ['decision-definition']:
+            if method != 'GET':
+                return (405, exception('RestException', 'Method not allowed'))
+            return (200, await asyncio.get_running_loop().run_in_executor(None, self.definitions))
+        if (len(parts) != 4) or (parts[:2] != ['decision-definition', 'key']) or (parts[3] not in ['evaluate', 'evaluate-batch']):
+            return (404, exception('RestException', 'Not found: {!s}'.format(path)))
+        if method != 'POST':
+            return (405, exception('RestException', 'Method not allowed'))
+        key = urllib.parse.unquote(parts[2])
+        try:
+            request = json.loads(body) if len(body) > 0 else {}
+        except ValueError:
+            return (400, exception('InvalidRequestException', 'The request body is not valid JSON'))
+        # Decisions run in a thread, as changed rulesBooks are reloaded first, so other requests are still answered
+        if parts[3] == 'evaluate':
+            return await asyncio.get_running_loop().run_in_executor(None, self.evaluate, key, request)
+        return await asyncio.get_running_loop().run_in_executor(None, self.evaluateBatch, key, request)
+
+
+    async def handle(self, reader, writer):
+        '''
+        Serve the requests of one (keep-alive) HTTP/1.1 connection
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+                if len(line) == 0:
+                    break
+                try:
+                    (method, target, version) = line.decode('latin-1').split()
+                except ValueError:
+                    self.respond(writer, 400, exception('RestException', 'Bad request line'), False)
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in [b'\r\n', b'\n', b'']:
+                        break
+                    (name, colon, value) = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keepAlive = (version == 'HTTP/1.1') and (headers.get('connection', '').lower() != 'close')
+                length = int(headers.get('content-length', '0'))
+                if length > maxBody:
+                    self.respond(writer, 413, exception('RestException', 'Request body too large'), False)
+                    break
+                body = await reader.readexactly(length) if length > 0 else b''
+                try:
+                    (code, response) = await self.route(method, target, body)
+                except Exception as e:
+                    (code, response) = (500, exception('RestException', str(e)))
+                self.respond(writer, code, response, keepAlive)
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+    def respond(self, writer, code, response, keepAlive):
+        body = json.dumps(response, default=str).encode('utf-8')
+        head = 'HTTP/1.1 {!s} {!s}\r\nContent-Type: application/json\r\nContent-Length: {!s}\r\nConnection: {!s}\r\n\r\n'.format(
+            code, reasons.get(code, ''), len(body), 'keep-alive' if keepAlive else 'close')
+        writer.write(head.encode('latin-1') + body)
+
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        '''
+        Serve requests until cancelled
+        '''
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    '''
+    Run a decision service - see python -m pyDMNrules.service --help
+    '''
+    parser = argparse.ArgumentParser(prog='python -m pyDMNrules.service',
+        description='Serve rulesBooks through a Camunda compatible decision evaluation REST API')
+    parser.add_argument('rulesBooks', nargs='+', help="the Excel workbooks and DMN XML files ('.dmn', '.xml') to serve")
+    parser.add_argument('--host', default='127.0.0.1', help='the address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='the port to listen on (default 8080)')
+    parser.add_argument('--base-path', default='/engine-rest', help='the path of the REST API (default /engine-rest)')
+    args = parser.parse_args(argv)
+
+    service = DecisionService(args.rulesBooks, args.base_path)
+    errors = service.load()
+    for error in errors:
+        print(error, file=sys.stderr)
+    # Decision key collisions are warnings - the first binding is served
+    if len(errors) > len(service.collisions):
+        return 1
+    print('Serving {!s} on http://{!s}:{!s}{!s}/'.format(', '.join(service.keys), args.host, args.port, service.basePath), file=sys.stderr)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
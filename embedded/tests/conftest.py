@@ -0,0 +1,88 @@
+# -----------------------------------------------------------------------------
+# conftest.py
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+import pytest
+
+embedded = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, embedded)
+
+orderReview = os.path.join(embedded, 'tables', 'OrderReview.xlsx')
+orderReviewDMN = os.path.join(os.path.dirname(embedded), 'external', 'order-review-camunda.dmn')
+
+
+def writeRulesBook(path, glossary, decisions, tables):
+    '''
+    Write a small rulesBook workbook
+        glossary - [(variable, concept, attribute), ...] (a concept of None continues the concept above it)
+        decisions - [(decision, table), ...]
+        tables - [(name, hitPolicy, inputs, outputs, rows), ...] where each row is the list of input tests then output values
+            (name, hitPolicy, inputs, outputs, rows, validity) also writes a validity row (the ordered lists of valid values) above the rules
+    '''
+    from openpyxl import Workbook
+    from openpyxl.styles import Border, Side
+    thin = Side(style='thin')
+    double = Side(style='double')
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Glossary'
+    ws['B2'] = 'Glossary'
+    ws['B3'] = 'Variable'
+    ws['C3'] = 'Business Concept'
+    ws['D3'] = 'Attribute'
+    for (row, (variable, concept, attribute)) in enumerate(glossary):
+        ws.cell(4 + row, 2).value = variable
+        ws.cell(4 + row, 3).value = concept
+        ws.cell(4 + row, 4).value = attribute
+    for row in range(2, 4 + len(glossary)):
+        for col in range(2, 5):
+            ws.cell(row, col).border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    ws.merge_cells('B2:D2')
+    ws = wb.create_sheet('Decision')
+    ws['B2'] = 'Decision'
+    ws['B3'] = 'Decisions'
+    ws['C3'] = 'Execute Decision Tables'
+    for (row, (decision, table)) in enumerate(decisions):
+        ws.cell(4 + row, 2).value = decision
+        ws.cell(4 + row, 3).value = table
+    for row in range(2, 4 + len(decisions)):
+        for col in range(2, 4):
+            ws.cell(row, col).border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    ws.merge_cells('B2:C2')
+    for table in tables:
+        (name, hitPolicy, inputs, outputs, rows) = table[:5]
+        headingRows = 1
+        if len(table) > 5:
+            rows = [table[5]] + rows
+            headingRows = 2
+        ws = wb.create_sheet(name)
+        ws['B2'] = name
+        cols = len(inputs) + len(outputs)
+        ws.merge_cells(start_row=2, start_column=2, end_row=2, end_column=2 + cols)
+        ws['B3'] = hitPolicy
+        for (col, heading) in enumerate(inputs + outputs):
+            ws.cell(3, 3 + col).value = heading
+        for (row, cells) in enumerate(rows):
+            if row >= headingRows - 1:
+                ws.cell(4 + row, 2).value = row + 2 - headingRows
+            for (col, value) in enumerate(cells):
+                ws.cell(4 + row, 3 + col).value = value
+        lastInput = 2 + len(inputs)
+        for row in range(3, 4 + len(rows)):
+            for col in range(2, 3 + cols):
+                ws.cell(row, col).border = Border(left=double if col == lastInput + 1 else thin,
+                                                  right=double if col in (lastInput, 2 + cols) else thin,
+                                                  top=thin, bottom=double if row == 2 + headingRows else thin)
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def orderRules():
+    from pyDMNrules import DMN
+    dmnRules = DMN()
+    status = dmnRules.load(orderReview)
+    assert 'errors' not in status
+    return dmnRules
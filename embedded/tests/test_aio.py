@@ -0,0 +1,62 @@
+# -----------------------------------------------------------------------------
+# test_aio.py - asyncio decisions against decide() and decideMany()
+# -----------------------------------------------------------------------------
+
+import asyncio
+import itertools
+import pytest
+from conftest import orderReview
+from pyDMNrules.aio import gatherLimited, loadAsync
+from pyDMNrules.cache import RulesBookCache
+
+records = [{'category': category, 'value': value}
+           for (category, value) in itertools.product(['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None], [0, 1000, 5000, 20000, 30000, None])]
+
+
+@pytest.fixture
+def dmnRules():
+    (status, dmnRules) = asyncio.run(loadAsync(orderReview, RulesBookCache()))
+    assert status == {}
+    return dmnRules
+
+
+def test_decideAsync_matches_decide(dmnRules):
+    async def decideAll():
+        return await asyncio.gather(*[dmnRules.decideAsync(data) for data in records])
+    assert asyncio.run(decideAll()) == [dmnRules.decide(data) for data in records]
+    outputs = ['responsibleParty']
+    assert asyncio.run(dmnRules.decideAsync(records[0], outputs)) == dmnRules.decide(records[0], outputs)
+
+
+@pytest.mark.parametrize('chunkSize', [1, 7, 100])
+def test_decideManyAsync_matches_decideMany(dmnRules, chunkSize):
+    assert asyncio.run(dmnRules.decideManyAsync(records, chunkSize=chunkSize)) == dmnRules.decideMany(records)
+    assert asyncio.run(dmnRules.decideManyAsync(iter(records), ['Unknown'], chunkSize)) == dmnRules.decideMany(records, ['Unknown'])
+
+
+def test_decideManyAsync_without_a_rulesBook():
+    from pyDMNrules import DMN
+    results = asyncio.run(DMN().decideManyAsync(records, chunkSize=7))
+    assert len(results) == len(records)
+    assert all(['errors' in status for (status, newData) in results])
+
+
+def test_gatherLimited_limits_the_running_awaitables():
+    running = []
+    peak = []
+
+    async def task(i):
+        running.append(i)
+        peak.append(len(running))
+        await asyncio.sleep(0.001)
+        running.remove(i)
+        if i == 3:
+            raise ValueError(i)
+        return i
+
+    results = asyncio.run(gatherLimited([task(i) for i in range(20)], 4, return_exceptions=True))
+    assert [result for (i, result) in enumerate(results) if i != 3] == [i for i in range(20) if i != 3]
+    assert isinstance(results[3], ValueError)
+    assert max(peak) == 4
+    with pytest.raises(ValueError):
+        asyncio.run(gatherLimited([task(i) for i in range(5)], 2))
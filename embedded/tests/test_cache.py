@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+# test_cache.py - the rulesBook cache
+# -----------------------------------------------------------------------------
+
+import os
+from conftest import orderReview, orderReviewDMN, writeRulesBook
+from pyDMNrules.cache import RulesBookCache
+
+glossary = [('a', 'App', 'a'), ('x', None, 'x')]
+
+
+def writeRules(path, output):
+    return writeRulesBook(path, glossary, [('decide', 'T')], [('T', 'U', ['a'], ['x'], [['p', output]])])
+
+
+def touch(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1000000000))
+
+
+def test_cached_rulesBooks_make_the_same_decisions():
+    from pyDMNrules import DMN
+    cache = RulesBookCache()
+    (status, dmnRules) = cache.load(orderReview)
+    assert status == {}
+    assert cache.load(orderReview)[1] is dmnRules
+    assert cache.stats() == {'size': 1, 'maxSize': 16, 'hits': 1, 'misses': 1}
+    loaded = DMN()
+    loaded.load(orderReview)
+    for data in [{'category': 'Spare_Parts', 'value': 1500}, {'category': 'New_Car', 'value': 30000}]:
+        assert dmnRules.decide(data) == loaded.decide(data)
+    (status, xmlRules) = cache.load(orderReviewDMN)
+    assert 'Decision_0tgwupa' in xmlRules.decisionTables
+
+
+def test_changed_rulesBooks_are_reloaded(tmp_path):
+    path = writeRules(str(tmp_path / 'rules.xlsx'), '"first"')
+    cache = RulesBookCache()
+    (status, first) = cache.load(path)
+    assert first.decide({'a': 'p'})[1]['Result']['x'] == 'first'
+    # Same size, later modification time
+    touch(path, 10)
+    (status, second) = cache.load(path)
+    assert second is not first
+    assert cache.load(path)[1] is second
+    # Same modification time, different size
+    stat = os.stat(path)
+    writeRules(path, '"a much longer output value"')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    (status, third) = cache.load(path)
+    assert third is not second
+    assert third.decide({'a': 'p'})[1]['Result']['x'] == 'a much longer output value'
+    assert cache.load(path)[1] is third
+
+
+def test_least_recently_used_rulesBooks_are_discarded(tmp_path):
+    paths = [writeRules(str(tmp_path / 'rules{!s}.xlsx'.format(i)), '"x{!s}"'.format(i)) for i in range(3)]
+    cache = RulesBookCache(maxSize=2)
+    loaded = [cache.load(path)[1] for path in paths[:2]]
+    cache.load(paths[0])
+    cache.load(paths[2])
+    assert cache.stats()['size'] == 2
+    assert cache.load(paths[0])[1] is loaded[0]
+    assert cache.load(paths[1])[1] is not loaded[1]
+    cache.resize(1)
+    assert cache.stats()['size'] == 1
+
+
+def test_unreadable_rulesBooks_are_not_cached(tmp_path):
+    cache = RulesBookCache()
+    (status, dmnRules) = cache.load(str(tmp_path / 'missing.xlsx'))
+    assert 'errors' in status
+    assert dmnRules is None
+    assert cache.stats()['size'] == 0
@@ -0,0 +1,41 @@
+# -----------------------------------------------------------------------------
+# test_cli.py - python -m pyDMNrules
+# -----------------------------------------------------------------------------
+
+import json
+from conftest import orderReview
+from pyDMNrules.cli import main
+
+
+def test_records_are_decided(tmp_path):
+    records = tmp_path / 'orders.jsonl'
+    records.write_text('{"category": "Spare_Parts", "value": 1500}\n{"category": "New_Car", "value": 1000}\n')
+    results = tmp_path / 'decisions.jsonl'
+    assert main([orderReview, str(records), '-o', str(results), '-q']) == 0
+    lines = [json.loads(line) for line in results.read_text().splitlines()]
+    assert lines[0]['Result']['responsibleParty'] == ['Sales', 'Mechanical Engineering Experts']
+    assert len(lines) == 2
+
+
+def test_unreadable_files_are_reported(tmp_path, capsys):
+    assert main([orderReview, str(tmp_path / 'missing.jsonl'), '-q']) == 1
+    assert 'missing.jsonl' in capsys.readouterr().err
+    records = tmp_path / 'orders.jsonl'
+    records.write_text('{"category": "New_Car", "value": 1000}\n')
+    assert main([orderReview, str(records), '-o', str(tmp_path / 'no' / 'such' / 'dir.jsonl'), '-q']) == 1
+    assert 'dir.jsonl' in capsys.readouterr().err
+
+
+def test_unreadable_records_are_reported(tmp_path):
+    records = tmp_path / 'orders.jsonl'
+    records.write_text('{"category": "New_Car", "value": 1000}\nnot json\n[1, 2]\n{"category": "Spare_Parts", "value": 1500}\n"text"\n')
+    for workers in ['1', '2']:
+        results = tmp_path / 'decisions.jsonl'
+        assert main([orderReview, str(records), '-o', str(results), '-q', '--ignore-unknown', '-w', workers, '--chunk-size', '1']) == 0
+        lines = [json.loads(line) for line in results.read_text().splitlines()]
+        assert len(lines) == 5
+        assert lines[0]['Result']['responsibleParty'] == ['Sales']
+        assert lines[1]['errors'][0].startswith('Line 2: not valid JSON')
+        assert lines[2]['errors'] == ['Line 3: not a JSON object']
+        assert lines[3]['Result']['responsibleParty'] == ['Sales', 'Mechanical Engineering Experts']
+        assert lines[4]['errors'] == ['Line 5: not a JSON object']
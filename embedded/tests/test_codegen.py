@@ -0,0 +1,139 @@
+# -----------------------------------------------------------------------------
+# test_codegen.py - generatePython() against decide()
+# -----------------------------------------------------------------------------
+
+import itertools
+import pytest
+from conftest import orderReview, writeRulesBook
+from pyDMNrules.codegen import importGenerated
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('x', None, 'x'), ('y', None, 'y'), ('n', None, 'n')]
+tables = [
+    ('U', 'U', ['a', 'b'], ['x'], [['p', '< 5', '"r1"'], ['q', '[1..10]', '"r2"'], ['-', '>= 10', '"r3"']]),
+    ('F', 'F', ['a', 'b'], ['x'], [['-', 'q', '"r1"'], ['p', '-', '"r2"'], ['z', '> 2', '"r3"']]),
+    ('C', 'C', ['a', 'b'], ['y'], [['p', '-', '"c1"'], ['-', '< 5', '"c2"'], ['q', '-', '"c3"'], ['-', '[1..10]', '"c4"']]),
+    ('C+', 'C+', ['a', 'b'], ['n'], [['-', '< 5', '1'], ['p', '-', '2'], ['-', 'p', '4']]),
+]
+aValues = ['p', 'q', 'z', 'b', None]
+bValues = [3, 7, 10, 12, None, 'p', 'q']
+
+
+def generated(dmnRules, path):
+    (status, source) = dmnRules.generatePython(path)
+    assert 'errors' not in status
+    return (source, importGenerated(path))
+
+
+def test_order_review(tmp_path, orderRules):
+    (source, module) = generated(orderRules, str(tmp_path / 'order_review.py'))
+    for category in ['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None]:
+        for value in [0, 1000, 1999.99, 2000, 5000, 20000, 25000, 30000, None]:
+            data = {'category': category, 'value': value}
+            assert module.decide(data) == orderRules.decide(data), data
+    assert 'import pySFeel' not in source
+    assert 'import openpyxl' not in source
+
+
+@pytest.mark.parametrize('name', [table[0] for table in tables])
+def test_generated_matches_decide(tmp_path, name):
+    from pyDMNrules import DMN
+    table = [table for table in tables if table[0] == name][0]
+    path = writeRulesBook(str(tmp_path / 'rules.xlsx'), glossary, [('decide', name)], [table])
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    (source, module) = generated(dmnRules, str(tmp_path / 'rules.py'))
+    for (a, b) in itertools.product(aValues, bValues):
+        data = {'a': a, 'b': b}
+        if a == 'b':
+            # Only the S-FEEL parser can bind a Glossary Variable's name
+            assert 'errors' in module.decide(data)[0]
+            continue
+        assert module.decide(data) == dmnRules.decide(data), data
+
+
+def writeTests(path, orders):
+    '''
+    Write OrderReview with a Test sheet, with one test for each (category, value)
+    '''
+    from openpyxl import load_workbook
+    from openpyxl.styles import Border, Side
+    wb = load_workbook(orderReview)
+    ws = wb.create_sheet('Test')
+    ws['B2'] = 'Order'
+    ws['B3'] = 'category'
+    ws['C3'] = 'value'
+    ws['B4'] = 'New_Car'
+    ws['C4'] = 1000
+    ws['F2'] = 'DMNrulesTests'
+    ws['F3'] = 'Order'
+    ws['G3'] = 'responsibleParty'
+    ws['F3'].border = Border(right=Side(style='double'))
+    for (row, (category, value)) in enumerate(orders):
+        ws.cell(4 + row, 2).value = category
+        ws.cell(4 + row, 3).value = value
+        ws.cell(4 + row, 6).value = row + 1
+        ws.cell(4 + row, 7).value = 'null'
+    wb.save(path)
+    return path
+
+
+def test_checkGenerated(tmp_path):
+    from pyDMNrules import DMN
+    path = writeTests(str(tmp_path / 'OrderReviewTest.xlsx'), [('New_Car', 1000), ('Spare_Parts', 1500), ('Spare_Parts', 20000), ('Other', 10)])
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    modulePath = str(tmp_path / 'order_review.py')
+    generated(dmnRules, modulePath)
+    assert dmnRules.checkGenerated(modulePath) == ({}, [])
+    # test() has merged the Test sheet's cells, so its tests can't be run again
+    (status, mismatches) = dmnRules.checkGenerated(modulePath)
+    assert 'errors' in status
+    assert mismatches == []
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    module = importGenerated(modulePath)
+    module.decide = lambda data, outputs=None: ({}, {'Result': {}})
+    (status, mismatches) = dmnRules.checkGenerated(module)
+    assert status == {}
+    assert len(mismatches) == 4
+
+
+def test_checkGenerated_without_tests(tmp_path, orderRules):
+    from pyDMNrules import DMN
+    modulePath = str(tmp_path / 'order_review.py')
+    generated(orderRules, modulePath)
+    (status, mismatches) = orderRules.checkGenerated(modulePath)
+    assert 'errors' in status
+    assert mismatches == []
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(writeTests(str(tmp_path / 'NoTests.xlsx'), []))
+    (status, mismatches) = dmnRules.checkGenerated(modulePath)
+    assert status == {'errors': ['No unit tests were run through the generated module']}
+    assert mismatches == []
+
+
+@pytest.mark.parametrize('cell', ['p', '5', '< 5', '>= 5', '!= p', 'p, q', 'in(p, q)', '[2..8]', '[2..8)', '[b..8]'])
+def test_supported_tests_are_generated(tmp_path, cell):
+    from pyDMNrules import DMN
+    path = writeRulesBook(str(tmp_path / 'rules.xlsx'), glossary, [('decide', 'T')],
+                          [('T', 'F', ['a', 'b'], ['x'], [[cell, '-', '"hit"'], ['-', '-', '"miss"']])])
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    (source, module) = generated(dmnRules, str(tmp_path / 'rules.py'))
+    for (a, b) in itertools.product(['p', 'q', 'r', 1, 2, 5, 8, 9, None], [3, 7]):
+        data = {'a': a, 'b': b}
+        assert module.decide(data) == dmnRules.decide(data), data
+
+
+@pytest.mark.parametrize('cell', ['(2..8]', ']2..8]', '[2..8[', 'not(5)', 'not(p, q)', 'in(< 2, > 8)', '"p"'])
+def test_tests_that_need_the_SFEEL_parser_are_reported(tmp_path, cell):
+    from pyDMNrules import DMN
+    path = writeRulesBook(str(tmp_path / 'rules.xlsx'), glossary, [('decide', 'T')],
+                          [('T', 'F', ['a'], ['x'], [[cell, '"hit"'], ['-', '"miss"']])])
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    (status, source) = dmnRules.generatePython(str(tmp_path / 'rules.py'))
+    assert source is None
+    assert len(status['errors']) == 1
+    assert "in table 'T' needs the S-FEEL parser" in status['errors'][0]
+    assert not (tmp_path / 'rules.py').exists()
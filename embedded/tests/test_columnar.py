@@ -0,0 +1,95 @@
+# -----------------------------------------------------------------------------
+# test_columnar.py - decideColumns() against decide()
+# -----------------------------------------------------------------------------
+
+import itertools
+import pytest
+from conftest import writeRulesBook
+
+numpy = pytest.importorskip('numpy')
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('x', None, 'x'), ('y', None, 'y'), ('n', None, 'n')]
+tables = {
+    'U': ('U', ['a', 'b'], ['x'], [['p', '< 5', '"r1"'], ['b', '-', '"r2"'], ['q', '[1..10]', '"r3"'], ['-', 'p', '"r4"']]),
+    'F': ('F', ['a', 'b'], ['x'], [['-', 'q', '"r1"'], ['p', '-', '"r2"'], ['b', '> 2', '"r3"']]),
+    'C': ('C', ['a', 'b'], ['y'], [['p', '-', '"c1"'], ['-', '< 5', '"c2"'], ['b', '-', '"c3"'], ['q', '-', '"c4"'], ['-', 'p', '"c5"']]),
+    'R': ('R', ['a', 'b'], ['y'], [['-', '-', '"c0"'], ['p', '-', '"c1"'], ['-', '[1..10]', '"c2"']]),
+    'C+': ('C+', ['a', 'b'], ['n'], [['-', '< 5', '1'], ['p', '-', '2'], ['-', 'p', '4'], ['b', '-', '8']]),
+    'C#': ('C#', ['a', 'b'], ['n'], [['-', '< 5', '1'], ['p', '-', '1'], ['-', 'p', '1']]),
+    'C<': ('C<', ['a', 'b'], ['n'], [['-', '< 5', '3'], ['p', '-', '2'], ['-', 'p', '5']]),
+}
+# 'b' is a Glossary Variable, so decide() binds it through the S-FEEL parser
+aValues = ['p', 'q', 'b', 'z', None]
+bValues = [3, 7, 12, None, 'p', 'q', 'b']
+
+
+@pytest.mark.parametrize('name', list(tables))
+def test_decideColumns_matches_decide(tmp_path, name):
+    from pyDMNrules import DMN
+    (hitPolicy, inputs, outputs, rows) = tables[name]
+    path = writeRulesBook(str(tmp_path / 'columns.xlsx'), glossary, [('decide', 'T')], [('T', hitPolicy, inputs, outputs, rows)])
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    records = [{'a': a, 'b': b} for (a, b) in itertools.product(aValues, bValues)]
+    columns = {'a': [record['a'] for record in records], 'b': [record['b'] for record in records]}
+    (status, results) = dmnRules.decideColumns(columns, 'T')
+    for (i, record) in enumerate(records):
+        (status, newData) = dmnRules.decide(record)
+        if len(newData) == 0:
+            assert not results['Matched'][i], record
+            for variable in outputs:
+                assert results['Result'][variable][i] is None, record
+            continue
+        assert results['Matched'][i], record
+        for variable in outputs:
+            assert results['Result'][variable][i] == newData['Result'][variable], record
+        assert results['Executed Rule'][i] == newData.get('Executed Rule'), record
+
+
+def test_unmatched_collect_outputs_are_None(tmp_path):
+    from pyDMNrules import DMN
+    path = writeRulesBook(str(tmp_path / 'collect.xlsx'), glossary, [('decide', 'T')], [('T', 'C', ['a'], ['y'], [['p', '"c1"'], ['p', '"c2"']])])
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.load(path)
+    (status, results) = dmnRules.decideColumns({'a': ['p', 'q']}, 'T')
+    assert results['Result']['y'][0] == ['c2']
+    assert results['Result']['y'][1] is None
+    assert 'errors' in status
+
+
+# DMN XML rules can leave outputs empty - the first rule has no outputs at all
+partialOutputs = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="https://www.omg.org/spec/DMN/20191111/MODEL/" id="d" name="D" namespace="x">
+  <decision id="T" name="T">
+    <decisionTable id="t" hitPolicy="{!s}">
+      <input id="i1"><inputExpression><text>a</text></inputExpression></input>
+      <input id="i2"><inputExpression><text>b</text></inputExpression></input>
+      <output id="o1" name="x"/>
+      <output id="o2" name="y"/>
+      <rule id="r1"><inputEntry><text>"p"</text></inputEntry><inputEntry><text>&lt; 5</text></inputEntry><outputEntry><text></text></outputEntry><outputEntry><text></text></outputEntry></rule>
+      <rule id="r2"><inputEntry><text>"q"</text></inputEntry><inputEntry><text>-</text></inputEntry><outputEntry><text>"x2"</text></outputEntry><outputEntry><text></text></outputEntry></rule>
+      <rule id="r3"><inputEntry><text>-</text></inputEntry><inputEntry><text>[1..10]</text></inputEntry><outputEntry><text></text></outputEntry><outputEntry><text>"y3"</text></outputEntry></rule>
+      <rule id="r4"><inputEntry><text>"q"</text></inputEntry><inputEntry><text>&lt; 5</text></inputEntry><outputEntry><text>"x4"</text></outputEntry><outputEntry><text>"y4"</text></outputEntry></rule>
+    </decisionTable>
+  </decision>
+</definitions>
+"""
+
+
+@pytest.mark.parametrize('hitPolicy', ['FIRST', 'COLLECT'])
+def test_rules_without_every_output(tmp_path, hitPolicy):
+    from pyDMNrules import DMN
+    path = tmp_path / 'partial.dmn'
+    path.write_text(partialOutputs.format(hitPolicy))
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.loadXML(str(path))
+    records = [{'a': a, 'b': b} for (a, b) in itertools.product(['p', 'q', 'z', None], [3, 7, 12, None])]
+    columns = {'a': [record['a'] for record in records], 'b': [record['b'] for record in records]}
+    (status, results) = dmnRules.decideColumns(columns, 'T')
+    assert list(results['Result']) == ['x', 'y']
+    for (i, record) in enumerate(records):
+        (status, newData) = dmnRules.decide(record)
+        assert results['Matched'][i] == (len(newData) > 0), record
+        if len(newData) > 0:
+            for variable in ['x', 'y']:
+                assert results['Result'][variable][i] == newData['Result'][variable], record
@@ -0,0 +1,86 @@
+# -----------------------------------------------------------------------------
+# test_compiled.py - compiled tests against the S-FEEL parser
+# -----------------------------------------------------------------------------
+
+import itertools
+import pytest
+from pyDMNrules.DMNrules import DecisionContext, sfeelParse, sfeelCompare, sfeelInRange, sfeelIn
+
+tests = ['Order.value < 25000', 'Order.value <= 5', 'Order.value > -5', 'Order.value >= 2020-01-01',
+         'Order.value = "abc"', 'Order.value != null', 'Order.value = null', 'Order.value = true', 'Order.value = [1,2]',
+         'Order.value in [1 .. 10]', 'Order.value in (1 .. 10]', 'Order.value in ]1 .. 10[', 'Order.value in [1 .. 10[',
+         'Order.value in ["a" .. "m"]', 'Order.value in("a","b")', 'Order.value in(1,2,3)', 'Order.value in(< 5)',
+         'Order.value in(>= 5, 10)', 'Order.value in(!= 5)', 'Order.value = Order.category', 'Order.value < Order.category',
+         'Order.value in [Order.category .. 10]', 'Order.value in(Order.category, 3)', 'Order.value not < 5', 'not(Order.value)']
+values = [None, 1.0, 5.0, 10.0, 11.0, 0.5, -5.0, 'a', 'b', 'm', 'z', '', 'abc', True, False, [1.0], [5.0], [1.0, 2.0], ['abc']]
+others = [None, 3.0, 'a', True]
+
+
+@pytest.mark.parametrize('test', tests)
+def test_compiled_predicate_matches_sfeel(orderRules, test):
+    spec = orderRules.compileTest(test)
+    predicate = orderRules.makePredicate(spec)
+    for (value, other) in itertools.product(values, others):
+        names = dict.fromkeys(orderRules.glossaryItems)
+        names['Order.value'] = value
+        names['Order.category'] = other
+        (status, expected) = sfeelParse(dict(names), test)
+        got = predicate(DecisionContext(names))
+        assert bool(got) == bool(expected), (test, spec, value, other)
+
+
+def test_simple_tests_are_compiled(orderRules):
+    kinds = [orderRules.compileTest(test)[0] for test in tests]
+    assert kinds.count('sfeel') < len(tests) // 4
+
+
+def test_sfeelCompare_edge_cases():
+    assert sfeelCompare('=', None, None)
+    assert sfeelCompare('<', None, 1.0) is None
+    assert sfeelCompare('<', 'a', 1.0) is None
+    assert sfeelCompare('<', True, 2.0)
+    assert not sfeelCompare('=', True, 'true')
+    assert sfeelCompare('=', [1.0], 1.0)
+    assert sfeelCompare('!=', 'a', 1.0)
+
+
+def test_sfeelInRange_edge_cases():
+    assert sfeelInRange(1.0, '[', 1.0, 10.0, ']')
+    assert not sfeelInRange(1.0, '(', 1.0, 10.0, ']')
+    assert not sfeelInRange(10.0, '[', 1.0, 10.0, ')')
+    assert not sfeelInRange(None, '[', 1.0, 10.0, ']')
+    assert not sfeelInRange(True, '[', 0.0, 10.0, ']')
+    assert not sfeelInRange('b', '[', 1.0, 10.0, ']')
+    assert sfeelInRange('b', '[', 'a', 'c', ']')
+    assert sfeelInRange(float('nan'), '[', 1.0, 10.0, ']')
+
+
+def test_sfeelIn_edge_cases():
+    assert sfeelIn(None, [('=', None)])
+    assert not sfeelIn(None, [('<', 5.0)])
+    assert sfeelIn(True, [('=', 1.0)])
+    assert not sfeelIn('a', [('<', 5.0), ('=', 'a')])
+    assert sfeelIn('a', [('=', 'a'), ('<', 5.0)])
+
+
+def test_native_binding_matches_sfeel(orderRules):
+    for value in [0, 1999, 2000.5, -3, None, True, False, 'x', 'New_Car', [1, 2], ['a', 'b']]:
+        (isNative, nativeValue) = orderRules.value2native(value)
+        assert isNative
+        names = dict.fromkeys(orderRules.glossaryItems)
+        sfeelParse(names, 'Order.value <- {!s}'.format(orderRules.value2sfeel(value)))
+        assert nativeValue == names['Order.value']
+        assert type(nativeValue) is type(names['Order.value'])
+
+
+def test_glossary_names_and_quotes_are_bound_by_sfeel(orderRules):
+    assert orderRules.value2native('category') == (False, None)
+    assert orderRules.value2native('say "hi"') == (False, None)
+
+
+def test_dictionaries_are_bound_by_sfeel(orderRules):
+    assert orderRules.value2native({'a': 1}) == (False, None)
+    assert orderRules.value2native([{'a': 1}]) == (False, None)
+    (status, newData) = orderRules.decide({'value': {'a': 1}})
+    assert 'errors' in status
+    assert newData['Result']['value'] is None
@@ -0,0 +1,114 @@
+# -----------------------------------------------------------------------------
+# test_crosstab.py - crosstab lookups against testing every cell
+# -----------------------------------------------------------------------------
+
+import random
+import pytest
+
+names = ['h1', 'h2', 'v1', 'v2', 'out']
+
+
+def strTest(generator):
+    kind = generator.random()
+    if kind < 0.15:
+        return '-'
+    if kind < 0.25:
+        return 'k{!s}, k{!s}'.format(generator.randint(0, 8), generator.randint(0, 8))
+    return 'k{!s}'.format(generator.randint(0, 8))
+
+
+def numTest(generator):
+    low = generator.randrange(0, 100, 10)
+    if generator.random() < 0.15:
+        return '-'
+    return generator.choice(['< {!s}'.format(low), '>= {!s}'.format(low), '[{!s}..{!s}]'.format(low, low + 20), str(low)])
+
+
+def writeCrosstab(path, seed, rows, cols):
+    '''
+    Write a rulesBook with one crosstab table - 'out' for the horizontal inputs h1, h2 and the vertical inputs v2, v1
+    '''
+    from openpyxl import Workbook
+    from openpyxl.styles import Border, Side
+    generator = random.Random(seed)
+    thin = Side(style='thin')
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Glossary'
+    ws['B2'] = 'Glossary'
+    ws['B3'] = 'Variable'
+    ws['C3'] = 'Business Concept'
+    ws['D3'] = 'Attribute'
+    for (row, name) in enumerate(names):
+        ws.cell(4 + row, 2).value = name
+        ws.cell(4 + row, 3).value = 'App' if row == 0 else None
+        ws.cell(4 + row, 4).value = name
+    for row in range(2, 4 + len(names)):
+        for col in range(2, 5):
+            ws.cell(row, col).border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    ws.merge_cells('B2:D2')
+    ws = wb.create_sheet('Decision')
+    ws['B2'] = 'Decision'
+    ws['B3'] = 'Decisions'
+    ws['C3'] = 'Execute Decision Tables'
+    ws['B4'] = 'cross'
+    ws['C4'] = 'X'
+    ws.merge_cells('B2:C2')
+    for row in range(2, 5):
+        for col in range(2, 4):
+            ws.cell(row, col).border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    ws = wb.create_sheet('X')
+    ws['B2'] = 'X'
+    ws['B3'] = 'out'
+    ws.merge_cells('B3:D5')
+    ws['E3'] = 'h1,h2'
+    if cols > 1:
+        ws.merge_cells(start_row=3, start_column=5, end_row=3, end_column=4 + cols)
+    for col in range(cols):
+        ws.cell(4, 5 + col).value = strTest(generator)
+        ws.cell(5, 5 + col).value = numTest(generator)
+    ws['B6'] = 'v2,v1'
+    if rows > 1:
+        ws.merge_cells(start_row=6, start_column=2, end_row=5 + rows, end_column=2)
+    for row in range(rows):
+        ws.cell(6 + row, 3).value = numTest(generator)
+        ws.cell(6 + row, 4).value = strTest(generator)
+        for col in range(cols):
+            ws.cell(6 + row, 5 + col).value = row * cols + col
+    ws.merge_cells(start_row=2, start_column=2, end_row=2, end_column=4 + cols)
+    wb.save(path)
+    return path
+
+
+def randomRecords(seed, count):
+    generator = random.Random(seed)
+    keys = ['k{!s}'.format(key) for key in range(10)] + [None]
+    numbers = [0, 5, 10, 20, 35.5, 50, 90, 120, None, 'x']
+    return [{'h1': generator.choice(keys), 'h2': generator.choice(numbers), 'v1': generator.choice(keys), 'v2': generator.choice(numbers)}
+            for record in range(count)]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_crosstab_lookup_matches_every_cell(tmp_path, seed):
+    from pyDMNrules import DMN
+    path = writeCrosstab(str(tmp_path / 'crosstab.xlsx'), seed, 12, 10)
+    crosstab = DMN()
+    assert crosstab.load(path) == {}
+    assert 'crosstab' in crosstab.decisionTables['X']
+    # Without the lookup, decide() tests every cell of the table, in rule order
+    cells = DMN()
+    cells.load(path)
+    cells.decisionTables['X'].pop('crosstab')
+    cells.decisionTables['X']['ruleIndex'] = []
+    cells.decisionTables['X']['rangeIndex'] = []
+    compiled = DMN()
+    compiled.restoreCompiled(crosstab.compiledRulesBook())
+    assert 'crosstab' in compiled.decisionTables['X']
+    matched = 0
+    for record in randomRecords(seed, 400):
+        expected = cells.decide(record)
+        assert crosstab.decide(record) == expected, record
+        assert compiled.decide(record) == expected, record
+        if 'errors' not in expected[0]:
+            matched += 1
+    assert matched > 0
@@ -0,0 +1,42 @@
+# -----------------------------------------------------------------------------
+# test_decideMany.py - decideMany() against decide()
+# -----------------------------------------------------------------------------
+
+import itertools
+import pytest
+
+categories = ['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None]
+values = [0, 1000, 1999.99, 2000, 5000, 20000, 25000, 30000, None]
+records = [{'category': category, 'value': value} for (category, value) in itertools.product(categories, values)]
+
+
+def test_decideMany_matches_decide(orderRules):
+    results = orderRules.decideMany(iter(records))
+    assert len(results) == len(records)
+    for (record, result) in zip(records, results):
+        assert result == orderRules.decide(record), record
+
+
+def test_decideMany_outputs(orderRules):
+    results = orderRules.decideMany(records, outputs=['responsibleParty'])
+    for (record, (status, newData)) in zip(records, results):
+        assert (status, newData) == orderRules.decide(record, outputs=['responsibleParty']), record
+        assert list(newData['Result']) == ['responsibleParty']
+
+
+def test_decideMany_DataFrame(orderRules):
+    pandas = pytest.importorskip('pandas')
+    frame = pandas.DataFrame({'category': ['Spare_Parts', 'New_Car', None], 'value': [1500, float('nan'), 20000]})
+    results = orderRules.decideMany(frame)
+    expected = [{'category': 'Spare_Parts', 'value': 1500}, {'category': 'New_Car', 'value': None}, {'category': None, 'value': 20000}]
+    assert results == [orderRules.decide(record) for record in expected]
+
+
+def test_decideMany_errors_are_returned_for_every_record(orderRules):
+    from pyDMNrules import DMN
+    results = DMN().decideMany(records[:3])
+    assert results == [({'errors': ['No rulesBook has been loaded']}, {})] * 3
+    results = orderRules.decideMany(iter(records[:4]), outputs=['unknown'])
+    assert len(results) == 4
+    assert all(['errors' in status and newData == {} for (status, newData) in results])
+    assert orderRules.decideMany([]) == []
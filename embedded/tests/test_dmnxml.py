@@ -0,0 +1,56 @@
+# -----------------------------------------------------------------------------
+# test_dmnxml.py - DMN XML files against the equivalent workbook
+# -----------------------------------------------------------------------------
+
+import itertools
+import pytest
+from conftest import orderReviewDMN, writeRulesBook
+
+
+def test_loadXML_matches_the_equivalent_workbook(tmp_path):
+    from pyDMNrules import DMN
+    xmlRules = DMN()
+    assert 'errors' not in xmlRules.loadXML(orderReviewDMN)
+    assert list(xmlRules.glossary) == ['category', 'value', 'responsibleParty']
+    assert xmlRules.decisionTables['Decision_0tgwupa']['hitPolicy'] == 'C'
+    # The workbook equivalent of order-review-camunda.dmn (C tables skip their first rule, as a loaded DMN XML table does)
+    rows = [['-', '-', '"skipped"'],
+            ['New_Car', '< 25000', '"Sales"'], ['Spare_Parts', '< 2000', '"Sales"'], ['Spare_Parts', '< 25000', '"Mechanical Engineering Experts"'],
+            ['Pre-owned_Car', '-', '"Sales"'], ['-', '>= 5000', '"Management"']]
+    glossary = [('category', 'Data', 'category'), ('value', None, 'value'), ('responsibleParty', None, 'responsibleParty')]
+    path = writeRulesBook(str(tmp_path / 'order.xlsx'), glossary, [('responsibleParty', 'OrderReview')],
+                          [('OrderReview', 'C', ['category', 'value'], ['responsibleParty'], rows)])
+    workbookRules = DMN()
+    assert 'errors' not in workbookRules.load(path)
+    for (category, value) in itertools.product(['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None], [0, 1000, 5000, 20000, 30000, None]):
+        data = {'category': category, 'value': value}
+        (xmlStatus, xmlData) = xmlRules.decide(data)
+        (workbookStatus, workbookData) = workbookRules.decide(data)
+        assert xmlData.get('Result') == workbookData.get('Result'), data
+
+
+def test_decideColumns_on_a_DMN_XML_file():
+    from pyDMNrules import DMN
+    pytest.importorskip('numpy')
+    xmlRules = DMN()
+    assert 'errors' not in xmlRules.loadXML(orderReviewDMN)
+    records = [{'category': category, 'value': value}
+               for (category, value) in itertools.product(['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None], [0, 1000, 5000, 20000, 30000, None])]
+    columns = {'category': [record['category'] for record in records], 'value': [record['value'] for record in records]}
+    (status, results) = xmlRules.decideColumns(columns, 'Decision_0tgwupa')
+    assert list(results['Result']) == ['responsibleParty']
+    for (i, record) in enumerate(records):
+        (status, newData) = xmlRules.decide(record)
+        assert results['Result']['responsibleParty'][i] == newData['Result']['responsibleParty'], record
+        assert results['Executed Rule'][i] == newData.get('Executed Rule'), record
+
+
+def test_loadXML_reports_why_a_file_is_unreadable(tmp_path):
+    from pyDMNrules import DMN
+    path = tmp_path / 'broken.dmn'
+    path.write_text('<definitions><decision id="d1">')
+    status = DMN().loadXML(str(path))
+    assert len(status['errors']) == 1
+    assert 'no element found' in status['errors'][0]
+    status = DMN().loadXML(str(tmp_path / 'missing.dmn'))
+    assert 'No such file' in status['errors'][0]
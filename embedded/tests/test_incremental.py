@@ -0,0 +1,67 @@
+# -----------------------------------------------------------------------------
+# test_incremental.py - decideIncremental() against decide()
+# -----------------------------------------------------------------------------
+
+import random
+from conftest import writeRulesBook
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('x', None, 'x'), ('y', None, 'y'), ('z', None, 'z')]
+decisions = [('first', 'First'), ('second', 'Second'), ('third', 'Third')]
+tables = [('First', 'F', ['a'], ['x'], [['p', '"x1"'], ['q', '"x2"'], ['-', '"x3"']]),
+          ('Second', 'F', ['b'], ['y'], [['< 5', '1'], ['[5..10]', '2'], ['-', '3']]),
+          ('Third', 'C+', ['x', 'y'], ['z'], [['-', '-', '0'], ['x1', '-', '10'], ['-', '< 2', '20'], ['x2', '>= 2', '40']])]
+
+
+def loadChain(tmp_path):
+    from pyDMNrules import DMN
+    path = writeRulesBook(str(tmp_path / 'chain.xlsx'), glossary, decisions, tables)
+    dmnRules = DMN()
+    assert dmnRules.load(path) == {}
+    return dmnRules
+
+
+def test_incremental_decisions_match_decide(tmp_path):
+    dmnRules = loadChain(tmp_path)
+    generator = random.Random(1)
+    data = {'a': 'p', 'b': 3}
+    (status, newData, decision) = dmnRules.decideIncremental(data)
+    assert (status, newData) == dmnRules.decide(data)
+    for step in range(60):
+        changes = {}
+        for variable in generator.sample(['a', 'b'], generator.randint(1, 2)):
+            changes[variable] = generator.choice(['p', 'q', 'r', None]) if variable == 'a' else generator.choice([1, 3, 5, 7.5, 12, None])
+        data.update(changes)
+        (status, newData, decision) = dmnRules.decideIncremental(changes, decision)
+        assert (status, newData) == dmnRules.decide(data), data
+        assert decision is not None
+
+
+def test_unchanged_tables_are_not_run_again(tmp_path):
+    dmnRules = loadChain(tmp_path)
+    (status, newData, decision) = dmnRules.decideIncremental({'a': 'p', 'b': 3})
+    dmnRules.profileDecisions()
+    (status, newData, decision) = dmnRules.decideIncremental({'b': 7}, decision)
+    counts = {table: profile['evaluations'] for (table, profile) in dmnRules.profileStats().items()}
+    assert counts == {'First': 0, 'Second': 1, 'Third': 1}
+    dmnRules.resetProfile()
+    # 'Second' decides the same 'y', so 'Third' is not run again either
+    (status, newData, decision) = dmnRules.decideIncremental({'b': 8}, decision)
+    counts = {table: profile['evaluations'] for (table, profile) in dmnRules.profileStats().items()}
+    assert counts == {'First': 0, 'Second': 1, 'Third': 0}
+    dmnRules.profileDecisions(False)
+    assert newData == dmnRules.decide({'a': 'p', 'b': 8})[1]
+
+
+def test_previous_decisions_of_another_rulesBook_are_not_reused(tmp_path):
+    dmnRules = loadChain(tmp_path)
+    (status, newData, decision) = dmnRules.decideIncremental({'a': 'q', 'b': 3}, outputs=['z'])
+    assert newData == dmnRules.decide({'a': 'q', 'b': 3}, outputs=['z'])[1]
+    # Different outputs, or a reloaded rulesBook, decide everything again - from the data passed
+    (status, newData, other) = dmnRules.decideIncremental({'b': 7}, decision)
+    assert newData == dmnRules.decide({'b': 7})[1]
+    dmnRules.load(str(tmp_path / 'chain.xlsx'))
+    (status, newData, other) = dmnRules.decideIncremental({'b': 7}, decision, outputs=['z'])
+    assert 'errors' not in status
+    assert newData == dmnRules.decide({'b': 7}, outputs=['z'])[1]
+    (status, newData, other) = dmnRules.decideIncremental({'a': 'unknown variable'}, None, outputs=['w'])
+    assert ('errors' in status) and (other is None)
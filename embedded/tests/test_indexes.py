@@ -0,0 +1,100 @@
+# -----------------------------------------------------------------------------
+# test_indexes.py - decide() with the rule indexes against decide() without them
+# -----------------------------------------------------------------------------
+
+import random
+import itertools
+import pytest
+from conftest import writeRulesBook
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('c', None, 'c'), ('x', None, 'x')]
+aCells = ['p', 'q', 'r', 'p, q', 'in(q, r)', '-', '!= p', '-']
+bCells = ['1', '2', '2, 3', 'in(4, 5)', '-', '< 3', '-']
+aValues = ['p', 'q', 'r', 's', None, 'b', 1.0]
+bValues = [1, 2, 3, 4, 5, 6, 2.5, None, 'p']
+
+
+def randomRules(seed, aCells, bCells, cCells, count):
+    generator = random.Random(seed)
+    return [[generator.choice(aCells), generator.choice(bCells), generator.choice(cCells), '"r{!s}"'.format(thisRule)] for thisRule in range(count)]
+
+
+def loadBoth(tmp_path, hitPolicy, rows):
+    '''
+    The rulesBook loaded twice - with its indexes, and with no indexes, so every rule is tested
+    '''
+    from pyDMNrules import DMN
+    path = writeRulesBook(str(tmp_path / 'indexed.xlsx'), glossary, [('decide', 'T')], [('T', hitPolicy, ['a', 'b', 'c'], ['x'], rows)])
+    indexed = DMN()
+    assert 'errors' not in indexed.load(path)
+    unindexed = DMN()
+    assert 'errors' not in unindexed.load(path)
+    unindexed.decisionTables['T']['ruleIndex'] = []
+    unindexed.decisionTables['T']['rangeIndex'] = []
+    return (indexed, unindexed)
+
+
+@pytest.mark.parametrize('hitPolicy', ['U', 'F', 'A', 'C', 'R', 'C#'])
+@pytest.mark.parametrize('seed', range(3))
+def test_equality_index_matches_every_rule(tmp_path, hitPolicy, seed):
+    (indexed, unindexed) = loadBoth(tmp_path, hitPolicy, randomRules(seed, aCells, bCells, ['-'], 30))
+    assert [item for (item, index, wildcard) in indexed.decisionTables['T']['ruleIndex']] == ['App.a', 'App.b']
+    for (a, b) in itertools.product(aValues, bValues):
+        data = {'a': a, 'b': b}
+        assert indexed.decide(data) == unindexed.decide(data), data
+
+
+def test_equality_index_prunes_rules(tmp_path):
+    (indexed, unindexed) = loadBoth(tmp_path, 'F', [['p', '-', '-', '"r0"'], ['q', '-', '-', '"r1"'], ['p, r', '-', '-', '"r2"'], ['-', '-', '-', '"r3"']])
+    names = dict.fromkeys(indexed.glossaryItems)
+    names['App.a'] = 'p'
+    assert list(indexed.candidateRules('T', names)) == [0, 2, 3]
+    names['App.a'] = 's'
+    assert list(indexed.candidateRules('T', names)) == [3]
+    names['App.a'] = ['p', 'q']
+    assert list(indexed.candidateRules('T', names)) == [0, 1, 2, 3]
+
+
+def intervalCells(seed, count):
+    generator = random.Random(seed)
+    cells = []
+    for thisRule in range(count):
+        low = generator.randrange(0, 100, 5)
+        kind = generator.random()
+        if kind < 0.8:
+            cells.append('[{!s}..{!s}{!s}'.format(low, low + generator.choice([5, 10]), generator.choice([']', ')'])))
+        elif kind < 0.85:
+            cells.append(generator.choice(['< ', '<= ']) + str(low))
+        elif kind < 0.9:
+            cells.append(generator.choice(['> ', '>= ']) + str(low + 50))
+        else:
+            cells.append(str(low))
+    return cells
+
+
+@pytest.mark.parametrize('hitPolicy', ['U', 'F', 'C', 'C+'])
+@pytest.mark.parametrize('seed', [0, 2, 3])
+def test_range_index_matches_every_rule(tmp_path, hitPolicy, seed):
+    rows = randomRules(seed, ['p', 'q', '-'], ['-'], ['-'], 40)
+    for (row, cell) in zip(rows, intervalCells(seed, 40)):
+        row[2] = cell
+        if hitPolicy == 'C+':
+            row[3] = str(len(cell))
+    (indexed, unindexed) = loadBoth(tmp_path, hitPolicy, rows)
+    assert [item for (item, boundaries, segments) in indexed.decisionTables['T']['rangeIndex']] == ['App.c']
+    for (a, c) in itertools.product(['p', 'q', None], [value / 2 for value in range(-2, 230)] + [None, 'p', float('nan'), True, [50]]):
+        data = {'a': a, 'c': c}
+        assert indexed.decide(data) == unindexed.decide(data), data
+
+
+def test_range_index_prunes_rules(tmp_path):
+    rows = [['-', '-', '[0..10]', '"r0"'], ['-', '-', '[11..20]', '"r1"'], ['-', '-', '< 5', '"r2"'], ['-', '-', '>= 15', '"r3"']] + \
+           [['-', '-', '[{!s}..{!s}]'.format(low, low + 1), '"r"'] for low in range(30, 60, 2)]
+    (indexed, unindexed) = loadBoth(tmp_path, 'F', rows)
+    names = dict.fromkeys(indexed.glossaryItems)
+    names['App.c'] = 10.0
+    assert list(indexed.candidateRules('T', names)) == [0]
+    names['App.c'] = 17.0
+    assert list(indexed.candidateRules('T', names)) == [1, 3]
+    names['App.c'] = 'p'
+    assert len(list(indexed.candidateRules('T', names))) == len(rows)
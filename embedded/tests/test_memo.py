@@ -0,0 +1,24 @@
+# -----------------------------------------------------------------------------
+# test_memo.py - memoised decisions
+# -----------------------------------------------------------------------------
+
+from conftest import orderReviewDMN
+
+
+def test_changing_a_memoised_decision_does_not_change_later_decisions():
+    from pyDMNrules import DMN
+    dmnRules = DMN()
+    assert 'errors' not in dmnRules.loadXML(orderReviewDMN)
+    dmnRules.cacheResults(10)
+    data = {'category': 'Spare_Parts', 'value': 1000}
+    (status, expected) = dmnRules.decide(data)
+    for attempt in range(3):
+        (status, newData) = dmnRules.decide(data)
+        assert newData == expected
+        for decision in (newData if isinstance(newData, list) else [newData]):
+            for value in decision['Result'].values():
+                if isinstance(value, list):
+                    value.append('Hacker')
+            decision['Result']['category'] = 'Hacker'
+    assert dmnRules.resultStats()['hits'] == 3
+    assert dmnRules.decide({'category': 'Spare_Parts', 'value': 1000.0})[1] == expected
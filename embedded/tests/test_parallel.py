@@ -0,0 +1,49 @@
+# -----------------------------------------------------------------------------
+# test_parallel.py - decideParallel() against decide()
+# -----------------------------------------------------------------------------
+
+import itertools
+import pytest
+from pyDMNrules.parallel import chunks
+
+categories = ['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None]
+values = [0, 1000, 1999.99, 2000, 5000, 20000, 25000, 30000, None]
+records = [{'category': category, 'value': value} for (category, value) in itertools.product(categories, values)] * 3
+
+
+def test_chunks():
+    assert list(chunks(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunks([], 3)) == []
+
+
+@pytest.mark.parametrize('chunkSize', [1, 7, 1000])
+def test_decideParallel_matches_decide(orderRules, chunkSize):
+    results = list(orderRules.decideParallel(iter(records), workers=2, chunkSize=chunkSize))
+    assert results == [orderRules.decide(record) for record in records]
+
+
+def test_decideParallel_outputs(orderRules):
+    results = list(orderRules.decideParallel(records, outputs=['responsibleParty'], workers=2, chunkSize=10))
+    assert results == [orderRules.decide(record, outputs=['responsibleParty']) for record in records]
+
+
+def test_decideParallel_reads_ahead_a_few_chunks(orderRules):
+    read = []
+    def generate():
+        for record in records:
+            read.append(record)
+            yield record
+    results = orderRules.decideParallel(generate(), workers=2, chunkSize=5)
+    first = next(results)
+    assert first == orderRules.decide(records[0])
+    # Two chunks per worker are submitted before the first result is returned, plus the chunk being read
+    assert len(read) <= (2 * 2 + 1) * 5
+    assert len(list(results)) == len(records) - 1
+
+
+def test_decideParallel_errors_are_returned_for_every_record(orderRules):
+    from pyDMNrules import DMN
+    assert list(DMN().decideParallel(records[:3], workers=2)) == [({'errors': ['No rulesBook has been loaded']}, {})] * 3
+    results = list(orderRules.decideParallel(iter(records[:4]), outputs=['unknown'], workers=2))
+    assert len(results) == 4
+    assert all(['errors' in status for (status, newData) in results])
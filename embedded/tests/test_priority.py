@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------
+# test_priority.py - the P and O hit policies against the rules they rank
+# -----------------------------------------------------------------------------
+
+import random
+import itertools
+import pytest
+from conftest import writeRulesBook
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('x', None, 'x'), ('n', None, 'n')]
+aCells = ['p', 'q', '-']
+bCells = ['< 5', '[3..8]', '>= 6', '-']
+xValues = ['high', 'medium', 'low']
+nValues = [3.0, 2.0, 1.0]
+validity = [None, None, '"high", "medium", "low"', '3, 2, 1']
+
+
+def matches(cell, value):
+    '''
+    The rule tests of this file, in Python
+    '''
+    if cell == '-':
+        return True
+    if cell in aCells:
+        return value == cell
+    if not isinstance(value, float):
+        return False
+    if cell == '< 5':
+        return value < 5
+    if cell == '[3..8]':
+        return 3 <= value <= 8
+    return value >= 6
+
+
+def randomRules(seed, count):
+    generator = random.Random(seed)
+    return [(generator.choice(aCells), generator.choice(bCells), generator.choice(xValues), generator.choice(nValues)) for thisRule in range(count)]
+
+
+@pytest.mark.parametrize('hitPolicy', ['P', 'O'])
+@pytest.mark.parametrize('seed', range(4))
+def test_matching_rules_are_ranked(tmp_path, hitPolicy, seed):
+    from pyDMNrules import DMN
+    rules = randomRules(seed, 12)
+    rows = [[a, b, '"{!s}"'.format(x), int(n)] for (a, b, x, n) in rules]
+    path = writeRulesBook(str(tmp_path / 'ranked.xlsx'), glossary, [('decide', 'T')], [('T', hitPolicy, ['a', 'b'], ['x', 'n'], rows, validity)])
+    dmnRules = DMN()
+    assert dmnRules.load(path) == {}
+    for (a, b) in itertools.product(['p', 'q', 'r', None], [1, 3, 5, 6, 8, 9, None]):
+        (status, newData) = dmnRules.decide({'a': a, 'b': b})
+        value = None if b is None else float(b)
+        ranked = sorted([(xValues.index(x), nValues.index(n), thisRule) for (thisRule, (aCell, bCell, x, n)) in enumerate(rules)
+                         if matches(aCell, a) and matches(bCell, value)])
+        if len(ranked) == 0:
+            assert 'errors' in status
+            continue
+        assert status == {}
+        if hitPolicy == 'P':
+            (x, n, thisRule) = ranked[0]
+            assert newData['Result']['x'] == xValues[x]
+            assert newData['Result']['n'] == nValues[n]
+            assert newData['Executed Rule'] == ('decide', 'T', str(thisRule + 1))
+        else:
+            assert newData['Result']['x'] == [xValues[x] for (x, n, thisRule) in ranked]
+            assert newData['Result']['n'] == [nValues[n] for (x, n, thisRule) in ranked]
+            assert newData['Executed Rule'] == [('decide', 'T', str(thisRule + 1)) for (x, n, thisRule) in ranked]
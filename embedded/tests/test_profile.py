@@ -0,0 +1,51 @@
+# -----------------------------------------------------------------------------
+# test_profile.py - profileDecisions() against the decisions made
+# -----------------------------------------------------------------------------
+
+import itertools
+import collections
+from conftest import writeRulesBook
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('x', None, 'x'), ('y', None, 'y')]
+tables = [('First', 'F', ['a', 'b'], ['x'], [['p', '< 5', '"x1"'], ['q', '-', '"x2"'], ['-', '>= 5', '"x3"']]),
+          ('Second', 'F', ['x'], ['y'], [['x1', '"y1"'], ['x2', '"y2"'], ['-', '"y0"']])]
+records = [{'a': a, 'b': b} for (a, b) in itertools.product(['p', 'q', 'r', None], [1, 5, 9, None])]
+
+
+def test_profile_counts_the_decisions(tmp_path):
+    from pyDMNrules import DMN
+    path = writeRulesBook(str(tmp_path / 'profile.xlsx'), glossary, [('first', 'First'), ('second', 'Second')], tables)
+    dmnRules = DMN()
+    assert dmnRules.load(path) == {}
+    expected = [dmnRules.decide(record) for record in records]
+    dmnRules.profileDecisions()
+    assert [dmnRules.decide(record) for record in records] == expected
+    stats = dmnRules.profileStats()
+    assert list(stats) == ['First', 'Second']
+    executed = collections.Counter()
+    for (status, newData) in expected:
+        for decision in (newData if isinstance(newData, list) else [newData]):
+            if 'Executed Rule' in decision:
+                executed[decision['Executed Rule'][1:]] += 1
+    for table in stats:
+        profile = stats[table]
+        # Rule 3 of 'Second' has no tests, so it isn't evaluated before it matches
+        # No rules match in 'First' stops the decision, so 'Second' is only used after 'First' matches
+        assert profile['evaluations'] == (len(records) if table == 'First' else stats['First']['hits'])
+        assert profile['skipped'] == 0
+        assert profile['hits'] == sum([executed[(table, rule['ruleId'])] for rule in profile['rules']])
+        assert profile['time'] >= 0.0
+        for rule in profile['rules']:
+            assert rule['hits'] == executed[(table, rule['ruleId'])], (table, rule)
+            assert rule['hits'] <= rule['evaluations'] <= profile['evaluations']
+            if (table, rule['ruleId']) != ('Second', '3'):
+                assert rule['tests'] >= rule['evaluations']
+        assert profile['rulesEvaluated'] == sum([rule['evaluations'] for rule in profile['rules']])
+        assert profile['testsEvaluated'] == sum([rule['tests'] for rule in profile['rules']])
+
+    # Turning profiling off stops counting, and resetProfile() starts again
+    dmnRules.profileDecisions(False)
+    dmnRules.decide(records[0])
+    assert dmnRules.profileStats() == stats
+    dmnRules.resetProfile()
+    assert dmnRules.profileStats()['First']['evaluations'] == 0
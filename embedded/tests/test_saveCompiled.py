@@ -0,0 +1,75 @@
+# -----------------------------------------------------------------------------
+# test_saveCompiled.py - compiled rulesBooks against the workbook
+# -----------------------------------------------------------------------------
+
+import os
+import pickle
+import itertools
+from conftest import orderReview, writeRulesBook
+
+glossary = [('a', 'App', 'a'), ('x', None, 'x')]
+records = [{'category': category, 'value': value}
+           for (category, value) in itertools.product(['New_Car', 'Spare_Parts', 'Pre-owned_Car', 'Other', None], [0, 1000, 2000, 5000, 20000, 30000, None])]
+
+
+def writeRules(path, output):
+    return writeRulesBook(path, glossary, [('decide', 'T')], [('T', 'U', ['a'], ['x'], [['p', output], ['-', '"other"']])])
+
+
+def test_compiled_rulesBook_matches_the_workbook(tmp_path, orderRules):
+    from pyDMNrules import DMN
+    compiledFile = str(tmp_path / 'OrderReview.dmnc')
+    assert orderRules.saveCompiled(compiledFile) == {}
+    compiledRules = DMN()
+    assert compiledRules.loadCompiled(compiledFile) == {}
+    assert compiledRules.wb is None
+    for record in records:
+        assert compiledRules.decide(record) == orderRules.decide(record), record
+    assert compiledRules.decideMany(records) == orderRules.decideMany(records)
+
+
+def test_stale_compiled_rulesBook_loads_the_workbook(tmp_path):
+    from pyDMNrules import DMN
+    path = writeRules(str(tmp_path / 'rules.xlsx'), '"old"')
+    compiledFile = str(tmp_path / 'rules.dmnc')
+    dmnRules = DMN()
+    assert dmnRules.load(path) == {}
+    assert dmnRules.saveCompiled(compiledFile) == {}
+    # The workbook is unchanged - the compiled rulesBook is used
+    dmnRules = DMN()
+    assert dmnRules.loadCompiled(compiledFile, path) == {}
+    assert dmnRules.wb is None
+    assert dmnRules.decide({'a': 'p'})[1]['Result']['x'] == 'old'
+    # The workbook has changed - the workbook is loaded
+    writeRules(path, '"new"')
+    dmnRules = DMN()
+    assert dmnRules.loadCompiled(compiledFile, path) == {}
+    assert dmnRules.wb is not None
+    assert dmnRules.decide({'a': 'p'})[1]['Result']['x'] == 'new'
+    # The workbook is missing - the compiled rulesBook is used
+    os.remove(path)
+    dmnRules = DMN()
+    assert dmnRules.loadCompiled(compiledFile, path) == {}
+    assert dmnRules.decide({'a': 'p'})[1]['Result']['x'] == 'old'
+
+
+def test_unusable_compiled_rulesBooks(tmp_path, orderRules):
+    from pyDMNrules import DMN
+    garbage = tmp_path / 'garbage.dmnc'
+    garbage.write_bytes(b'not a pickle')
+    status = DMN().loadCompiled(str(garbage))
+    assert 'errors' in status
+    compiledFile = str(tmp_path / 'OrderReview.dmnc')
+    orderRules.saveCompiled(compiledFile)
+    with open(compiledFile, 'rb') as fp:
+        compiled = pickle.load(fp)
+    compiled['version'] = -1
+    with open(compiledFile, 'wb') as fp:
+        pickle.dump(compiled, fp)
+    status = DMN().loadCompiled(compiledFile)
+    assert 'not a compiled rulesBook for this version' in status['errors'][0]
+    # With the workbook, an unusable compiled rulesBook falls back to load()
+    dmnRules = DMN()
+    assert dmnRules.loadCompiled(compiledFile, orderReview) == {}
+    assert dmnRules.decide(records[8]) == orderRules.decide(records[8])
+    assert 'errors' in DMN().loadCompiled(str(tmp_path / 'missing.dmnc'))
@@ -0,0 +1,104 @@
+# -----------------------------------------------------------------------------
+# test_service.py - the Camunda compatible decision service
+# -----------------------------------------------------------------------------
+
+import os
+import json
+import asyncio
+from conftest import orderReview, orderReviewDMN, writeRulesBook
+from pyDMNrules.cache import RulesBookCache
+from pyDMNrules.service import DecisionService
+
+order = {'variables': {'category': {'value': 'Spare_Parts', 'type': 'String'}, 'value': {'value': 1500, 'type': 'Integer'}}}
+glossary = [('a', 'App', 'a'), ('x', None, 'x'), ('y', None, 'y')]
+
+
+def route(service, method, target, request=None):
+    return asyncio.run(service.route(method, target, b'' if request is None else json.dumps(request).encode('utf-8')))
+
+
+def test_decision_definitions():
+    service = DecisionService([orderReview, orderReviewDMN], cache=RulesBookCache())
+    (code, definitions) = route(service, 'GET', '/engine-rest/decision-definition')
+    assert code == 200
+    assert [definition['key'] for definition in definitions] == ['OrderReview', 'order-review-camunda', 'Decision_0tgwupa']
+    assert definitions[0]['name'] == 'Determine Party'
+
+
+def test_evaluate():
+    service = DecisionService([orderReview, orderReviewDMN], cache=RulesBookCache())
+    expected = [{'responsibleParty': {'type': 'String', 'value': 'Sales', 'valueInfo': {}}},
+                {'responsibleParty': {'type': 'String', 'value': 'Mechanical Engineering Experts', 'valueInfo': {}}}]
+    assert route(service, 'POST', '/engine-rest/decision-definition/key/OrderReview/evaluate', order) == (200, expected)
+    (code, response) = route(service, 'POST', '/engine-rest/decision-definition/key/Decision_0tgwupa/evaluate', order)
+    assert code == 200
+    assert [result['responsibleParty']['value'] for result in response] == ['Sales', 'Mechanical Engineering Experts']
+
+
+def test_evaluate_batch():
+    service = DecisionService([orderReview], cache=RulesBookCache())
+    newCar = {'variables': {'category': {'value': 'New_Car'}, 'value': {'value': 1000}}}
+    (code, responses) = route(service, 'POST', '/engine-rest/decision-definition/key/OrderReview/evaluate-batch', [order, newCar])
+    assert code == 200
+    assert len(responses) == 2
+    assert responses[1] == [{'responsibleParty': {'type': 'String', 'value': 'Sales', 'valueInfo': {}}}]
+
+
+def test_errors():
+    service = DecisionService([orderReview], cache=RulesBookCache())
+    assert route(service, 'POST', '/engine-rest/decision-definition/key/Unknown/evaluate', order)[0] == 404
+    assert route(service, 'GET', '/engine-rest/decision-definition/key/OrderReview/evaluate')[0] == 405
+    assert route(service, 'GET', '/engine-rest/unknown')[0] == 404
+    assert asyncio.run(service.route('POST', '/engine-rest/decision-definition/key/OrderReview/evaluate', b'{'))[0] == 400
+
+
+def test_reloaded_tables_are_served(tmp_path):
+    path = writeRulesBook(str(tmp_path / 'rules.xlsx'), glossary, [('first', 'T1')], [('T1', 'U', ['a'], ['x'], [['p', '"x1"']])])
+    service = DecisionService([path], cache=RulesBookCache())
+    assert service.load() == []
+    request = {'variables': {'a': {'value': 'p'}}}
+    assert route(service, 'POST', '/engine-rest/decision-definition/key/T2/evaluate', request)[0] == 404
+    writeRulesBook(path, glossary, [('first', 'T1'), ('second', 'T2')],
+                   [('T1', 'U', ['a'], ['x'], [['p', '"x1"']]), ('T2', 'U', ['a'], ['y'], [['p', '"y2"']])])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    (code, response) = route(service, 'POST', '/engine-rest/decision-definition/key/T2/evaluate', request)
+    assert code == 200
+    assert response == [{'y': {'type': 'String', 'value': 'y2', 'valueInfo': {}}}]
+    assert 'T2' in [definition['key'] for definition in route(service, 'GET', '/engine-rest/decision-definition')[1]]
+
+
+def test_http():
+    service = DecisionService([orderReview], cache=RulesBookCache())
+
+    async def request():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            (reader, writer) = await asyncio.open_connection('127.0.0.1', port)
+            body = json.dumps(order).encode('utf-8')
+            writer.write('POST /engine-rest/decision-definition/key/OrderReview/evaluate HTTP/1.1\r\nContent-Length: {!s}\r\nConnection: close\r\n\r\n'.format(len(body)).encode('latin-1') + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response
+
+    (head, separator, body) = asyncio.run(request()).partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 200')
+    assert json.loads(body)[0]['responsibleParty']['value'] == 'Sales'
+
+
+def test_decision_key_collisions_keep_the_first_binding(tmp_path):
+    first = writeRulesBook(str(tmp_path / 'first.xlsx'), glossary, [('decide', 'T1')], [('T1', 'U', ['a'], ['x'], [['p', '"first"']])])
+    second = writeRulesBook(str(tmp_path / 'second.xlsx'), glossary, [('decide', 'T1'), ('decide', 'first')],
+                            [('T1', 'U', ['a'], ['x'], [['p', '"second"']]), ('first', 'U', ['a'], ['y'], [['p', '"y"']])])
+    service = DecisionService([first, second], cache=RulesBookCache())
+    errors = service.load()
+    assert errors == ["{!s}: decision key 'T1' is already used by {!s}".format(second, first),
+                      "{!s}: decision key 'first' is already used by {!s}".format(second, first)]
+    assert service.load() == errors
+    request = {'variables': {'a': {'value': 'p'}}}
+    expected = (200, [{'x': {'type': 'String', 'value': 'first', 'valueInfo': {}}}])
+    assert route(service, 'POST', '/engine-rest/decision-definition/key/T1/evaluate', request) == expected
+    assert route(service, 'POST', '/engine-rest/decision-definition/key/first/evaluate', request) == expected
+    assert [definition['key'] for definition in route(service, 'GET', '/engine-rest/decision-definition')[1]] == ['first', 'T1', 'second']
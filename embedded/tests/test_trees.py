@@ -0,0 +1,70 @@
+# -----------------------------------------------------------------------------
+# test_trees.py - decide() with decision trees against decide() without them
+# -----------------------------------------------------------------------------
+
+import random
+import itertools
+import pytest
+from conftest import writeRulesBook
+
+glossary = [('a', 'App', 'a'), ('b', None, 'b'), ('x', None, 'x')]
+aCells = ['p', 'q', 'r', 'p, q', '-', '!= p']
+bCells = ['< 3', '[3..6]', '> 6', '1, 2', '-', '[0..10)']
+records = [{'a': a, 'b': b} for (a, b) in itertools.product(['p', 'q', 'r', 's', None, 1.0], [0, 1, 2.5, 3, 6, 7, 10, None, 'p'])]
+
+
+def randomRules(seed, count):
+    generator = random.Random(seed)
+    return [[generator.choice(aCells), generator.choice(bCells), '"x{!s}"'.format(generator.randrange(3))] for thisRule in range(count)]
+
+
+def loadBoth(path, rows, hitPolicy):
+    from pyDMNrules import DMN
+    writeRulesBook(path, glossary, [('decide', 'T')], [('T', hitPolicy, ['a', 'b'], ['x'], rows)])
+    trees = DMN()
+    status = trees.load(path, decisionTrees=True)
+    assert 'errors' not in status
+    assert 'decisionTree' in trees.decisionTables['T']
+    plain = DMN()
+    assert plain.load(path) == {}
+    return (trees, plain, status)
+
+
+@pytest.mark.parametrize('hitPolicy', ['U', 'A'])
+@pytest.mark.parametrize('seed', range(4))
+def test_decision_trees_match_decide(tmp_path, hitPolicy, seed):
+    (trees, plain, status) = loadBoth(str(tmp_path / 'trees.xlsx'), randomRules(seed, 15), hitPolicy)
+    for record in records:
+        assert trees.decide(record) == plain.decide(record), record
+
+
+def test_overlapping_and_unreachable_rules_are_reported(tmp_path):
+    rows = [['p', '< 3', '"x1"'], ['p', '[1..5]', '"x2"'], ['q', '-', '"x3"'], ['q', '> 6', '"x4"'], ['r', '-', '"x5"']]
+    (trees, plain, status) = loadBoth(str(tmp_path / 'overlap.xlsx'), rows, 'U')
+    # Rule 3 matches whenever rule 4 does, so rule 4 is also unreachable
+    assert status['warnings'] == ["Rules '1' and '2' in decision table 'T' overlap", "Rules '3' and '4' in decision table 'T' overlap",
+                                  "Rule '4' in decision table 'T' is unreachable"]
+    rows = [['p', '-', '"x1"'], ['p', '< 3', '"x1"'], ['p', '> 6', '"x2"'], ['-', '-', '"x3"']]
+    (trees, plain, status) = loadBoth(str(tmp_path / 'unreachable.xlsx'), rows, 'A')
+    assert "Rule '2' in decision table 'T' is unreachable" in status['warnings']
+    assert "Rules '1' and '3' in decision table 'T' overlap" in status['warnings']
+    assert not hasattr(trees, 'warnings') or (trees.warnings == [])
+
+
+def test_compiled_rulesBooks_keep_their_decision_trees(tmp_path):
+    from pyDMNrules import DMN
+    (trees, plain, status) = loadBoth(str(tmp_path / 'trees.xlsx'), randomRules(0, 15), 'A')
+    compiledFile = str(tmp_path / 'trees.dmnc')
+    assert trees.saveCompiled(compiledFile) == {}
+    compiledRules = DMN()
+    assert compiledRules.loadCompiled(compiledFile) == {}
+    assert compiledRules.decisionTables['T']['decisionTree'] == trees.decisionTables['T']['decisionTree']
+    # decideParallel() workers restore the rulesBook the same way
+    restored = DMN()
+    restored.restoreCompiled(trees.compiledRulesBook())
+    assert 'decisionTree' in restored.decisionTables['T']
+    assert plain.saveCompiled(compiledFile) == {}
+    assert compiledRules.loadCompiled(compiledFile) == {}
+    assert 'decisionTree' not in compiledRules.decisionTables['T']
+    for record in records:
+        assert restored.decide(record) == plain.decide(record), record